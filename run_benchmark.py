@@ -0,0 +1,492 @@
+from poke_env.environment import Gen8Pokemon, Gen8Move, Move, Pokemon, Weather, Field, SideCondition
+from src.engine.damage import compute_damage, compute_damage_batch, compute_damage_distribution
+from src.minimax.BattleStatus import BattleStatus
+from src.minimax.NodePokemon import NodePokemon
+from src.minimax.OpponentModel import OpponentModel
+from src.minimax.SearchConfiguration import SearchConfiguration
+from src.minimax.heuristic.TeamHeuristic import TeamHeuristic
+from src.players.MiniMaxPlayer import MiniMaxPlayer
+from src.players.MCTSPlayer import MCTSPlayer
+from src.engine.stats import estimate_stat, compute_stat
+from typing import List, Dict, Tuple
+from tabulate import tabulate
+import argparse
+import math
+import time
+import tracemalloc
+
+# Tag of the battle whose search is benchmarked, the positions are searched one after the other by the same search
+BENCHMARK_BATTLE = "benchmark"
+
+# Positions recorded from our random battles, the bot's Pokémon are described as in the Showdown requests
+BENCHMARK_POSITIONS = [
+    {"bot": {"species": "garchomp", "level": 78, "hp": 1.0, "item": "lifeorb", "ability": "roughskin",
+             "moves": ["earthquake", "outrage", "swordsdance", "firefang"]},
+     "opp": {"species": "heatran", "level": 80, "hp": 1.0, "moves": ["magmastorm"]},
+     "bot_team": [{"species": "toxapex", "level": 82, "hp": 1.0, "item": "blacksludge", "ability": "regenerator",
+                   "moves": ["scald", "recover", "toxic", "haze"]}],
+     "opp_team": [{"species": "dragapult", "level": 76, "hp": 1.0, "moves": ["dracometeor"]}]},
+    {"bot": {"species": "toxapex", "level": 82, "hp": 0.8, "item": "blacksludge", "ability": "regenerator",
+             "moves": ["scald", "recover", "toxic", "haze"]},
+     "opp": {"species": "dragapult", "level": 76, "hp": 1.0, "moves": ["dracometeor", "uturn"]},
+     "bot_team": [{"species": "ferrothorn", "level": 80, "hp": 1.0, "item": "leftovers", "ability": "ironbarbs",
+                   "moves": ["gyroball", "leechseed", "powerwhip", "knockoff"]}],
+     "opp_team": []},
+    {"bot": {"species": "gengar", "level": 80, "hp": 0.75, "item": "lifeorb", "ability": "cursedbody",
+             "moves": ["shadowball", "sludgewave", "focusblast", "trick"]},
+     "opp": {"species": "blissey", "level": 84, "hp": 0.7, "moves": []},
+     "bot_team": [{"species": "garchomp", "level": 78, "hp": 0.4, "item": "lifeorb", "ability": "roughskin",
+                   "moves": ["earthquake", "outrage", "swordsdance", "firefang"]}],
+     "opp_team": [{"species": "heatran", "level": 80, "hp": 0.0, "moves": []}]},
+    {"bot": {"species": "ferrothorn", "level": 80, "hp": 1.0, "item": "leftovers", "ability": "ironbarbs",
+             "moves": ["gyroball", "leechseed", "powerwhip", "knockoff"]},
+     "opp": {"species": "volcarona", "level": 79, "hp": 1.0, "moves": ["quiverdance", "fierydance"]},
+     "bot_team": [], "opp_team": []},
+    {"bot": {"species": "azumarill", "level": 84, "hp": 0.4, "item": "choiceband", "ability": "hugepower",
+             "moves": ["aquajet", "playrough", "liquidation", "superpower"]},
+     "opp": {"species": "rillaboom", "level": 80, "hp": 0.5, "moves": ["woodhammer", "uturn"]},
+     "bot_team": [{"species": "gengar", "level": 80, "hp": 1.0, "item": "lifeorb", "ability": "cursedbody",
+                   "moves": ["shadowball", "sludgewave", "focusblast", "trick"]}],
+     "opp_team": [{"species": "toxapex", "level": 82, "hp": 1.0, "moves": ["scald"]}]},
+    {"bot": {"species": "dragonite", "level": 74, "hp": 1.0, "item": "heavydutyboots", "ability": "multiscale",
+             "moves": ["dragondance", "extremespeed", "earthquake", "firepunch"]},
+     "opp": {"species": "corviknight", "level": 80, "hp": 0.9, "moves": ["bravebird", "roost", "bulkup"]},
+     "bot_team": [], "opp_team": []},
+]
+
+# Moves with special rules in the damage calculator, they are added to the moves of the recorded Pokémon when the batch
+# damage calculator is checked
+DAMAGE_CHECK_MOVES = ["freezedry", "thousandarrows", "seismictoss", "superfang", "sheercold", "bodypress", "foulplay",
+                      "knockoff", "poltergeist", "fakeout", "hydropump", "flareblitz", "rockblast", "stormthrow",
+                      "aquajet", "earthquake", "psychic", "thunderbolt", "solarbeam", "boomburst", "swordsdance"]
+
+# Battle states in which the damage calculators are checked, with the name of each state
+DAMAGE_CHECK_STATES = [("none", None, [], []), ("sun", Weather.SUNNYDAY, [], []), ("rain", Weather.RAINDANCE, [], []),
+                       ("desolate land", Weather.DESOLATELAND, [], []),
+                       ("electric terrain", None, [Field.ELECTRIC_TERRAIN], []),
+                       ("grassy terrain", None, [Field.GRASSY_TERRAIN], []),
+                       ("psychic terrain", None, [Field.PSYCHIC_TERRAIN], [SideCondition.REFLECT]),
+                       ("screens", None, [], [SideCondition.REFLECT, SideCondition.LIGHT_SCREEN])]
+
+# Boosts of the attackers in the damage check, the defenders keep their own ones
+DAMAGE_CHECK_BOOSTS = {"atk": 2, "def": -1, "spa": 1, "spd": 0, "spe": 0, "accuracy": 0, "evasion": 0}
+
+
+def parse_arguments(known=False):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=2, help="max depth of the minimax search")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times each position is searched")
+    parser.add_argument("--tt-size", type=int, default=2 ** 16,
+                        help="slots of the transposition table, 0 disables the table")
+    parser.add_argument("--no-ordering", action="store_true",
+                        help="disable the killer, history and damage-based move ordering")
+    parser.add_argument("--budget", type=int, default=0,
+                        help="time budget in milliseconds for iterative deepening up to --depth, 0 searches at --depth")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes that search the children of the root, 1 disables the parallel search")
+    parser.add_argument("--chance", action="store_true",
+                        help="branch on accuracy, damage rolls and critical hits with expectiminimax")
+    parser.add_argument("--damage-buckets", type=int, default=3,
+                        help="buckets in which the damage rolls are grouped by the chance nodes")
+    parser.add_argument("--chance-depth", type=int, default=1,
+                        help="turns in which the chance nodes are expanded, the following ones use the expected damage")
+    parser.add_argument("--simultaneous", action="store_true",
+                        help="search each turn as a simultaneous game solved by its mixed strategy")
+    parser.add_argument("--switches", type=int, default=0,
+                        help="switches of each player expanded in a node, ranked by type matchup, 0 searches only "
+                             "moves")
+    parser.add_argument("--batch", action="store_true",
+                        help="evaluate the leaves of the last ply of the minimax search in batches")
+    parser.add_argument("--no-batch", action="store_true",
+                        help="evaluate the rollouts of the MCTS one at a time instead of in batches")
+    parser.add_argument("--max-nodes", type=int, default=0,
+                        help="budget of nodes of each search, which deepens iteratively up to --depth, 0 disables it")
+    parser.add_argument("--max-memory", type=int, default=0,
+                        help="budget in KiB of the tables and caches of each search, which deepens iteratively up to "
+                             "--depth, 0 disables it")
+    parser.add_argument("--pvs", action="store_true",
+                        help="search the actions after the first one of each node with a null window")
+    parser.add_argument("--aspiration", type=float, default=0,
+                        help="half width of the aspiration window around the score of the previous iteration, 0 "
+                             "searches the root with the full window")
+    parser.add_argument("--extensions", type=int, default=0,
+                        help="max turns by which a line is extended when a Pokémon may faint at its horizon")
+    parser.add_argument("--reduction-index", type=int, default=0,
+                        help="position in the sorted actions from which the moves are searched a turn less deep, 0 "
+                             "disables the late move reductions")
+    parser.add_argument("--reduction-ply", type=int, default=2,
+                        help="min number of actions between the root and a node for its moves to be reduced")
+    parser.add_argument("--prune", action="store_true",
+                        help="merge the equivalent moves and drop the dominated ones before searching a node")
+    parser.add_argument("--opponent-moves", type=int, default=0,
+                        help="number of the opponent's most likely moves searched in its nodes, as predicted by the "
+                             "opponent model, 0 searches all of them")
+    parser.add_argument("--endgame", type=int, default=0,
+                        help="max number of Pokémon left in each team for a position to be solved as an endgame, 0 "
+                             "disables the endgame search")
+    parser.add_argument("--endgame-depth", type=int, default=10, help="max depth of the endgame search")
+    parser.add_argument("--endgame-time", type=int, default=1000, help="time budget of the endgame search in ms")
+    parser.add_argument("--next-turn", action="store_true",
+                        help="measure the search of the turn predicted by the principal variation of each position")
+    parser.add_argument("--reuse", action="store_true",
+                        help="with --next-turn, warm-start the search of the next turn with the tree of the first one")
+    parser.add_argument("--ponder", type=int, default=0,
+                        help="with --next-turn, milliseconds of pondering before the next turn, as if the opponent was "
+                             "thinking, 0 disables pondering")
+    parser.add_argument("--latency", action="store_true",
+                        help="with --ponder, measure the decisions of two turns and the event loop in between, with "
+                             "and without pondering, instead of the search")
+    parser.add_argument("--damage", action="store_true",
+                        help="check the batch damage calculator against the scalar one and measure both, instead of "
+                             "the search")
+    parser.add_argument("--mcts", type=int, default=0,
+                        help="iterations of the Monte Carlo Tree Search player, 0 benchmarks the minimax player")
+    opt = parser.parse_known_args()[0] if known else parser.parse_args()
+    return opt
+
+
+def build_bot_pokemon(data: Dict) -> Gen8Pokemon:
+    """
+    Builds one of the bot's Pokémon as if it was received from a Showdown request
+    :param data: the species, level, hp fraction, item, ability and moves of the Pokémon
+    :return: the bot's Pokémon
+    """
+    pokemon = Gen8Pokemon(species=data["species"])
+    pokemon._level = data["level"]
+    stats = {stat: estimate_stat(pokemon, stat) for stat in ["atk", "def", "spa", "spd", "spe"]}
+    max_hp = estimate_stat(pokemon, "hp")
+    condition = "{0}/{1}".format(int(max_hp * data["hp"]), max_hp) if data["hp"] > 0 else "0 fnt"
+    request = {"active": True, "condition": condition, "item": data["item"], "ability": data["ability"],
+               "details": "{0}, L{1}".format(data["species"], data["level"]), "moves": data["moves"],
+               "stats": stats}
+    return Gen8Pokemon(request_pokemon=request)
+
+
+def build_opp_pokemon(data: Dict) -> Gen8Pokemon:
+    """
+    Builds one of the opponent's Pokémon with the moves revealed so far
+    :param data: the species, level, hp fraction and known moves of the Pokémon
+    :return: the opponent's Pokémon
+    """
+    pokemon = Gen8Pokemon(species=data["species"])
+    pokemon._level = data["level"]
+    pokemon._current_hp = int(100 * data["hp"])
+    pokemon._max_hp = 100
+    for move in data["moves"]:
+        pokemon._add_move(move)
+
+    return pokemon
+
+
+def build_root(position: Dict) -> BattleStatus:
+    """
+    Builds the root of the minimax tree for a recorded position, in the same way MiniMaxPlayer does
+    :param position: the recorded position
+    :return: the root node
+    """
+    bot_pokemon = build_bot_pokemon(position["bot"])
+    opp_pokemon = build_opp_pokemon(position["opp"])
+    bot_pokemon._active = True
+    opp_pokemon._active = True
+    bot_team = [build_bot_pokemon(data) for data in position["bot_team"]]
+    for pokemon in bot_team:
+        pokemon._active = False
+
+    opp_team = [build_opp_pokemon(data) for data in position["opp_team"]]
+    available_moves: List = list(bot_pokemon.moves.values())
+    available_moves.sort(reverse=True, key=lambda x: int(x.base_power))
+    opp_hp = int(compute_stat(opp_pokemon, "hp", None, []) * opp_pokemon.current_hp_fraction)
+    return BattleStatus(NodePokemon(bot_pokemon, is_act_poke=True, moves=available_moves),
+                        NodePokemon(opp_pokemon, is_act_poke=False, current_hp=opp_hp,
+                                    moves=list(opp_pokemon.moves.values())),
+                        bot_team, opp_team, {}, [], [], Gen8Move('splash'), True)
+
+
+def build_next_root(node: BattleStatus) -> BattleStatus:
+    """
+    Builds the root of the following turn from a node reached by the search, in the same way MiniMaxPlayer builds it
+    from the battle. The Pokémon are updated with what the server would report, the bot's hp exactly and the
+    opponent's ones as a percentage, so the new root differs from the node as it does in a real battle
+    :param node: the node at the beginning of the following turn
+    :return: the root node of the following turn
+    """
+    bot_pokemon, opp_pokemon = node.act_poke.pokemon, node.opp_poke.pokemon
+    bot_pokemon._current_hp = int(node.act_poke.current_hp)
+    opp_pokemon._current_hp = math.ceil(100 * node.opp_poke.current_hp / node.opp_poke.max_hp)
+    for node_pokemon in [node.act_poke, node.opp_poke]:
+        node_pokemon.pokemon._boosts = node_pokemon.boosts.copy()
+        node_pokemon.pokemon._status = node_pokemon.status
+
+    available_moves: List = list(bot_pokemon.moves.values())
+    available_moves.sort(reverse=True, key=lambda x: int(x.base_power))
+    opp_hp = int(compute_stat(opp_pokemon, "hp", None, []) * opp_pokemon.current_hp_fraction)
+    return BattleStatus(NodePokemon(bot_pokemon, is_act_poke=True, moves=available_moves),
+                        NodePokemon(opp_pokemon, is_act_poke=False, current_hp=opp_hp,
+                                    moves=list(opp_pokemon.moves.values())),
+                        list(node.avail_switches), list(node.opp_team), dict(node.weather), list(node.terrains),
+                        list(node.opp_conditions), Gen8Move('splash'), True)
+
+
+def search_position(player: MiniMaxPlayer, position: Dict, next_turn: bool, reuse: bool, ponder_ms: int) -> float:
+    """
+    Searches a position, or the following turn as predicted by the principal variation of the position
+    :param player: the minimax player
+    :param position: the recorded position
+    :param next_turn: whether the following turn is searched after the position, only its search is measured
+    :param reuse: whether the search of the following turn is warm-started with the tree of the position
+    :param ponder_ms: milliseconds in which the following turn is pondered before it is searched
+    :return: the score of the last search
+    """
+    root = build_root(position)
+    search = player.battle_search(BENCHMARK_BATTLE)
+    search.reset_search()
+    score, _ = search.search(root)
+    predicted_turn = search.principal_variation()[:2]
+    if next_turn and len(predicted_turn) == 2:
+        if ponder_ms > 0:
+            player.start_pondering(BENCHMARK_BATTLE, root, predicted_turn[0])
+            time.sleep(ponder_ms / 1000)
+            player.stop_pondering(BENCHMARK_BATTLE)
+
+        root.apply_action(predicted_turn[0], True)
+        root.apply_action(predicted_turn[1], False)
+        if reuse:
+            search.reroot_search(search.root_turn + 1, predicted_turn)
+            player.follow_pondering(BENCHMARK_BATTLE, predicted_turn)
+        else:
+            search.reset_search()
+
+        score, _ = search.search(build_next_root(root))
+
+    search.search_stats.stop()
+    return score
+
+
+def benchmark_alphabeta(player: MiniMaxPlayer, position: Dict, repeat: int, next_turn: bool, reuse: bool,
+                        ponder_ms: int) -> List:
+    """
+    Measures the nodes per second and the peak memory of the minimax search on a position
+    :param player: the minimax player
+    :param position: the recorded position
+    :param repeat: how many times the position is searched
+    :param next_turn: whether the following turn predicted by the search is measured instead of the position
+    :param reuse: whether the search of the following turn is warm-started with the tree of the position
+    :param ponder_ms: milliseconds in which the following turn is pondered before it is searched
+    :return: a row of the benchmark table
+    """
+    best_time = float("inf")
+    for _ in range(repeat):
+        score = search_position(player, position, next_turn, reuse, ponder_ms)
+        best_time = min(best_time, player.battle_search(BENCHMARK_BATTLE).search_stats.elapsed())
+
+    # The statistics are read before the memory run, since with a time budget it may search less deeply
+    stats = player.battle_search(BENCHMARK_BATTLE).search_stats
+    row = ["{0} vs {1}".format(position["bot"]["species"], position["opp"]["species"]), stats.nodes,
+           round(stats.cutoff_rate(), 2), round(stats.first_move_cutoff_rate(), 2), stats.tt_cutoffs,
+           stats.tt_previous_hits, stats.re_searches, stats.pruned_actions, stats.completed_depth,
+           round(best_time * 1000, 2), int(stats.nodes / best_time)]
+
+    # Tracing memory allocations slows down the search, so the peak is measured on a separate run
+    tracemalloc.start()
+    search_position(player, position, next_turn, reuse, ponder_ms)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return row + [round(peak / 1024, 1), round(score, 4)]
+
+
+def benchmark_pondering(player: MiniMaxPlayer, position: Dict, ponder_ms: int) -> List[List]:
+    """
+    Measures what pondering costs to the player: the decision of a position, the start of the search of the next turn,
+    which the event loop runs after sending the order, the calls of the event loop while the opponent is thinking,
+    which share the interpreter with that search, and the decision of the next turn, which first stops it. Each is
+    measured with and without pondering
+    :param player: the minimax player
+    :param position: the recorded position
+    :param ponder_ms: milliseconds in which the opponent is thinking
+    :return: a row of the latency table for each mode, none if the position has no predicted turn
+    """
+    rows = []
+    for ponder in [False, True]:
+        search = player.battle_search(BENCHMARK_BATTLE)
+        start = time.perf_counter()
+        root = build_root(position)
+        search.reset_search()
+        search.search(root)
+        predicted_turn = search.principal_variation()[:2]
+        if len(predicted_turn) < 2:
+            return []
+
+        ponder_start = time.perf_counter()
+        if ponder:
+            player.start_pondering(BENCHMARK_BATTLE, root, predicted_turn[0])
+        now = time.perf_counter()
+        decision_time, start_time = ponder_start - start, now - ponder_start
+
+        # The event loop handles the messages of the server while the opponent is thinking, building a root from the
+        # recorded position takes a similar amount of Python work
+        loop_calls, loop_start = 0, now
+        while now - loop_start < ponder_ms / 1000:
+            build_root(position)
+            loop_calls += 1
+            now = time.perf_counter()
+        loop_time = (now - loop_start) / loop_calls
+
+        start = time.perf_counter()
+        player.stop_pondering(BENCHMARK_BATTLE)
+        stop_time = time.perf_counter() - start
+        root.apply_action(predicted_turn[0], True)
+        root.apply_action(predicted_turn[1], False)
+        search.reroot_search(search.root_turn + 1, predicted_turn)
+        player.follow_pondering(BENCHMARK_BATTLE, predicted_turn)
+        search.search(build_next_root(root))
+        next_time = time.perf_counter() - start
+
+        rows.append(["{0} vs {1}".format(position["bot"]["species"], position["opp"]["species"]),
+                     "on" if ponder else "off", round(decision_time * 1000, 2), round(start_time * 1000, 2),
+                     round(loop_time * 1000, 3), round(stop_time * 1000, 2), round(next_time * 1000, 2)])
+
+    return rows
+
+
+def build_damage_groups() -> List[Tuple[List[Move], Pokemon, Pokemon, bool]]:
+    """
+    Builds the cases on which the batch damage calculator is checked against the scalar one: every move of the Pokémon
+    in the recorded positions, plus some moves with special rules, against every Pokémon of the other side
+    :return: the moves of each attacker against each defender, and whether the attacker is the bot's Pokémon
+    """
+    pairs = []
+    for position in BENCHMARK_POSITIONS:
+        bots = [build_bot_pokemon(position["bot"])] + [build_bot_pokemon(data) for data in position["bot_team"]]
+        opps = [build_opp_pokemon(position["opp"])] + [build_opp_pokemon(data) for data in position["opp_team"]]
+        pairs += [(bot, opp, True) for bot in bots for opp in opps]
+        pairs += [(opp, bot, False) for bot in bots for opp in opps]
+
+    special_moves = [Gen8Move(move_id) for move_id in DAMAGE_CHECK_MOVES]
+    return [(list(attacker.moves.values()) + special_moves, attacker, defender, is_bot)
+            for attacker, defender, is_bot in pairs]
+
+
+def merge_damage_groups(groups: List[Tuple[List[Move], Pokemon, Pokemon, bool]],
+                        is_bot: bool) -> Tuple[List[Move], List[Pokemon], List[Pokemon]]:
+    """
+    Merges the groups of a side into a single batch, with an attacker and a defender for each move
+    :param groups: the groups returned by build_damage_groups
+    :param is_bot: whether the side is the bot's one
+    :return: the moves of the side, their attackers and their defenders
+    """
+    side_groups = [(moves, attacker, defender) for moves, attacker, defender, side in groups if side == is_bot]
+    return ([move for moves, _, _ in side_groups for move in moves],
+            [attacker for moves, attacker, _ in side_groups for _ in moves],
+            [defender for moves, _, defender in side_groups for _ in moves])
+
+
+def benchmark_damage(repeat: int) -> List[List]:
+    """
+    Computes the damage of the moves built by build_damage_groups both one move at a time and in batches, either a
+    batch for each attacker and defender or a single batch for each side. The batches must give the same results, the
+    comparison is repeated in several battle states. The time taken by the damage distributions of the same moves is
+    also measured
+    :param repeat: how many times the damage is computed
+    :return: a row of the benchmark table for each battle state
+    """
+    groups = build_damage_groups()
+    sides = [merge_damage_groups(groups, is_bot) + (is_bot,) for is_bot in [True, False]]
+    boosts = DAMAGE_CHECK_BOOSTS
+    rows = []
+    for name, weather, terrains, conditions in DAMAGE_CHECK_STATES:
+        cases = sum(len(moves) for moves, _, _, _ in groups)
+        scalar_time, batch_time, single_time = float("inf"), float("inf"), float("inf")
+        distribution_time, mismatches = float("inf"), 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scalar = [[compute_damage(move, attacker, defender, weather, terrains, conditions, boosts, None, is_bot)
+                       for move in moves] for moves, attacker, defender, is_bot in groups]
+            scalar_time = min(scalar_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            batch = [compute_damage_batch(moves, attacker, defender, weather, terrains, conditions, boosts, None,
+                                          is_bot) for moves, attacker, defender, is_bot in groups]
+            batch_time = min(batch_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            single = [compute_damage_batch(moves, attackers, defenders, weather, terrains, conditions, boosts, None,
+                                           is_bot) for moves, attackers, defenders, is_bot in sides]
+            single_time = min(single_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            for moves, attacker, defender, is_bot in groups:
+                compute_damage_distribution(moves, attacker, defender, weather, terrains, conditions, boosts, None,
+                                            is_bot)
+            distribution_time = min(distribution_time, time.perf_counter() - start)
+
+        for scalar_group, batch_group in zip(scalar, batch):
+            for i, damage in enumerate(scalar_group):
+                if any(damage[key] != batch_group[key][i] for key in ["power", "lb", "ub", "move_type"]):
+                    mismatches += 1
+
+        # The groups of the bot come first in both sides
+        single_scalar = [damage for side in [True, False] for scalar_group, (_, _, _, is_bot) in zip(scalar, groups)
+                         if is_bot == side for damage in scalar_group]
+        single_batch = [{key: values[i] for key, values in side_batch.items()} for side_batch in single
+                        for i in range(len(side_batch["ub"]))]
+        for damage, batch_damage in zip(single_scalar, single_batch):
+            if any(damage[key] != batch_damage[key] for key in ["power", "lb", "ub", "move_type"]):
+                mismatches += 1
+
+        rows.append([name, cases, round(scalar_time * 1000, 2), round(batch_time * 1000, 2),
+                     round(single_time * 1000, 2), round(distribution_time * 1000, 2), mismatches])
+
+    return rows
+
+
+def run_benchmark():
+    opt_parser = parse_arguments()
+    if opt_parser.damage:
+        table = benchmark_damage(opt_parser.repeat)
+        print(tabulate(table, headers=["State", "Moves", "Scalar (ms)", "Batch (ms)", "Single batch (ms)",
+                                       "Distribution (ms)", "Mismatches"]))
+        return
+
+    if opt_parser.mcts > 0:
+        player = MCTSPlayer(heuristic=TeamHeuristic(), max_depth=opt_parser.depth, iterations=opt_parser.mcts,
+                            time_budget_ms=opt_parser.budget if opt_parser.budget > 0 else None,
+                            max_switches=opt_parser.switches, batch_size=1 if opt_parser.no_batch else 8,
+                            start_listening=False)
+    else:
+        configuration = SearchConfiguration(
+            transposition_table_size=opt_parser.tt_size,
+            time_budget_ms=opt_parser.budget if opt_parser.budget > 0 else None,
+            move_ordering=not opt_parser.no_ordering, workers=opt_parser.workers, chance_nodes=opt_parser.chance,
+            damage_buckets=opt_parser.damage_buckets, chance_depth=opt_parser.chance_depth,
+            simultaneous=opt_parser.simultaneous, max_switches=opt_parser.switches, batch_leaves=opt_parser.batch,
+            reuse_tree=opt_parser.reuse, ponder=opt_parser.ponder > 0,
+            max_nodes=opt_parser.max_nodes if opt_parser.max_nodes > 0 else None,
+            max_memory=opt_parser.max_memory * 1024 if opt_parser.max_memory > 0 else None, pvs=opt_parser.pvs,
+            aspiration_window=opt_parser.aspiration if opt_parser.aspiration > 0 else None,
+            max_extensions=opt_parser.extensions,
+            reduction_index=opt_parser.reduction_index if opt_parser.reduction_index > 0 else None,
+            reduction_ply=opt_parser.reduction_ply, action_pruning=opt_parser.prune,
+            opponent_model=OpponentModel(opt_parser.opponent_moves) if opt_parser.opponent_moves > 0 else None,
+            endgame_pokemon=opt_parser.endgame, endgame_depth=opt_parser.endgame_depth,
+            endgame_time_ms=opt_parser.endgame_time)
+        player = MiniMaxPlayer(heuristic=TeamHeuristic(), max_depth=opt_parser.depth, start_listening=False,
+                               search_configuration=configuration)
+    if opt_parser.latency:
+        table = [row for position in BENCHMARK_POSITIONS for row in benchmark_pondering(player, position,
+                                                                                        opt_parser.ponder)]
+        player.shutdown_process_pool()
+        print(tabulate(table, headers=["Position", "Pondering", "Decision (ms)", "Ponder start (ms)",
+                                       "Event loop call (ms)", "Stop (ms)", "Next decision (ms)"]))
+        return
+
+    start = time.perf_counter()
+    reuse = opt_parser.reuse or opt_parser.ponder > 0
+    table = [benchmark_alphabeta(player, position, opt_parser.repeat, opt_parser.next_turn, reuse, opt_parser.ponder)
+             for position in BENCHMARK_POSITIONS]
+    player.shutdown_process_pool()
+    print(tabulate(table, headers=["Position", "Nodes", "Cutoff rate", "First cutoffs", "TT cutoffs", "TT reused",
+                                "Re-searches", "Pruned", "Depth", "Time (ms)", "Nodes/s", "Peak memory (KiB)",
+                                "Score"]))
+    print("Total time: {0:.2f}s".format(time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    run_benchmark()
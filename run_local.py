@@ -2,6 +2,7 @@ from poke_env import PlayerConfiguration
 from src.players.baseline_player import MaxBasePowerPlayer, BestDamagePlayer
 from src.players.RuleBasedPlayer import RuleBasedPlayer
 from src.players.MiniMaxPlayer import MiniMaxPlayer
+from src.players.MCTSPlayer import MCTSPlayer
 from src.utilities import evaluate_players_locally
 from src.minimax.heuristic.TeamHeuristic import TeamHeuristic
 import argparse
@@ -13,7 +14,8 @@ def parse_arguments(known=False):
     parser.add_argument("--matches", type=int, default=100, help="the number of challenges that the bot will accept")
     parser.add_argument("--concurrency", type=int, default=10, help="max concurrent battles")
     parser.add_argument("--players", nargs="+", type=str, default=["BD", "RB"],
-                        help="the playstyles list, MBP MaxBasePower, BD BestDamage, RB RuleBased, MM MiniMax")
+                        help="the playstyles list, MBP MaxBasePower, BD BestDamage, RB RuleBased, MM MiniMax, "
+                             "MCTS Monte Carlo Tree Search")
     parser.add_argument("--save", action="store_true", help="save the results into a csv file")
     opt = parser.parse_known_args()[0] if known else parser.parse_args()
     return opt
@@ -29,6 +31,7 @@ async def run_bot_local():
     bd_players = 0
     rb_players = 0
     mm_players = 0
+    mcts_players = 0
     players = list()
 
     for playstyle in playstyles:
@@ -54,6 +57,12 @@ async def run_bot_local():
             player = MiniMaxPlayer(player_configuration=PlayerConfiguration(player_username, None),
                                    max_concurrent_battles=max_concurrency, heuristic=heuristic, max_depth=2)
             mm_players += 1
+        elif playstyle == "MCTS":
+            player_username = "MCTS{0}".format(mcts_players)
+            heuristic = TeamHeuristic()
+            player = MCTSPlayer(player_configuration=PlayerConfiguration(player_username, None),
+                                max_concurrent_battles=max_concurrency, heuristic=heuristic, iterations=1000)
+            mcts_players += 1
         else:
             raise ValueError
 
@@ -5,6 +5,7 @@ from poke_env import PlayerConfiguration, ShowdownServerConfiguration
 from src.players.baseline_player import MaxBasePowerPlayer, BestDamagePlayer
 from src.players.RuleBasedPlayer import RuleBasedPlayer
 from src.players.MiniMaxPlayer import MiniMaxPlayer
+from src.players.MCTSPlayer import MCTSPlayer
 from src.utilities import challenge_player, send_player_on_ladder
 from src.minimax.heuristic.TeamHeuristic import TeamHeuristic
 
@@ -15,7 +16,8 @@ def parse_arguments(known=False):
     parser.add_argument("--password", type=str, default="", help="the bot's password")
     parser.add_argument("--matches", type=int, default=1, help="the number of challenges that the bot will accept")
     parser.add_argument("--player", type=str, default="RB",
-                        help="the bot's playstyle, MBP MaxBasePower, BD BestDamage, RB RuleBased, MM MiniMax")
+                        help="the bot's playstyle, MBP MaxBasePower, BD BestDamage, RB RuleBased, MM MiniMax, "
+                             "MCTS Monte Carlo Tree Search")
     parser.add_argument("--ladder", action="store_true", help="let the bot play on the ladder")
     parser.add_argument("--verbose", action="store_true", help="let the bot print its status at each turn")
     parser.add_argument("--save", action="store_true", help="save the battle results in a csv file")
@@ -49,6 +51,10 @@ async def run_bot_online():
         heuristic = TeamHeuristic()
         player = MiniMaxPlayer(player_configuration=player_config, server_configuration=ShowdownServerConfiguration,
                                heuristic=heuristic, max_depth=2)
+    elif playstyle == "MCTS":
+        heuristic = TeamHeuristic()
+        player = MCTSPlayer(player_configuration=player_config, server_configuration=ShowdownServerConfiguration,
+                            heuristic=heuristic, iterations=1000)
     else:
         raise ValueError
 
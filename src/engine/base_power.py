@@ -3,7 +3,10 @@ from poke_env.environment.move_category import MoveCategory
 from poke_env.environment.pokemon_type import PokemonType
 from src.engine.useful_data import STATUS_CONDITIONS, IGNORE_EFFECT_ABILITIES_IDS
 from src.engine.stats import compute_stat
-from typing import Union
+from typing import Union, Dict, Callable
+
+# Modifier of the power of a move, it takes the move, its type and the attacker
+PowerModifier = Callable[[Move, PokemonType, Pokemon], float]
 
 
 def base_power_modifiers_moves(move: Move, attacker: Pokemon, defender: Pokemon) -> float:
@@ -42,212 +45,180 @@ def base_power_modifiers_moves(move: Move, attacker: Pokemon, defender: Pokemon)
     return base_power_modifier
 
 
-def base_power_modifiers_abilities(move: Move, move_type: PokemonType, attacker: Pokemon, defender: Pokemon) -> float:
+def __pinch_power_modifier(boosted_type: PokemonType) -> PowerModifier:
     """
-    Computes the modifiers of a move's base power considering the abilities of both active Pokémon
-    :param move: move under consideration
-    :param move_type: move type
-    :param attacker: attacking Pokémon
-    :param defender: defending Pokémon
-    :return: Base power modifier that takes into account abilities and items
+    Builds the modifier of the abilities that boost the moves of a type when the user's hp is less or equal than 1/3
+    :param boosted_type: type of the boosted moves
+    :return: the modifier of the ability
     """
-    base_power_modifier = 1
+    return lambda move, move_type, attacker: \
+        1.5 if attacker.current_hp_fraction <= 0.33 and move_type is boosted_type else 1
 
-    if "neutralizinggas" in [attacker.ability, defender.ability]:
-        return 1
 
-    # Moves of Pokémon with the following abilities have their power increased if their hp is less or equal than 1/3
-    if attacker.current_hp_fraction <= 0.33:
-        if attacker.ability == "overgrow" and move_type is PokemonType.GRASS:
-            base_power_modifier *= 1.5
+def __type_power_modifier(boosted_type: PokemonType, multiplier: float) -> PowerModifier:
+    """
+    Builds the modifier of the abilities and items that boost the moves of a type
+    :param boosted_type: type of the boosted moves
+    :param multiplier: boost to the power of the moves
+    :return: the modifier of the ability or item
+    """
+    return lambda move, move_type, attacker: multiplier if move_type is boosted_type else 1
 
-        if attacker.ability == "blaze" and move_type is PokemonType.FIRE:
-            base_power_modifier *= 1.5
 
-        if attacker.ability == "torrent" and move_type is PokemonType.WATER:
-            base_power_modifier *= 1.5
+def __flag_power_modifier(flag: str, multiplier: float) -> PowerModifier:
+    """
+    Builds the modifier of the abilities that boost the moves with a flag
+    :param flag: flag of the boosted moves
+    :param multiplier: boost to the power of the moves
+    :return: the modifier of the ability
+    """
+    return lambda move, move_type, attacker: multiplier if flag in move.flags else 1
 
-        if attacker.ability == "swarm" and move_type is PokemonType.BUG:
-            base_power_modifier *= 1.5
 
-    # The "reckless" ability boosts power of moves with recoil
-    if attacker.ability == "reckless" and move.recoil > 0:
-        base_power_modifier *= 1.2
+def __category_power_modifier(category: MoveCategory, multiplier: float) -> PowerModifier:
+    """
+    Builds the modifier of the items that boost the moves of a category
+    :param category: category of the boosted moves
+    :param multiplier: boost to the power of the moves
+    :return: the modifier of the item
+    """
+    return lambda move, move_type, attacker: multiplier if move.category is category else 1
 
-    # The "iron fist" ability boosts power of punching moves
-    if attacker.ability == "ironfist" and "punch" in move.flags:
-        base_power_modifier *= 1.2
 
-    # The "normalize" ability changes all move types to normal-type and boosts their power
-    if attacker.ability == "normalize" and move_type is not PokemonType.NORMAL:
-        base_power_modifier *= 1.2
+# Modifiers of the attacker's abilities
+ABILITY_POWER_MODIFIERS: Dict[str, PowerModifier] = {
+    # Moves of Pokémon with the following abilities have their power increased if their hp is less or equal than 1/3
+    "overgrow": __pinch_power_modifier(PokemonType.GRASS),
+    "blaze": __pinch_power_modifier(PokemonType.FIRE),
+    "torrent": __pinch_power_modifier(PokemonType.WATER),
+    "swarm": __pinch_power_modifier(PokemonType.BUG),
 
-    # The "aerilate" ability changes all normal-type moves to flying-type and boosts their power
-    if attacker.ability == "aerilate" and move_type is PokemonType.NORMAL:
-        base_power_modifier *= 1.2
+    # The "reckless" ability boosts power of moves with recoil
+    "reckless": lambda move, move_type, attacker: 1.2 if move.recoil > 0 else 1,
 
-    # The "refrigerate" ability changes all normal-type moves to ice-type and boosts their power
-    if attacker.ability == "refrigerate" and move_type is PokemonType.NORMAL:
-        base_power_modifier *= 1.2
+    # The "iron fist" ability boosts power of punching moves
+    "ironfist": __flag_power_modifier("punch", 1.2),
 
-    # The "pixilate" ability changes all normal-type moves to fairy-type and boosts their power
-    if attacker.ability == "pixilate" and move_type is PokemonType.NORMAL:
-        base_power_modifier *= 1.2
+    # The "normalize" ability changes all move types to normal-type and boosts their power
+    "normalize": lambda move, move_type, attacker: 1.2 if move_type is not PokemonType.NORMAL else 1,
 
-    # The "galvanize" ability changes all normal-type moves to electric-type and boosts their power
-    if attacker.ability == "galvanize" and move_type is PokemonType.NORMAL:
-        base_power_modifier *= 1.2
+    # The following abilities change all normal-type moves to another type and boost their power
+    "aerilate": __type_power_modifier(PokemonType.NORMAL, 1.2),
+    "refrigerate": __type_power_modifier(PokemonType.NORMAL, 1.2),
+    "pixilate": __type_power_modifier(PokemonType.NORMAL, 1.2),
+    "galvanize": __type_power_modifier(PokemonType.NORMAL, 1.2),
 
     # The "water bubble" ability doubles the power of water-type moves
-    if attacker.ability == "waterbubble" and move_type is PokemonType.WATER:
-        base_power_modifier *= 2
+    "waterbubble": __type_power_modifier(PokemonType.WATER, 2),
 
     # The "punk rock" ability boosts the power of sound-based moves
-    if attacker.ability == "punkrock" and "sound" in move.flags:
-        base_power_modifier *= 1.3
-
-    # If a Pokémon with the "dark aura" ability is active, the power of dark-type moves is increased
-    if "darkaura" in [attacker.ability, defender.ability] and move_type is PokemonType.DARK:
-        # If a Pokémon with the "aura break" ability is active, the power of dark-type moves is decreased
-        if "aurabreak" not in [attacker.ability, defender.ability]:
-            base_power_modifier *= 1.33
-        elif attacker.ability not in IGNORE_EFFECT_ABILITIES_IDS:
-            base_power_modifier *= 0.75
-
-    # If a Pokémon with the "fairy aura" ability is active, the power of fairy-type moves is increased
-    if "fairyaura" in [attacker.ability, defender.ability] and move_type is PokemonType.FAIRY:
-        # If a Pokémon with the "aura break" ability is active, the power of fairy-type moves is decreased
-        if "aurabreak" not in [attacker.ability, defender.ability]:
-            base_power_modifier *= 1.33
-        elif attacker.ability not in IGNORE_EFFECT_ABILITIES_IDS:
-            base_power_modifier *= 0.75
+    "punkrock": __flag_power_modifier("sound", 1.3),
 
     # The "strong jaw" ability boosts the power of biting moves
-    if attacker.ability == "strongjaw" and "bite" in move.flags:
-        base_power_modifier *= 1.5
+    "strongjaw": __flag_power_modifier("bite", 1.5),
 
     # The "mega-launcher" ability boosts the power of aura and pulse moves
-    if attacker.ability == "megalauncher" and "pulse" in move.flags:
-        base_power_modifier *= 1.5
+    "megalauncher": __flag_power_modifier("pulse", 1.5),
 
     # The "technician" ability boosts the power of moves with a base power <= 60
-    if attacker.ability == "technician" and move.base_power <= 60:
-        base_power_modifier *= 1.5
+    "technician": lambda move, move_type, attacker: 1.5 if move.base_power <= 60 else 1,
 
     # The "toxic boost" ability boosts the power of physical moves if the user is poisoned
-    if attacker.ability == "toxicboost" and move.category is MoveCategory.PHYSICAL \
-            and attacker.status in [Status.PSN, Status.TOX]:
-        base_power_modifier *= 1.5
+    "toxicboost": lambda move, move_type, attacker:
+    1.5 if move.category is MoveCategory.PHYSICAL and attacker.status in [Status.PSN, Status.TOX] else 1,
 
     # The "flare boost" ability boosts the power of special moves if the user is burned
-    if attacker.ability == "flareboost" and move.category is MoveCategory.SPECIAL and attacker.status in [Status.BRN]:
-        base_power_modifier *= 1.5
+    "flareboost": lambda move, move_type, attacker:
+    1.5 if move.category is MoveCategory.SPECIAL and attacker.status in [Status.BRN] else 1,
 
     # The "dragon's maw" ability boosts the power of dragon-type moves
-    if attacker.ability == "dragonsmaw" and move_type is PokemonType.DRAGON:
-        base_power_modifier *= 1.5
+    "dragonsmaw": __type_power_modifier(PokemonType.DRAGON, 1.5),
 
     # The "transistor" ability boosts the power of electric-type moves
-    if attacker.ability == "transistor" and move_type is PokemonType.ELECTRIC:
-        base_power_modifier *= 1.5
+    "transistor": __type_power_modifier(PokemonType.ELECTRIC, 1.5),
 
     # The "steelworker" and "steely spirit" abilities boost the power of steel-type moves
-    if attacker.ability in ["steelworker", "steelyspirit"] and move_type is PokemonType.STEEL:
-        base_power_modifier *= 1.5
+    "steelworker": __type_power_modifier(PokemonType.STEEL, 1.5),
+    "steelyspirit": __type_power_modifier(PokemonType.STEEL, 1.5),
+}
 
-    return base_power_modifier
+# Modifiers of the attacker's items
+ITEM_POWER_MODIFIERS: Dict[str, PowerModifier] = {
+    # The "muscleband" item boosts the power of physical moves
+    "muscleband": __category_power_modifier(MoveCategory.PHYSICAL, 1.1),
 
+    # The "wise glasses" item boosts the power of special moves
+    "wiseglasses": __category_power_modifier(MoveCategory.SPECIAL, 1.1),
+
+    # The following items boost the power of the moves of their type
+    "blackbelt": __type_power_modifier(PokemonType.FIGHTING, 1.2),
+    "blackglasses": __type_power_modifier(PokemonType.DARK, 1.2),
+    "charcoal": __type_power_modifier(PokemonType.FIRE, 1.2),
+    "dragonfang": __type_power_modifier(PokemonType.DRAGON, 1.2),
+    "hardstone": __type_power_modifier(PokemonType.ROCK, 1.2),
+    "magnet": __type_power_modifier(PokemonType.ELECTRIC, 1.2),
+    "metalcoat": __type_power_modifier(PokemonType.STEEL, 1.2),
+    "miracleseed": __type_power_modifier(PokemonType.GRASS, 1.2),
+    "mysticwater": __type_power_modifier(PokemonType.WATER, 1.2),
+    "nevermeltice": __type_power_modifier(PokemonType.ICE, 1.2),
+    "poisonbarb": __type_power_modifier(PokemonType.POISON, 1.2),
+    "sharpbeek": __type_power_modifier(PokemonType.FLYING, 1.2),
+    "slikscarf": __type_power_modifier(PokemonType.NORMAL, 1.2),
+    "silverpowder": __type_power_modifier(PokemonType.BUG, 1.2),
+    "softsand": __type_power_modifier(PokemonType.GROUND, 1.2),
+    "spelltag": __type_power_modifier(PokemonType.GHOST, 1.2),
+    "twistedspoon": __type_power_modifier(PokemonType.PSYCHIC, 1.2),
+}
 
-def base_power_modifiers_items(move: Move, move_type: PokemonType, attacker: Pokemon) -> float:
+
+def base_power_modifiers_abilities(move: Move, move_type: PokemonType, attacker: Pokemon, defender: Pokemon) -> float:
     """
-    Computes the modifiers of a move's base power considering the items of the active Pokémon
+    Computes the modifiers of a move's base power considering the abilities of both active Pokémon. Only the modifier
+    registered for the attacker's ability is computed, the auras are the only abilities that work from both sides
     :param move: move under consideration
     :param move_type: move type
     :param attacker: attacking Pokémon
+    :param defender: defending Pokémon
     :return: Base power modifier that takes into account abilities and items
     """
-    if attacker.item is None or attacker.item == "unknown_item":
+    if "neutralizinggas" in [attacker.ability, defender.ability]:
         return 1
 
-    base_power_modifier = 1
-
-    # The "muscleband" item boosts the power of physical moves
-    if attacker.item == "muscleband" and move.category is MoveCategory.PHYSICAL:
-        base_power_modifier *= 1.1
-
-    # The "wise glasses" item boosts the power of special moves
-    if attacker.item == "wiseglasses" and move.category is MoveCategory.SPECIAL:
-        base_power_modifier *= 1.1
-
-    # The "black belt" item boosts the power of fighting-type moves
-    if attacker.item == "blackbelt" and move_type is PokemonType.FIGHTING:
-        base_power_modifier *= 1.2
-
-    # The "black glasses" item boosts the power of dark-type moves
-    if attacker.item == "blackglasses" and move_type is PokemonType.DARK:
-        base_power_modifier *= 1.2
-
-    # The "charcoal" item boosts the power of fire-type moves
-    if attacker.item == "charcoal" and move_type is PokemonType.FIRE:
-        base_power_modifier *= 1.2
+    ability_modifier = ABILITY_POWER_MODIFIERS.get(attacker.ability)
+    base_power_modifier = ability_modifier(move, move_type, attacker) if ability_modifier else 1
 
-    # The "dragon fang" item boosts the power of dragon-type moves
-    if attacker.item == "dragonfang" and move_type is PokemonType.DRAGON:
-        base_power_modifier *= 1.2
-
-    # The "hard stone" item boosts the power of rock-type moves
-    if attacker.item == "hardstone" and move_type is PokemonType.ROCK:
-        base_power_modifier *= 1.2
-
-    # The "magnet" item boosts the power of electric-type moves
-    if attacker.item == "magnet" and move_type is PokemonType.ELECTRIC:
-        base_power_modifier *= 1.2
-
-    # The "metal coat" item boosts the power of steel-type moves
-    if attacker.item == "metalcoat" and move_type is PokemonType.STEEL:
-        base_power_modifier *= 1.2
-
-    # The "miracle seed" item boosts the power of grass-type moves
-    if attacker.item == "miracleseed" and move_type is PokemonType.GRASS:
-        base_power_modifier *= 1.2
-
-    # The "mystic water" item boosts the power of water-type moves
-    if attacker.item == "mysticwater" and move_type is PokemonType.WATER:
-        base_power_modifier *= 1.2
-
-    # The "never-melt ice" item boosts the power of ice-type moves
-    if attacker.item == "nevermeltice" and move_type is PokemonType.ICE:
-        base_power_modifier *= 1.2
-
-    # The "poison barb" item boosts the power of poison-type moves
-    if attacker.item == "poisonbarb" and move_type is PokemonType.POISON:
-        base_power_modifier *= 1.2
-
-    # The "sharp beek" item boosts the power of flying-type moves
-    if attacker.item == "sharpbeek" and move_type is PokemonType.FLYING:
-        base_power_modifier *= 1.2
-
-    # The "silkscarf" item boosts the power of normal-type moves
-    if attacker.item == "slikscarf" and move_type is PokemonType.NORMAL:
-        base_power_modifier *= 1.2
+    # If a Pokémon with the "dark aura" ability is active, the power of dark-type moves is increased
+    if "darkaura" in [attacker.ability, defender.ability] and move_type is PokemonType.DARK:
+        # If a Pokémon with the "aura break" ability is active, the power of dark-type moves is decreased
+        if "aurabreak" not in [attacker.ability, defender.ability]:
+            base_power_modifier *= 1.33
+        elif attacker.ability not in IGNORE_EFFECT_ABILITIES_IDS:
+            base_power_modifier *= 0.75
 
-    # The "silver powder" item boosts the power of bug-type moves
-    if attacker.item == "silverpowder" and move_type is PokemonType.BUG:
-        base_power_modifier *= 1.2
+    # If a Pokémon with the "fairy aura" ability is active, the power of fairy-type moves is increased
+    if "fairyaura" in [attacker.ability, defender.ability] and move_type is PokemonType.FAIRY:
+        # If a Pokémon with the "aura break" ability is active, the power of fairy-type moves is decreased
+        if "aurabreak" not in [attacker.ability, defender.ability]:
+            base_power_modifier *= 1.33
+        elif attacker.ability not in IGNORE_EFFECT_ABILITIES_IDS:
+            base_power_modifier *= 0.75
 
-    # The "soft sand" item boosts the power of ground-type moves
-    if attacker.item == "softsand" and move_type is PokemonType.GROUND:
-        base_power_modifier *= 1.2
+    return base_power_modifier
 
-    # The "spell tag" item boosts the power of ghost-type moves
-    if attacker.item == "spelltag" and move_type is PokemonType.GHOST:
-        base_power_modifier *= 1.2
 
-    # The "twisted spoon" item boosts the power of psychic-type moves
-    if attacker.item == "twistedspoon" and move_type is PokemonType.PSYCHIC:
-        base_power_modifier *= 1.2
+def base_power_modifiers_items(move: Move, move_type: PokemonType, attacker: Pokemon) -> float:
+    """
+    Computes the modifiers of a move's base power considering the items of the active Pokémon
+    :param move: move under consideration
+    :param move_type: move type
+    :param attacker: attacking Pokémon
+    :return: Base power modifier that takes into account abilities and items
+    """
+    item_modifier = ITEM_POWER_MODIFIERS.get(attacker.item)
+    if item_modifier is None:
+        return 1
 
-    return base_power_modifier
+    return item_modifier(move, move_type, attacker)
 
 
 def compute_base_power(move: Move,
@@ -1,11 +1,18 @@
 from poke_env.environment import Pokemon, Move, Weather, Field, Status, SideCondition, PokemonGender, Effect
 from poke_env.environment.move_category import MoveCategory
 from poke_env.environment.pokemon_type import PokemonType
-from src.engine.stats import compute_stat
+from src.engine.stats import compute_stat, compute_stat_stages, boost_stage, BOOST_MULTIPLIERS
 from src.engine.base_power import compute_base_power
-from src.engine.useful_data import IGNORE_EFFECT_ABILITIES_IDS
+from src.engine.useful_data import IGNORE_EFFECT_ABILITIES_IDS, DAMAGE_ROLLS, CRIT_PROBABILITIES, CRIT_RATIO_ITEMS, \
+    CRIT_IMMUNE_ABILITIES, MULTI_HIT_PROBABILITIES, INCREASING_POWER_HITS_MOVES
+from src.engine.battle_utilities import compute_move_accuracy
 from src.engine.move_effects import move_changes_type
-from typing import Union, List, Dict
+from src.engine.type_chart import TYPE_INDICES, TYPE_CHARTS, MOVE_TYPE_CHARTS, type_effectiveness
+from typing import Union, List, Dict, Tuple, Callable
+import numpy as np
+
+# Modifier of the damage of a move, it takes the move, its type, the attacker, the defender and the weather
+DamageModifier = Callable[[Move, PokemonType, Pokemon, Pokemon, Weather], float]
 
 
 def move_fixed_damage(move: Move, move_type: PokemonType, attacker: Pokemon, defender: Pokemon) -> (bool, int):
@@ -33,16 +40,16 @@ def move_fixed_damage(move: Move, move_type: PokemonType, attacker: Pokemon, def
     # One hit KO moves do as much damage as the remaining hp if the attacker's level is equal or higher
     # than the defender's, otherwise they deal no damage
     if move.id in ["fissure", "guillotine", "horndrill", "sheercold"]:
-        if defender.level <= attacker.level and defender.damage_multiplier(move_type) > 0:
+        if defender.level <= attacker.level and type_effectiveness(move_type, defender) > 0:
             fixed_damage = defender.current_hp
         else:
             fixed_damage = 0
 
     # Take care of moves that deal damage equal to a percent of the defender hp
-    if move.id in ["superfang", "naturesmadness"] and defender.damage_multiplier(move_type) > 0:
+    if move.id in ["superfang", "naturesmadness"] and type_effectiveness(move_type, defender) > 0:
         fixed_damage = int(defender.current_hp / 2)
 
-    if move.id == "guardianofalola" and defender.damage_multiplier(move_type) > 0:
+    if move.id == "guardianofalola" and type_effectiveness(move_type, defender) > 0:
         fixed_damage = int(defender.current_hp * 0.75)
 
     # Some moves work only when the attacker is switched in
@@ -55,124 +62,177 @@ def move_fixed_damage(move: Move, move_type: PokemonType, attacker: Pokemon, def
         return False, 0
 
 
-def compute_other_damage_modifiers(move: Move,
-                                   move_type: PokemonType,
-                                   attacker: Pokemon,
-                                   defender: Pokemon,
-                                   weather: Weather,
-                                   defender_conditions: List[SideCondition]) -> float:
+# Abilities that make the defender immune to some moves, each one takes the move, its type and the defender. All the
+# possible abilities of the defender are checked, since the opponent's one is usually unknown
+ABILITY_IMMUNITIES: Dict[str, Callable[[Move, PokemonType, Pokemon], bool]] = {
+    # Pokémon with the "water absorb", "dry skin" or "storm drain" abilities suffer no damage from water type moves
+    "waterabsorb": lambda move, move_type, defender: move_type is PokemonType.WATER,
+    "dryskin": lambda move, move_type, defender: move_type is PokemonType.WATER,
+    "stormdrain": lambda move, move_type, defender: move_type is PokemonType.WATER,
+
+    # Pokémon with the "levitate" ability suffer no damage from ground type moves, unless they hold an iron ball
+    "levitate": lambda move, move_type, defender: move_type is PokemonType.GROUND and defender.item != "ironball",
+
+    # Pokémon with the "volt absorb", "motor drive" or "lightning rod" abilities suffer no damage from electric moves
+    "voltabsorb": lambda move, move_type, defender: move_type is PokemonType.ELECTRIC,
+    "motordrive": lambda move, move_type, defender: move_type is PokemonType.ELECTRIC,
+    "lightningrod": lambda move, move_type, defender: move_type is PokemonType.ELECTRIC,
+
+    # Pokémon with the "flash fire" ability suffer no damage from fire type moves
+    "flashfire": lambda move, move_type, defender: move_type is PokemonType.FIRE,
+
+    # Pokémon with the "sap sipper" ability suffer no damage from grass type moves
+    "sapsipperr": lambda move, move_type, defender: move_type is PokemonType.GRASS,
+
+    # Pokémon with the "soundproof" ability suffer no damage from sound-based moves
+    "soundproof": lambda move, move_type, defender: "sound" in move.flags,
+}
+
+
+def __dry_skin_modifier(move: Move, move_type: PokemonType, attacker: Pokemon, defender: Pokemon,
+                        weather: Weather) -> float:
     """
-    Computes the damage modifier considering various battle parameters
+    The "dry skin" ability increases the damage of fire-type moves, even more under sunny weather
     :param move: move under consideration
     :param move_type: move type
     :param attacker: attacking Pokémon
     :param defender: defending Pokémon
     :param weather: current battle weather
-    :param defender_conditions: conditions on the opponent's side
-    :return: Damage modifier that takes into account every battle parameter
+    :return: the damage modifier of the ability
     """
-    damage_modifier = 1
+    if move_type is not PokemonType.FIRE or attacker.ability in IGNORE_EFFECT_ABILITIES_IDS:
+        return 1
 
-    # Pokémon with the "water absorb", "dry skin" or "storm drain" abilities suffer no damage from water type moves
-    if move_type is PokemonType.WATER and ("waterabsorb" in defender.possible_abilities
-                                           or "dryskin" in defender.possible_abilities
-                                           or "stormdrain" in defender.possible_abilities):
-        return 0
+    return 2 if weather in [Weather.SUNNYDAY, Weather.DESOLATELAND] else 1.25
 
-    # Pokémon with the "water absorb" ability suffer no damage from water type moves
-    if move_type is PokemonType.GROUND and defender.item != "ironball" and \
-            ("levitate" in defender.possible_abilities or Effect.MAGNET_RISE in defender.effects):
-        return 0
 
-    # If the defender has the "air baloon" item then it takes no damage from ground-type moves
-    if move_type is PokemonType.GROUND and defender.item == "airballoon":
-        return 0
+def __rivalry_modifier(move: Move, move_type: PokemonType, attacker: Pokemon, defender: Pokemon,
+                       weather: Weather) -> float:
+    """
+    The "rivalry" ability increases the damage dealt to Pokémon of the same gender and decreases the damage dealt to
+    the ones of the opposite gender
+    :param move: move under consideration
+    :param move_type: move type
+    :param attacker: attacking Pokémon
+    :param defender: defending Pokémon
+    :param weather: current battle weather
+    :return: the damage modifier of the ability
+    """
+    if PokemonGender.NEUTRAL in [attacker.gender, defender.gender]:
+        return 1
 
-    # Pokémon with the "volt absorb", "motordrive" or "lightningrod" abilities suffer no damage from electric type moves
-    if move_type is PokemonType.ELECTRIC and ("voltabsorb" in defender.possible_abilities
-                                              or "motordrive" in defender.possible_abilities
-                                              or "lightningrod" in defender.possible_abilities):
-        return 0
+    return 1.25 if attacker.gender == defender.gender else 0.75
 
-    # Pokémon with the "flash fire" ability suffer no damage from fire type moves
-    if move_type is PokemonType.FIRE and "flashfire" in defender.possible_abilities:
-        return 0
-
-    # Pokémon with the "sap sipper" ability suffer no damage from grass type moves
-    if move_type is PokemonType.GRASS and "sapsipperr" in defender.possible_abilities:
-        return 0
 
+# Modifiers of the defender's abilities, each one takes the move, its type, the attacker, the defender and the weather
+DEFENDER_ABILITY_MODIFIERS: Dict[str, DamageModifier] = {
     # Pokémon with the "wonder guard" ability can only take damage from super-effective moves
-    if defender.ability == "wonderguard" and defender.damage_multiplier(move_type) < 2:
-        return 0
-
-    # Pokémon with the "soundproof" ability suffer no damage from sound-based moves
-    if "sound" in move.flags and "soundproof" in defender.possible_abilities:
-        return 0
-
-    # The "poltergeist" move deals no damage if the defender has no item
-    if move.id == "poltergeist" and defender.item is None:
-        return 0
+    "wonderguard": lambda move, move_type, attacker, defender, weather:
+    0 if type_effectiveness(move_type, defender) < 2 else 1,
 
     # Pokémon with the "bulletproof" ability suffer no damage from bullet-based moves
-    if defender.ability == "bulletproof" and "bullet" in move.flags:
-        return 0
+    "bulletproof": lambda move, move_type, attacker, defender, weather: 0 if "bullet" in move.flags else 1,
 
-    # Pokémon with the "punk rock" ability suffer no damage from sound-based moves
-    if defender.ability == "punkrock" and "sound" in move.flags:
-        damage_modifier *= 0.5
+    # Pokémon with the "punk rock" ability suffer half the damage from sound-based moves
+    "punkrock": lambda move, move_type, attacker, defender, weather: 0.5 if "sound" in move.flags else 1,
 
     # Pokémon with the following abilities receive 0.75 less damage from super-effective moves
-    if defender.ability in ["filter", "solidrock", "prismarmor"] and defender.damage_multiplier(move_type) >= 2:
-        damage_modifier *= .75
+    "filter": lambda move, move_type, attacker, defender, weather:
+    .75 if type_effectiveness(move_type, defender) >= 2 else 1,
+    "solidrock": lambda move, move_type, attacker, defender, weather:
+    .75 if type_effectiveness(move_type, defender) >= 2 else 1,
+    "prismarmor": lambda move, move_type, attacker, defender, weather:
+    .75 if type_effectiveness(move_type, defender) >= 2 else 1,
 
     # Pokémon with the following abilities receive 0.5 less damage from super-effective moves while at full hp
-    if defender.ability in ["multiscale", "shadowshield"] and defender.current_hp_fraction == 1:
-        damage_modifier *= 0.5
+    "multiscale": lambda move, move_type, attacker, defender, weather: 0.5 if defender.current_hp_fraction == 1 else 1,
+    "shadowshield": lambda move, move_type, attacker, defender, weather:
+    0.5 if defender.current_hp_fraction == 1 else 1,
 
-    # The "heatproof" ability, while defending, reduces fire moves damage,
-    # meanwhile the "dry skin" ability does the opposite
-    if move_type is PokemonType.FIRE and attacker.ability not in IGNORE_EFFECT_ABILITIES_IDS:
-        if defender.ability == "heatproof":
-            damage_modifier *= 0.5
-        elif defender.ability == "dryskin":
-            if weather in [Weather.SUNNYDAY, Weather.DESOLATELAND]:
-                damage_modifier *= 2
-            else:
-                damage_modifier *= 1.25
-
-    # Pokémon with the "rivalry" ability deal 1.25 more damage to Pokémon of the same gender,
-    # while dealing 0.75 less damage to the ones from the opposite gender
-    if attacker.ability == "rivalry" and PokemonGender.NEUTRAL not in [attacker.gender, defender.gender]:
-        if attacker.gender == defender.gender:
-            damage_modifier *= 1.25
-        else:
-            damage_modifier *= 0.75
-
-    # Pokémon with the "neuroforce" ability deal 1.25 more damage if they are using a super-effective move
-    if attacker.ability == "neuroforce" and defender.damage_multiplier(move_type) >= 2:
-        damage_modifier *= 1.25
+    # The "heatproof" ability, while defending, reduces fire moves damage, meanwhile the "dry skin" ability does the
+    # opposite
+    "heatproof": lambda move, move_type, attacker, defender, weather:
+    0.5 if move_type is PokemonType.FIRE and attacker.ability not in IGNORE_EFFECT_ABILITIES_IDS else 1,
+    "dryskin": __dry_skin_modifier,
 
     # Pokémon with the "water bubble" ability suffer half the damage from fire-type moves
-    if defender.ability == "waterbubble" and move_type is PokemonType.FIRE:
-        damage_modifier *= 0.5
+    "waterbubble": lambda move, move_type, attacker, defender, weather: 0.5 if move_type is PokemonType.FIRE else 1,
 
     # Pokémon with the "ice scales" ability suffer half the damage from special moves
-    if defender.ability == "icescales" and move.category is MoveCategory.SPECIAL:
-        damage_modifier *= 0.5
+    "icescales": lambda move, move_type, attacker, defender, weather:
+    0.5 if move.category is MoveCategory.SPECIAL else 1,
 
-    # Pokémon with the "fluffy" ability suffer double the damage from fire-type moves,
-    # but suffer half the damage from contact moves
-    if defender.ability == "fluffy":
-        if move_type is PokemonType.FIRE:
-            damage_modifier *= 2
-        elif "contact" in move.flags:
-            damage_modifier *= 0.5
+    # Pokémon with the "fluffy" ability suffer double the damage from fire-type moves, but suffer half the damage from
+    # contact moves
+    "fluffy": lambda move, move_type, attacker, defender, weather:
+    2 if move_type is PokemonType.FIRE else 0.5 if "contact" in move.flags else 1,
+}
+
+# Modifiers of the attacker's abilities, each one takes the move, its type, the attacker, the defender and the weather
+ATTACKER_ABILITY_MODIFIERS: Dict[str, DamageModifier] = {
+    # Pokémon with the "rivalry" ability deal 1.25 more damage to Pokémon of the same gender, while dealing 0.75 less
+    # damage to the ones from the opposite gender
+    "rivalry": __rivalry_modifier,
+
+    # Pokémon with the "neuroforce" ability deal 1.25 more damage if they are using a super-effective move
+    "neuroforce": lambda move, move_type, attacker, defender, weather:
+    1.25 if type_effectiveness(move_type, defender) >= 2 else 1,
 
     # Pokémon with the "merciless" ability deal 1.5 more damage to poisoned Pokémon
-    if attacker.ability == "merciless" and defender.status in [Status.PSN, Status.TOX] \
-            and defender.ability not in ["battlearmor", "shellarmour"]:
-        damage_modifier *= 1.5
+    "merciless": lambda move, move_type, attacker, defender, weather:
+    1.5 if defender.status in [Status.PSN, Status.TOX] and defender.ability not in CRIT_IMMUNE_ABILITIES
+    else 1,
+}
+
+# Modifiers of the attacker's items
+ITEM_DAMAGE_MODIFIERS: Dict[str, float] = {
+    # Pokémon with the "life orb" item deal increased damage
+    "lifeorb": 1.3,
+}
+
+
+def compute_other_damage_modifiers(move: Move,
+                                   move_type: PokemonType,
+                                   attacker: Pokemon,
+                                   defender: Pokemon,
+                                   weather: Weather,
+                                   defender_conditions: List[SideCondition]) -> float:
+    """
+    Computes the damage modifier considering various battle parameters. The abilities and the items are looked up in
+    their registries, so only the rules of the abilities and items of the active Pokémon are computed
+    :param move: move under consideration
+    :param move_type: move type
+    :param attacker: attacking Pokémon
+    :param defender: defending Pokémon
+    :param weather: current battle weather
+    :param defender_conditions: conditions on the opponent's side
+    :return: Damage modifier that takes into account every battle parameter
+    """
+    for ability in defender.possible_abilities:
+        is_immune = ABILITY_IMMUNITIES.get(ability)
+        if is_immune and is_immune(move, move_type, defender):
+            return 0
+
+    # Pokémon under the "magnet rise" effect suffer no damage from ground type moves, unless they hold an iron ball
+    if move_type is PokemonType.GROUND and defender.item != "ironball" and Effect.MAGNET_RISE in defender.effects:
+        return 0
+
+    # If the defender has the "air baloon" item then it takes no damage from ground-type moves
+    if move_type is PokemonType.GROUND and defender.item == "airballoon":
+        return 0
+
+    # The "poltergeist" move deals no damage if the defender has no item
+    if move.id == "poltergeist" and defender.item is None:
+        return 0
+
+    defender_modifier = DEFENDER_ABILITY_MODIFIERS.get(defender.ability)
+    damage_modifier = defender_modifier(move, move_type, attacker, defender, weather) if defender_modifier else 1
+    if damage_modifier == 0:
+        return 0
+
+    attacker_modifier = ATTACKER_ABILITY_MODIFIERS.get(attacker.ability)
+    if attacker_modifier:
+        damage_modifier *= attacker_modifier(move, move_type, attacker, defender, weather)
 
     # Pokémon with the "flashfire" effect deal 1.5 more damage when using a fire-type move
     if Effect.FLASH_FIRE in attacker.effects and move_type is PokemonType.FIRE:
@@ -200,52 +260,33 @@ def compute_other_damage_modifiers(move: Move,
     if SideCondition.LIGHT_SCREEN in defender_conditions and move.category is MoveCategory.SPECIAL:
         damage_modifier *= 0.5
 
-    # Pokémon with the "life orb" item deal increased damage
-    if attacker.item == "lifeorb":
-        damage_modifier *= 1.3
+    return damage_modifier * ITEM_DAMAGE_MODIFIERS.get(attacker.item, 1)
 
-    return damage_modifier
 
-
-def compute_damage(move: Move,
-                   attacker: Pokemon,
-                   defender: Pokemon,
-                   weather: Weather = None,
-                   terrains: List[Field] = None,
-                   defender_conditions: List[SideCondition] = None,
-                   attacker_boosts: Dict[str, int] = None,
-                   defender_boosts: Dict[str, int] = None,
-                   is_bot: bool = False,
-                   verbose: bool = False) -> Dict[str, Union[int | PokemonType]]:
+def compute_attack_defense(move: Move,
+                           move_type: PokemonType,
+                           attacker: Pokemon,
+                           defender: Pokemon,
+                           weather: Weather = None,
+                           terrains: List[Field] = None,
+                           attacker_boosts: Dict[str, int] = None,
+                           defender_boosts: Dict[str, int] = None,
+                           is_bot: bool = False,
+                           stat_cache: Dict[Tuple, int] = None) -> Tuple[str, float, str, int]:
     """
-    Computes the damage dealt by a move
-    :param move: the move under consideration
+    Computes the attacker's offensive stat and the defender's defensive stat used by a move
+    :param move: move under consideration
+    :param move_type: move type
     :param attacker: attacking Pokémon
     :param defender: defending Pokémon
     :param weather: current battle weather
     :param terrains: current terrains on the battle
-    :param defender_conditions: conditions on the opponent's side
     :param attacker_boosts: attacker's stat boosts
     :param defender_boosts: defender's stat boosts
     :param is_bot: whether the bot is the attacking Pokémon
-    :param verbose: print infos aobut the damage computation
-    :return: Base power, lower and upper bound of the damage and the new move type
+    :param stat_cache: stats already computed in the same battle state, so that a batch computes them once
+    :return: name and value of the offensive stat, name and value of the defensive stat
     """
-    # Change the move type if some abilities have such effect
-    _, move_type = move_changes_type(move, attacker)
-
-    # Deal with fixed damage moves
-    is_damage_fixed, fixed_damage = move_fixed_damage(move, move_type, attacker, defender)
-    if is_damage_fixed:
-        return {"power": move.base_power, "lb": fixed_damage, "ub": fixed_damage, "move_type": move_type}
-
-    # Compute the effect of the attacker level
-    level_multiplier = 2 * attacker.level / 5 + 2
-
-    # Compute the move's power
-    power: int = compute_base_power(move, move_type, attacker, defender)
-
-    # Compute the ratio between the attacker atk/spa stat and the defender def/spd stat
     def_stat = "def" if move.defensive_category is MoveCategory.PHYSICAL else "spd"
     if move.category is MoveCategory.PHYSICAL:
         if move.id != "bodypress":
@@ -269,23 +310,42 @@ def compute_damage(move: Move,
     elif defender_boosts is not None:
         defender_stat_boost = defender_boosts[def_stat]
 
+    def stat_value(pokemon: Pokemon, stat: str, pokemon_is_bot: bool, boost: int) -> int:
+        if stat_cache is None:
+            return compute_stat(pokemon, stat, weather, terrains, pokemon_is_bot, boost=boost)
+
+        key = (id(pokemon), stat, pokemon_is_bot, boost)
+        value = stat_cache.get(key)
+        if value is None:
+            value = compute_stat(pokemon, stat, weather, terrains, pokemon_is_bot, boost=boost)
+            stat_cache[key] = value
+
+        return value
+
     # There are some moves the use the defender's attack to deal damage
     if move.use_target_offensive:
-        attacker_stat_value = compute_stat(defender, att_stat, weather, terrains, not is_bot, boost=defender_stat_boost)
+        attacker_stat_value = stat_value(defender, att_stat, not is_bot, defender_stat_boost)
     else:
-        attacker_stat_value = compute_stat(attacker, att_stat, weather, terrains, is_bot, boost=attacker_stat_boost)
+        attacker_stat_value = stat_value(attacker, att_stat, is_bot, attacker_stat_boost)
 
     if att_stat in ["atk", "spa"] and defender.ability == "thickfat" \
             and move_type in [PokemonType.FIRE, PokemonType.ICE]:
         attacker_stat_value *= 0.5
 
-    defender_stat_value = compute_stat(defender, def_stat, weather, terrains, not is_bot, boost=defender_stat_boost)
-    ratio_attack_defense = attacker_stat_value / defender_stat_value
+    defender_stat_value = stat_value(defender, def_stat, not is_bot, defender_stat_boost)
+    return att_stat, attacker_stat_value, def_stat, defender_stat_value
 
-    # Compute the base damage before taking into account any modifier
-    damage = level_multiplier * power * ratio_attack_defense / 50 + 2
 
-    # Compute the effect of the weather
+def compute_weather_multiplier(move_type: PokemonType, attacker: Pokemon, defender: Pokemon,
+                               weather: Weather = None) -> float:
+    """
+    Computes the effect of the weather on the damage of a move
+    :param move_type: move type
+    :param attacker: attacking Pokémon
+    :param defender: defending Pokémon
+    :param weather: current battle weather
+    :return: the weather multiplier, 0 if the weather prevents the move from dealing damage
+    """
     weather_multiplier = 1
     if weather and not ("airlock" in [attacker.ability, defender.ability]
                         or "cloudnine" in [attacker.ability, defender.ability]):
@@ -295,18 +355,26 @@ def compute_damage(move: Move,
             elif move_type is PokemonType.WATER:
                 weather_multiplier = 0.5
                 if weather is Weather.DESOLATELAND:
-                    return {"power": power, "lb": 0, "ub": 0, "move_type": move_type}
+                    return 0
         elif weather in [Weather.RAINDANCE, Weather.PRIMORDIALSEA]:
             if move_type is PokemonType.WATER:
                 weather_multiplier = 1.5
             elif move_type is PokemonType.FIRE:
                 weather_multiplier = 0.5
                 if weather is Weather.PRIMORDIALSEA:
-                    return {"power": power, "lb": 0, "ub": 0, "move_type": move_type}
+                    return 0
 
-    damage *= weather_multiplier
+    return weather_multiplier
 
-    # Compute the effect of the terrain
+
+def compute_terrain_multiplier(move: Move, move_type: PokemonType, terrains: List[Field] = None) -> float:
+    """
+    Computes the effect of the terrains on the damage of a move
+    :param move: move under consideration
+    :param move_type: move type
+    :param terrains: current terrains on the battle
+    :return: the terrain multiplier, 0 if the terrain prevents the move from dealing damage
+    """
     terrain_multiplier = 1
     if terrains:
         if Field.ELECTRIC_TERRAIN in terrains:
@@ -324,44 +392,120 @@ def compute_damage(move: Move,
             if move_type is PokemonType.PSYCHIC:
                 terrain_multiplier = 1.3
             elif move.priority > 0:
-                return {"power": power, "lb": 0, "ub": 0, "move_type": move_type}
+                return 0
 
-    damage *= terrain_multiplier
+    return terrain_multiplier
 
-    # Compute the effect of the STAB
+
+def compute_stab_multiplier(move_type: PokemonType, attacker: Pokemon) -> float:
+    """
+    Computes the effect of the same type attack bonus on the damage of a move
+    :param move_type: move type
+    :param attacker: attacking Pokémon
+    :return: the STAB multiplier
+    """
     if move_type in attacker.types or attacker.ability in ["protean", "libero"]:
         if attacker.ability == "adaptability":
-            stab_multiplier = 2
+            return 2
         else:
-            stab_multiplier = 1.5
-    else:
-        stab_multiplier = 1
+            return 1.5
 
-    damage *= stab_multiplier
+    return 1
 
-    # Compute the effect of the burn
+
+def compute_burn_multiplier(move: Move, attacker: Pokemon) -> float:
+    """
+    Computes the effect of the burn on the damage of a move
+    :param move: move under consideration
+    :param attacker: attacking Pokémon
+    :return: the burn multiplier
+    """
     if attacker.status is Status.BRN and move.category is MoveCategory.PHYSICAL and attacker.ability != "guts" \
             and move.id != "facade":
-        damage *= 0.5
+        return 0.5
 
-    # Compute the effect of the defender's types
-    type_multiplier = defender.damage_multiplier(move_type)
-
-    # The move "freeze-dry" is super-effective against water-type Pokémon
-    if move.id == "freezedry" and PokemonType.ICE in defender.types:
-        type_multiplier *= 2
-
-    # The move "thousand-arrows" can deal damage to flying-type Pokémon
-    if move.id == "thousandarrows" and PokemonType.FLYING in defender.types:
-        first_type, second_type = defender.types
-        if not second_type:
-            type_multiplier = 1
-        elif first_type is PokemonType.FLYING:
-            type_multiplier = second_type.damage_multiplier(move.type)
-        else:
-            type_multiplier = first_type.damage_multiplier(move.type)
+    return 1
+
+
+def compute_type_multiplier(move: Move, move_type: PokemonType, defender: Pokemon) -> float:
+    """
+    Computes the effectiveness of a move against the defender's types, including the moves that ignore the type chart
+    :param move: move under consideration
+    :param move_type: move type
+    :param defender: defending Pokémon
+    :return: the type multiplier
+    """
+    return type_effectiveness(move_type, defender, move)
+
+
+def compute_damage(move: Move,
+                   attacker: Pokemon,
+                   defender: Pokemon,
+                   weather: Weather = None,
+                   terrains: List[Field] = None,
+                   defender_conditions: List[SideCondition] = None,
+                   attacker_boosts: Dict[str, int] = None,
+                   defender_boosts: Dict[str, int] = None,
+                   is_bot: bool = False,
+                   verbose: bool = False) -> Dict[str, Union[int | PokemonType]]:
+    """
+    Computes the damage dealt by a move
+    :param move: the move under consideration
+    :param attacker: attacking Pokémon
+    :param defender: defending Pokémon
+    :param weather: current battle weather
+    :param terrains: current terrains on the battle
+    :param defender_conditions: conditions on the opponent's side
+    :param attacker_boosts: attacker's stat boosts
+    :param defender_boosts: defender's stat boosts
+    :param is_bot: whether the bot is the attacking Pokémon
+    :param verbose: print infos aobut the damage computation
+    :return: Base power, lower and upper bound of the damage and the new move type
+    """
+    # Change the move type if some abilities have such effect
+    _, move_type = move_changes_type(move, attacker)
+
+    # Deal with fixed damage moves
+    is_damage_fixed, fixed_damage = move_fixed_damage(move, move_type, attacker, defender)
+    if is_damage_fixed:
+        return {"power": move.base_power, "lb": fixed_damage, "ub": fixed_damage, "move_type": move_type}
+
+    # Compute the effect of the attacker level
+    level_multiplier = 2 * attacker.level / 5 + 2
+
+    # Compute the move's power
+    power: int = compute_base_power(move, move_type, attacker, defender)
+
+    # Compute the ratio between the attacker atk/spa stat and the defender def/spd stat
+    att_stat, attacker_stat_value, def_stat, defender_stat_value = compute_attack_defense(
+        move, move_type, attacker, defender, weather, terrains, attacker_boosts, defender_boosts, is_bot)
+    ratio_attack_defense = attacker_stat_value / defender_stat_value
+
+    # Compute the base damage before taking into account any modifier
+    damage = level_multiplier * power * ratio_attack_defense / 50 + 2
+
+    # Compute the effect of the weather
+    weather_multiplier = compute_weather_multiplier(move_type, attacker, defender, weather)
+    if weather_multiplier == 0:
+        return {"power": power, "lb": 0, "ub": 0, "move_type": move_type}
+
+    damage *= weather_multiplier
+
+    # Compute the effect of the terrain
+    terrain_multiplier = compute_terrain_multiplier(move, move_type, terrains)
+    if terrain_multiplier == 0:
+        return {"power": power, "lb": 0, "ub": 0, "move_type": move_type}
+
+    damage *= terrain_multiplier
+
+    # Compute the effect of the STAB
+    damage *= compute_stab_multiplier(move_type, attacker)
 
-    damage *= type_multiplier
+    # Compute the effect of the burn
+    damage *= compute_burn_multiplier(move, attacker)
+
+    # Compute the effect of the defender's types
+    damage *= compute_type_multiplier(move, move_type, defender)
 
     # Compute the effect of various abilities and items
     other_damage_modifiers = compute_other_damage_modifiers(move, move_type, attacker, defender,
@@ -369,7 +513,7 @@ def compute_damage(move: Move,
     damage = int(damage * other_damage_modifiers)
 
     # Some moves have a perfect critical hit rate
-    if move.crit_ratio == 6 and defender.ability not in ["battlearmor", "shellarmour"]:
+    if move.crit_ratio == 6 and defender.ability not in CRIT_IMMUNE_ABILITIES:
         damage *= 1.5
 
     # Define lower and upper bound for the damage after considering moves that hit more than once
@@ -385,3 +529,448 @@ def compute_damage(move: Move,
         print("Damage: {0} - {1}\n".format(lb_damage, ub_damage))
 
     return {"power": power, "lb": lb_damage, "ub": ub_damage, "move_type": move_type}
+
+
+def __encode_pokemon(pokemon: List[Pokemon]) -> Dict[str, np.ndarray]:
+    """
+    Encodes the features of some Pokémon that the multipliers of the damage depend on
+    :param pokemon: the Pokémon under consideration
+    :return: an array for each feature, with an element for each Pokémon
+    """
+    return {"types": np.array([[TYPE_INDICES[pokemon_type] for pokemon_type in poke.types] for poke in pokemon],
+                              dtype=np.int64).reshape(len(pokemon), 2),
+            "level": np.array([poke.level for poke in pokemon], dtype=float),
+            "no_weather": np.array([poke.ability in ["airlock", "cloudnine"] for poke in pokemon], dtype=bool),
+            "any_stab": np.array([poke.ability in ["protean", "libero"] for poke in pokemon], dtype=bool),
+            "adaptability": np.array([poke.ability == "adaptability" for poke in pokemon], dtype=bool),
+            "thick_fat": np.array([poke.ability == "thickfat" for poke in pokemon], dtype=bool),
+            "burned": np.array([poke.status is Status.BRN and poke.ability != "guts" for poke in pokemon],
+                               dtype=bool)}
+
+
+def __weather_multipliers(move_types: np.ndarray, no_weather: np.ndarray, weather: Weather = None) -> np.ndarray:
+    """
+    Computes the effect of the weather on the damage of many moves, in the same way of compute_weather_multiplier
+    :param move_types: the indices of the move types
+    :param no_weather: whether the attacker or the defender of each move suppresses the weather
+    :param weather: current battle weather
+    :return: the weather multipliers, 0 if the weather prevents a move from dealing damage
+    """
+    weather_multipliers = np.ones(len(move_types))
+    if weather in [Weather.SUNNYDAY, Weather.DESOLATELAND]:
+        boosted_type, weakened_type = PokemonType.FIRE, PokemonType.WATER
+    elif weather in [Weather.RAINDANCE, Weather.PRIMORDIALSEA]:
+        boosted_type, weakened_type = PokemonType.WATER, PokemonType.FIRE
+    else:
+        return weather_multipliers
+
+    weakened = 0 if weather in [Weather.DESOLATELAND, Weather.PRIMORDIALSEA] else 0.5
+    weather_multipliers[move_types == TYPE_INDICES[boosted_type]] = 1.5
+    weather_multipliers[move_types == TYPE_INDICES[weakened_type]] = weakened
+    weather_multipliers[no_weather] = 1
+    return weather_multipliers
+
+
+def __terrain_multipliers(move_types: np.ndarray, priority: np.ndarray, ground_moves: np.ndarray,
+                          terrains: List[Field] = None) -> np.ndarray:
+    """
+    Computes the effect of the terrains on the damage of many moves, in the same way of compute_terrain_multiplier
+    :param move_types: the indices of the move types
+    :param priority: whether each move has a positive priority
+    :param ground_moves: whether each move is weakened by the grassy terrain
+    :param terrains: current terrains on the battle
+    :return: the terrain multipliers, 0 if the terrain prevents a move from dealing damage
+    """
+    terrain_multipliers = np.ones(len(move_types))
+    if not terrains:
+        return terrain_multipliers
+
+    if Field.ELECTRIC_TERRAIN in terrains:
+        terrain_multipliers[move_types == TYPE_INDICES[PokemonType.ELECTRIC]] = 1.3
+    elif Field.GRASSY_TERRAIN in terrains:
+        is_grass = move_types == TYPE_INDICES[PokemonType.GRASS]
+        terrain_multipliers[ground_moves & ~is_grass] = 0.5
+        terrain_multipliers[is_grass] = 1.3
+    elif Field.MISTY_TERRAIN in terrains:
+        terrain_multipliers[move_types == TYPE_INDICES[PokemonType.DRAGON]] = 0.5
+    elif Field.PSYCHIC_TERRAIN in terrains:
+        is_psychic = move_types == TYPE_INDICES[PokemonType.PSYCHIC]
+        terrain_multipliers[priority & ~is_psychic] = 0
+        terrain_multipliers[is_psychic] = 1.3
+
+    return terrain_multipliers
+
+
+def encode_damage_batch(moves: List[Move],
+                        attackers: Union[Pokemon, List[Pokemon]],
+                        defenders: Union[Pokemon, List[Pokemon]],
+                        weather: Weather = None,
+                        terrains: List[Field] = None,
+                        defender_conditions: List[SideCondition] = None,
+                        attacker_boosts: Union[Dict[str, int], List[Dict[str, int]]] = None,
+                        defender_boosts: Union[Dict[str, int], List[Dict[str, int]]] = None,
+                        is_bot: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Encodes the factors of the damage dealt by many moves in the same battle state, the i-th move is used by the i-th
+    attacker against the i-th defender. A single Pokémon or a single dict of boosts is shared by all the moves. The
+    rules of the single moves, their type, fixed damage, base power and the modifiers of abilities and items, are
+    computed one move at a time by the same functions of compute_damage. The moves and the Pokémon are then encoded
+    into arrays, from which the stats, weather, terrain, STAB, burn and type multipliers of all the moves are computed
+    at once
+    :param moves: the moves under consideration
+    :param attackers: attacking Pokémon
+    :param defenders: defending Pokémon
+    :param weather: current battle weather
+    :param terrains: current terrains on the battle
+    :param defender_conditions: conditions on the defenders' side
+    :param attacker_boosts: attackers' stat boosts
+    :param defender_boosts: defenders' stat boosts
+    :param is_bot: whether the bot is the attacking Pokémon
+    :return: an array for each factor of the damage, with an element for each move
+    """
+    size = len(moves)
+    if not isinstance(attackers, list):
+        attackers = [attackers] * size
+    if not isinstance(defenders, list):
+        defenders = [defenders] * size
+    if not isinstance(attacker_boosts, list):
+        attacker_boosts = [attacker_boosts] * size
+    if not isinstance(defender_boosts, list):
+        defender_boosts = [defender_boosts] * size
+
+    # Each Pokémon is encoded once, the moves refer to their attacker and defender by index
+    pokemon_indices: Dict[int, int] = dict()
+    pokemon: List[Pokemon] = []
+    for poke in attackers + defenders:
+        if id(poke) not in pokemon_indices:
+            pokemon_indices[id(poke)] = len(pokemon)
+            pokemon.append(poke)
+    attacker_indices = np.array([pokemon_indices[id(poke)] for poke in attackers], dtype=np.int64)
+    defender_indices = np.array([pokemon_indices[id(poke)] for poke in defenders], dtype=np.int64)
+    features = __encode_pokemon(pokemon)
+
+    # Each stat is looked up at the boost stage of the move in a row with its value at every stage, the fixed-damage
+    # moves use the first row, which is neutral
+    stat_rows: List[List[int]] = [[1] * len(BOOST_MULTIPLIERS)]
+    stat_row_indices: Dict[Tuple, int] = dict()
+
+    def stat_row(poke: Pokemon, stat: str, pokemon_is_bot: bool) -> int:
+        key = (id(poke), stat, pokemon_is_bot)
+        row = stat_row_indices.get(key)
+        if row is None:
+            row = len(stat_rows)
+            stat_row_indices[key] = row
+            stat_rows.append(compute_stat_stages(poke, stat, weather, terrains, pokemon_is_bot))
+
+        return row
+
+    # Each move is encoded as a row of numbers, the fixed-damage moves keep the neutral factors since compute_damage
+    # doesn't compute them
+    rows: List[Tuple] = []
+    move_types = np.empty(size, dtype=object)
+    for i, (move, attacker, defender) in enumerate(zip(moves, attackers, defenders)):
+        _, move_type = move_changes_type(move, attacker)
+        move_types[i] = move_type
+        is_damage_fixed, fixed_damage = move_fixed_damage(move, move_type, attacker, defender)
+        if is_damage_fixed:
+            rows.append((True, fixed_damage, move.base_power, 1, False, 1, TYPE_INDICES[None], 0, False, False, False,
+                         False, 0, 6, 0, 6))
+            continue
+
+        # The stats and their boosts are chosen as in compute_attack_defense
+        category = move.category
+        def_stat = "def" if move.defensive_category is MoveCategory.PHYSICAL else "spd"
+        if category is MoveCategory.PHYSICAL:
+            att_stat = "atk" if move.id != "bodypress" else "def"
+        else:
+            att_stat = "spa"
+
+        if defender.ability == "unaware":
+            attacker_stat_boost = 0
+        else:
+            attacker_stat_boost = attacker_boosts[i][att_stat] if attacker_boosts[i] is not None else None
+        if attacker.ability == "unaware" or move.ignore_defensive:
+            defender_stat_boost = 0
+        else:
+            defender_stat_boost = defender_boosts[i][def_stat] if defender_boosts[i] is not None else None
+
+        # There are some moves the use the defender's attack to deal damage
+        if move.use_target_offensive:
+            attack_row = stat_row(defender, att_stat, not is_bot)
+            attack_stage = boost_stage(defender, att_stat, defender_stat_boost) + 6
+        else:
+            attack_row = stat_row(attacker, att_stat, is_bot)
+            attack_stage = boost_stage(attacker, att_stat, attacker_stat_boost) + 6
+
+        rows.append((False, 0, compute_base_power(move, move_type, attacker, defender),
+                     compute_other_damage_modifiers(move, move_type, attacker, defender, weather, defender_conditions),
+                     move.crit_ratio == 6 and defender.ability not in CRIT_IMMUNE_ABILITIES, int(move.expected_hits),
+                     TYPE_INDICES[move_type], MOVE_TYPE_CHARTS.get(move.id, 0),
+                     category is MoveCategory.PHYSICAL and move.id != "facade", move.priority > 0,
+                     att_stat != "def", move.id in ["earthquake", "magnitude", "bulldoze"], attack_row, attack_stage,
+                     stat_row(defender, def_stat, not is_bot),
+                     boost_stage(defender, def_stat, defender_stat_boost) + 6))
+
+    encoded = np.array(rows, dtype=float).reshape(size, 16)
+    fixed = encoded[:, 0] == 1
+    move_type_indices = encoded[:, 6].astype(np.int64)
+    stat_indices = encoded[:, [12, 14]].astype(np.int64)
+    stage_indices = encoded[:, [13, 15]].astype(np.int64)
+    stats = np.array(stat_rows, dtype=float)[stat_indices, stage_indices]
+    attacker_types = features["types"][attacker_indices]
+    defender_types = features["types"][defender_indices]
+
+    # Pokémon with the "thick fat" ability halve the attacking stat of fire and ice moves
+    thick_fat = features["thick_fat"][defender_indices] & (encoded[:, 10] == 1) \
+        & ((move_type_indices == TYPE_INDICES[PokemonType.FIRE]) | (move_type_indices == TYPE_INDICES[PokemonType.ICE]))
+    stats[thick_fat, 0] *= 0.5
+
+    # Protean and libero give the STAB to every move, adaptability makes it stronger
+    stab = (attacker_types == move_type_indices[:, np.newaxis]).any(axis=1) | features["any_stab"][attacker_indices]
+    stab_multipliers = np.where(stab, np.where(features["adaptability"][attacker_indices], 2, 1.5), 1)
+
+    # The moves with no type are neutral, so the fixed-damage moves keep a neutral type multiplier
+    no_weather = features["no_weather"][attacker_indices] | features["no_weather"][defender_indices]
+    burn = features["burned"][attacker_indices] & (encoded[:, 8] == 1)
+    return {"power": encoded[:, 2].astype(np.int64),
+            "level": np.where(fixed, 1, features["level"][attacker_indices]),
+            "attack": stats[:, 0],
+            "defense": stats[:, 1],
+            "weather": np.where(fixed, 1, __weather_multipliers(move_type_indices, no_weather, weather)),
+            "terrain": np.where(fixed, 1, __terrain_multipliers(move_type_indices, encoded[:, 9] == 1,
+                                                                 encoded[:, 11] == 1, terrains)),
+            "stab": np.where(fixed, 1, stab_multipliers),
+            "burn": np.where(burn, 0.5, 1),
+            "type": TYPE_CHARTS[encoded[:, 7].astype(np.int64), move_type_indices, defender_types[:, 0],
+                                defender_types[:, 1]],
+            "other": encoded[:, 3],
+            "hits": encoded[:, 5].astype(np.int64),
+            "fixed": fixed,
+            "fixed_damage": encoded[:, 1].astype(np.int64),
+            "crit": encoded[:, 4] == 1,
+            "move_type": move_types}
+
+
+def compute_damage_from_factors(factors: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Computes the damage of a batch of moves from their encoded factors. The operations are done in the same order of
+    compute_damage on double precision floats, so the results are exactly the same
+    :param factors: the factors returned by encode_damage_batch
+    :return: Base power, lower and upper bound of the damage and the new move type of each move
+    """
+    level_multiplier = 2 * factors["level"] / 5 + 2
+    ratio_attack_defense = factors["attack"] / factors["defense"]
+    damage = level_multiplier * factors["power"] * ratio_attack_defense / 50 + 2
+
+    # A multiplier of 0 stands for a weather or a terrain that prevents the move from dealing damage
+    for name in ["weather", "terrain", "stab", "burn", "type"]:
+        damage *= factors[name]
+
+    damage = np.trunc(damage * factors["other"])
+    damage = np.where(factors["crit"], damage * 1.5, damage)
+    ub_damage = damage * factors["hits"]
+    lb_damage = np.trunc(ub_damage * 0.85)
+
+    fixed = factors["fixed"]
+    ub_damage = np.where(fixed, factors["fixed_damage"], ub_damage)
+    lb_damage = np.where(fixed, factors["fixed_damage"], lb_damage)
+
+    # The damage of the moves that always crit isn't truncated again by compute_damage, so the upper bounds are integers
+    # only if there are none of them
+    return {"power": factors["power"],
+            "lb": lb_damage.astype(np.int64),
+            "ub": ub_damage if factors["crit"].any() else ub_damage.astype(np.int64),
+            "move_type": factors["move_type"]}
+
+
+def compute_damage_batch(moves: List[Move],
+                         attackers: Union[Pokemon, List[Pokemon]],
+                         defenders: Union[Pokemon, List[Pokemon]],
+                         weather: Weather = None,
+                         terrains: List[Field] = None,
+                         defender_conditions: List[SideCondition] = None,
+                         attacker_boosts: Union[Dict[str, int], List[Dict[str, int]]] = None,
+                         defender_boosts: Union[Dict[str, int], List[Dict[str, int]]] = None,
+                         is_bot: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Computes the damage dealt by many moves in the same battle state with a single call, the results are the same of
+    compute_damage called on each move
+    :param moves: the moves under consideration
+    :param attackers: attacking Pokémon, either one for each move or one for all of them
+    :param defenders: defending Pokémon, either one for each move or one for all of them
+    :param weather: current battle weather
+    :param terrains: current terrains on the battle
+    :param defender_conditions: conditions on the defenders' side
+    :param attacker_boosts: attackers' stat boosts, either one dict for each move or one for all of them
+    :param defender_boosts: defenders' stat boosts, either one dict for each move or one for all of them
+    :param is_bot: whether the bot is the attacking Pokémon
+    :return: Base power, lower and upper bound of the damage and the new move type of each move
+    """
+    return compute_damage_from_factors(encode_damage_batch(moves, attackers, defenders, weather, terrains,
+                                                           defender_conditions, attacker_boosts, defender_boosts,
+                                                           is_bot))
+
+
+def compute_crit_probability(move: Move, attacker: Pokemon, defender: Pokemon) -> float:
+    """
+    Computes the probability that a move is a critical hit, the moves that always crit already include it in their
+    damage, so their probability is 0
+    :param move: move under consideration
+    :param attacker: attacking Pokémon
+    :param defender: defending Pokémon
+    :return: the probability of a critical hit
+    """
+    if move.crit_ratio == 6 or defender.ability in CRIT_IMMUNE_ABILITIES:
+        return 0
+
+    crit_ratio = max(move.crit_ratio, 1)
+    if attacker.ability == "superluck":
+        crit_ratio += 1
+    if attacker.item in CRIT_RATIO_ITEMS:
+        crit_ratio += 1
+
+    return CRIT_PROBABILITIES.get(crit_ratio, 1)
+
+
+def compute_hits_probabilities(move: Move, attacker: Pokemon) -> Dict[int, float]:
+    """
+    Computes the probability of each number of hits of a move. The moves whose hits have an increasing power check
+    the accuracy again before each hit after the first one
+    :param move: move under consideration
+    :param attacker: attacking Pokémon
+    :return: the probability of each number of hits
+    """
+    min_hits, max_hits = move.n_hit
+    if attacker.ability == "skilllink":
+        return {max_hits: 1}
+
+    if move.id in INCREASING_POWER_HITS_MOVES:
+        hits_probabilities = {hits: move.accuracy ** (hits - 1) * (1 - move.accuracy) for hits in range(1, max_hits)}
+        hits_probabilities[max_hits] = move.accuracy ** (max_hits - 1)
+        return hits_probabilities
+
+    if min_hits == max_hits:
+        return {max_hits: 1}
+
+    return MULTI_HIT_PROBABILITIES
+
+
+def compute_damage_distribution(moves: List[Move],
+                                attackers: Union[Pokemon, List[Pokemon]],
+                                defenders: Union[Pokemon, List[Pokemon]],
+                                weather: Weather = None,
+                                terrains: List[Field] = None,
+                                defender_conditions: List[SideCondition] = None,
+                                attacker_boosts: Union[Dict[str, int], List[Dict[str, int]]] = None,
+                                defender_boosts: Union[Dict[str, int], List[Dict[str, int]]] = None,
+                                is_bot: bool = False) -> np.ndarray:
+    """
+    Computes the exact distribution of the damage dealt by many moves in the same battle state. Each hit rolls one of
+    the 16 damage rolls and may be a critical hit, the distribution of a hit is a histogram of the rolls that is then
+    convolved with itself for each number of hits and finally folded with the accuracy of the move. The damage of a
+    hit is the upper bound of compute_damage for a single hit scaled by the roll, the critical hits also by 1.5
+    :param moves: the moves under consideration
+    :param attackers: attacking Pokémon, either one for each move or one for all of them
+    :param defenders: defending Pokémon, either one for each move or one for all of them
+    :param weather: current battle weather
+    :param terrains: current terrains on the battle
+    :param defender_conditions: conditions on the defenders' side
+    :param attacker_boosts: attackers' stat boosts, either one dict for each move or one for all of them
+    :param defender_boosts: defenders' stat boosts, either one dict for each move or one for all of them
+    :param is_bot: whether the bot is the attacking Pokémon
+    :return: an array with a row for each move, the element in column d is the probability of dealing d damage
+    """
+    size = len(moves)
+    if not isinstance(attackers, list):
+        attackers = [attackers] * size
+    if not isinstance(defenders, list):
+        defenders = [defenders] * size
+    if not isinstance(attacker_boosts, list):
+        attacker_boosts = [attacker_boosts] * size
+    if not isinstance(defender_boosts, list):
+        defender_boosts = [defender_boosts] * size
+
+    # The damage of a single hit, the number of hits is taken into account by the convolutions
+    factors = encode_damage_batch(moves, attackers, defenders, weather, terrains, defender_conditions,
+                                  attacker_boosts, defender_boosts, is_bot)
+    factors["hits"] = np.ones(size, dtype=np.int64)
+    hit_damage = compute_damage_from_factors(factors)["ub"]
+
+    # Each row holds the 16 normal rolls followed by the 16 critical rolls, the fixed-damage moves don't roll
+    rolls = np.array(DAMAGE_ROLLS)
+    roll_multipliers = np.concatenate([rolls, 1.5 * rolls])
+    crit_p = np.array([0 if fixed else compute_crit_probability(move, attacker, defender)
+                       for move, attacker, defender, fixed in zip(moves, attackers, defenders, factors["fixed"])])
+    roll_p = np.concatenate([np.outer(1 - crit_p, np.ones(len(rolls))), np.outer(crit_p, np.ones(len(rolls)))],
+                            axis=1) / len(rolls)
+    roll_multipliers = np.where(factors["fixed"][:, np.newaxis], 1, roll_multipliers)
+
+    distributions = []
+    for i, (move, attacker, defender) in enumerate(zip(moves, attackers, defenders)):
+        hits_probabilities = compute_hits_probabilities(move, attacker) if not factors["fixed"][i] else {1: 1}
+
+        # The hits of the moves with an increasing power deal a multiple of the damage of the first hit
+        total_distribution = np.zeros(1)
+        hits_distribution = np.ones(1)
+        for hits in range(1, max(hits_probabilities.keys()) + 1):
+            power_multiplier = hits if move.id in INCREASING_POWER_HITS_MOVES else 1
+            hit_values = np.floor(hit_damage[i] * power_multiplier * roll_multipliers[i]).astype(np.int64)
+            hits_distribution = np.convolve(hits_distribution, np.bincount(hit_values, weights=roll_p[i]))
+            if hits in hits_probabilities:
+                total_distribution = np.pad(total_distribution, (0, len(hits_distribution) - len(total_distribution)))
+                total_distribution += hits_distribution * hits_probabilities[hits]
+
+        accuracy = min(compute_move_accuracy(
+            move, attacker, defender, weather, terrains,
+            attacker_boosts[i]["accuracy"] if attacker_boosts[i] is not None else None,
+            defender_boosts[i]["evasion"] if defender_boosts[i] is not None else None), 1)
+        total_distribution *= accuracy
+        total_distribution[0] += 1 - accuracy
+        distributions.append(total_distribution)
+
+    damage_distribution = np.zeros((size, max([len(distribution) for distribution in distributions], default=1)))
+    for i, distribution in enumerate(distributions):
+        damage_distribution[i, :len(distribution)] = distribution
+
+    return damage_distribution
+
+
+def __survival_function(damage_distribution: np.ndarray) -> np.ndarray:
+    """
+    Computes the probability of dealing at least d damage for each move
+    :param damage_distribution: the distributions returned by compute_damage_distribution
+    :return: an array with a column more than the distributions, the last one is always 0
+    """
+    survival = np.cumsum(damage_distribution[:, ::-1], axis=1)[:, ::-1]
+    return np.concatenate([survival, np.zeros((len(damage_distribution), 1))], axis=1)
+
+
+def compute_ko_probability(damage_distribution: np.ndarray, hp: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    Computes the probability that each move knocks out the defender with a single use
+    :param damage_distribution: the distributions returned by compute_damage_distribution
+    :param hp: the defender's current hp, either one for all the moves or one for each move
+    :return: the probability of a KO for each move
+    """
+    hp = np.broadcast_to(np.maximum(hp, 0), damage_distribution.shape[:1]).astype(np.int64)
+    survival = __survival_function(damage_distribution)
+    return survival[np.arange(len(hp)), np.minimum(hp, damage_distribution.shape[1])]
+
+
+def compute_2hko_probability(damage_distribution: np.ndarray, hp: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    Computes the probability that each move knocks out the defender with two uses, each one with its own roll,
+    critical hit and accuracy check
+    :param damage_distribution: the distributions returned by compute_damage_distribution
+    :param hp: the defender's current hp, either one for all the moves or one for each move
+    :return: the probability of a KO in two uses for each move
+    """
+    hp = np.broadcast_to(np.maximum(hp, 0), damage_distribution.shape[:1]).astype(np.int64)
+    survival = __survival_function(damage_distribution)
+
+    # The first use deals d damage, the second one has to deal the remaining hp - d
+    remaining_hp = np.clip(hp[:, np.newaxis] - np.arange(damage_distribution.shape[1]), 0,
+                           damage_distribution.shape[1])
+    second_ko_p = np.take_along_axis(survival, remaining_hp, axis=1)
+    return (damage_distribution * second_ko_p).sum(axis=1)
+
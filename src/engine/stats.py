@@ -1,7 +1,58 @@
 from poke_env.environment import Pokemon, Weather, Field, Status, PokemonType, Effect
 from poke_env.data import NATURES
 from src.engine.useful_data import STATUS_CONDITIONS
-from typing import Union, List
+from typing import Union, List, Dict, Callable, Tuple
+
+# Modifier of a Pokémon's stat, it takes the Pokémon, the weather and the terrains
+StatModifier = Callable[[Pokemon, Weather, List[Field]], float]
+
+# Stats of a Pokémon, the "accuracy" and "evasion" stats can only be boosted
+STATS = ["hp", "atk", "def", "spa", "spd", "spe"]
+
+# Multipliers of the boost stages from -6 to +6
+BOOST_MULTIPLIERS: List[float] = [round((2 + stage) / 2 if stage > 0 else 2 / (2 - stage), 2) for stage in range(-6, 7)]
+
+# Tables of the estimated stats keyed by species, level, ivs, evs and nature. For each stat they hold its value at each
+# boost stage, they are built the first time a Pokémon is seen, since the species and levels of the random battles are
+# a small set
+STAT_TABLES: Dict[Tuple[str, int, int, int, str], Dict[str, List[int]]] = dict()
+
+
+def stat_table(pokemon: Pokemon, ivs: int = 31, evs: int = 84, nature: str = "neutral") -> Dict[str, List[int]]:
+    """
+    Retrieves the table of a Pokémon's estimated stats at each boost stage, without considering the modifiers. The hp
+    stat can't be boosted, so it has the same value at each stage, and it doesn't consider dynamax
+    :param pokemon: the Pokémon under consideration
+    :param ivs: individual values for the stats
+    :param evs: effort values for the stats
+    :param nature: the Pokémon's nature
+    :return: the values of each stat, indexed by the boost stage plus six
+    """
+    key = (pokemon.species, pokemon.level, ivs, evs, nature)
+    table = STAT_TABLES.get(key)
+    if table is not None:
+        return table
+
+    if nature != "neutral" and nature not in NATURES.keys():
+        raise ValueError
+
+    table = dict()
+    for stat in STATS:
+        estimated_stat = 2 * pokemon.base_stats[stat] + ivs + evs / 4
+        estimated_stat = int(estimated_stat * pokemon.level / 100) + 5
+
+        # The hp stat has a different computation than the others
+        if stat == "hp":
+            estimated_stat = 1 if pokemon.species == "shedinja" else estimated_stat + pokemon.level + 5
+            table[stat] = [estimated_stat] * len(BOOST_MULTIPLIERS)
+        else:
+            if nature != "neutral":
+                estimated_stat = int(estimated_stat * NATURES[nature][stat])
+
+            table[stat] = [int(estimated_stat * boost) for boost in BOOST_MULTIPLIERS]
+
+    STAT_TABLES[key] = table
+    return table
 
 
 def estimate_stat(pokemon: Pokemon, stat: str, ivs: int = 31, evs: int = 84, nature: str = "neutral") -> int:
@@ -16,32 +67,32 @@ def estimate_stat(pokemon: Pokemon, stat: str, ivs: int = 31, evs: int = 84, nat
     :param nature: the Pokémon's nature
     :return: an estimation of a Pokémon's stat
     """
-    if stat not in list(pokemon.base_stats.keys()) and stat not in ["accuracy", "evasion"]:
+    if stat not in STATS and stat not in ["accuracy", "evasion"]:
         raise ValueError
 
     if ivs < 0 or ivs > 31 or evs < 0 or evs > 252:
         raise ValueError
 
-    estimated_stat = 2 * pokemon.base_stats[stat] + ivs + evs / 4
-    estimated_stat = int(estimated_stat * pokemon.level / 100) + 5
+    # The stats at boost stage 0 are the estimated ones
+    estimated_stat = stat_table(pokemon, ivs, evs, nature)[stat][6]
+    if stat == "hp" and pokemon.is_dynamaxed and pokemon.species != "shedinja":
+        estimated_stat *= 2
 
-    # The hp stat has a different computation than the others
-    if stat == "hp":
-        if pokemon.species == "shedinja":
-            return 1
+    return estimated_stat
 
-        estimated_stat += pokemon.level + 5
-        if pokemon.is_dynamaxed:
-            estimated_stat *= 2
-    else:
-        # Compute nature multiplier
-        if nature != "neutral":
-            if nature not in NATURES.keys():
-                raise ValueError
 
-            estimated_stat = int(estimated_stat * NATURES[nature][stat])
+def boost_stage(pokemon: Pokemon, stat: str, boost: Union[int | None] = None) -> int:
+    """
+    Retrieves the boost stage of a Pokémon's stat
+    :param pokemon: the Pokémon under consideration
+    :param stat: the stat we are considering
+    :param boost: the stages we can force on the stat boost computation
+    :return: the boost stage of the stat
+    """
+    if boost and -6 <= boost <= 6:
+        return boost
 
-    return estimated_stat
+    return pokemon.boosts[stat]
 
 
 def compute_stat_boost(pokemon: Pokemon, stat: str, boost: Union[int | None] = None) -> float:
@@ -54,260 +105,249 @@ def compute_stat_boost(pokemon: Pokemon, stat: str, boost: Union[int | None] = N
     :param boost: the stages we can force on the stat boost computation
     :return: the modifier to the stat that comes from its boosts
     """
-    if stat not in list(pokemon.base_stats.keys()) and stat not in ["accuracy", "evasion"]:
+    if stat not in STATS and stat not in ["accuracy", "evasion"]:
         raise ValueError
 
     # The "hp" stat can't have boosts
     if stat == "hp":
         return 1
 
-    if boost and -6 <= boost <= 6:
-        boost_to_apply = boost
-    else:
-        boost_to_apply = pokemon.boosts[stat]
-
-    if stat not in ["accuracy, evasion"]:
-        if boost_to_apply > 0:
-            stat_boost = (2 + boost_to_apply) / 2
-        else:
-            stat_boost = 2 / (2 - boost_to_apply)
-    else:
-        if boost_to_apply > 0:
-            stat_boost = (3 + boost_to_apply) / 3
-        else:
-            stat_boost = 3 / (3 - boost_to_apply)
-
-    return round(stat_boost, 2)
-
-
-def __compute_atk_modifiers(pokemon: Pokemon, weather: Weather = None) -> float:
-    atk_modifier = 1
-
-    # Pokémon with the "flower gift" ability have their attack increased under sunny weather
-    if pokemon.ability == "flowergift" and weather in [Weather.SUNNYDAY, Weather.DESOLATELAND]:
-        atk_modifier *= 1.5
-
-    # Pokémon with the "defeatist" ability have their attack halved when their hp is <= 1/2
-    if pokemon.ability == "defeatist" and pokemon.current_hp_fraction <= 0.5:
-        atk_modifier *= 0.5
-
-    # Pokémon with the "guts" ability have their attack increased when they have a status condition
-    if pokemon.ability == "guts" and pokemon.status in STATUS_CONDITIONS:
-        atk_modifier *= 1.5
-
-    # Pokémon with the "hustle" ability have their attack increased
-    if pokemon.ability == "hustle":
-        atk_modifier *= 1.5
-
-    # Pokémon with the "gorilla tactics" have their attack increased if they are not dynamaxed
-    if pokemon.ability == "gorillatactics" and not pokemon.is_dynamaxed:
-        atk_modifier *= 1.5
-
-    # Pokémon with the "huge power" or "pure power" abilities have their attack doubled
-    if pokemon.ability in ["hugepower", "purepower"]:
-        atk_modifier *= 2
-
-    # Pokémon with the "choiceband" item have their attack increased
-    if pokemon.item == "choiceband" and not pokemon.is_dynamaxed:
-        atk_modifier *= 1.5
-
-    # Cubone and its evolutions have their attack doubled if they hold the "thick club" item
-    if pokemon.species in ["cubone", "marowak", "marowakalola"] and pokemon.item == "thickclub":
-        atk_modifier *= 2
-
-    # Pikachu has its attack doubled if it holds the "light ball" item
-    if "pikachu" in pokemon.species and pokemon.item == "lightball":
-        atk_modifier *= 2
-
-    return atk_modifier
-
-
-def __compute_def_modifiers(pokemon: Pokemon, terrains: List[Field] = None) -> float:
-    def_modifier = 1
-
-    # Pokémon with the "grass pelt" ability have their defense increased under grassy terrain
-    if pokemon.ability == "grasspelt" and Field.GRASSY_TERRAIN in terrains:
-        def_modifier *= 1.5
-
-    # Pokémon with the "marvel scale" ability have their defense increased if they have a status condition
-    if pokemon.ability == "marvelscale" and pokemon.status in STATUS_CONDITIONS:
-        def_modifier *= 1.5
-
-    # The "eviolite" item works with only non-fully evolved pokèmon, we assume that this item is used only in such case
-    if pokemon.item == "eviolite":
-        def_modifier *= 1.5
-
-    # Ditto has its defense doubled if it holds the "metal powder" item
-    if pokemon.species == "ditto" and pokemon.item == "metalpowder":
-        def_modifier *= 2
-
-    return def_modifier
-
-
-def __compute_spa_modifiers(pokemon: Pokemon, weather: Weather = None) -> float:
-    spa_modifier = 1
-
-    # Pokémon with the "flower gift" or "solar power" abilities have their special attack increased under sunny weather
-    if pokemon.ability in ["flowergift", "solarpower"] and weather in [Weather.SUNNYDAY, Weather.DESOLATELAND]:
-        spa_modifier *= 1.5
-
-    # Pokémon with the "choice specs" item have their special attack increased if not dynmaxed
-    if pokemon.item == "choicespecs" and not pokemon.is_dynamaxed:
-        spa_modifier *= 1.5
-
-    # Clamperl has its special attack doubled if it holds the "deep sea tooth" item
-    if pokemon.species == "clamperl" and pokemon.item == "deepseatooth":
-        spa_modifier *= 2
-
-    # Pikachu has its special attack doubled if it holds the "light ball" item
-    if "pikachu" in pokemon.species and pokemon.item == "lightball":
-        spa_modifier *= 2
-
-    return spa_modifier
-
-
-def __compute_spd_modifiers(pokemon: Pokemon, weather: Weather = None) -> float:
-    spd_modifier = 1
-
-    # Rock-type Pokémon have their special defense increased under sandstorm
-    if PokemonType.ROCK in pokemon.types and weather is Weather.SANDSTORM:
-        spd_modifier *= 1.5
+    return BOOST_MULTIPLIERS[boost_stage(pokemon, stat, boost) + 6]
 
-    # Pokémon with the "assault vest" item have their special defense increased
-    if pokemon.item == "assaultvest":
-        spd_modifier *= 1.5
 
-    # Clamperls has its special defense increased if it holds the "deep sea scale" item
-    if pokemon.species == "clamperl" and pokemon.item == "deepseascale":
-        spd_modifier *= 2
-
-    # The "eviolite" item works with only non-fully evolved pokèmon, we assume that this item is used only for such case
-    if pokemon.item == "eviolite":
-        spd_modifier *= 1.5
-
-    # Ditto has its special defense doubled if it holds the "metal powder" item
-    if pokemon.species == "ditto" and pokemon.item == "metalpowder":
-        spd_modifier *= 2
-
-    return spd_modifier
-
-
-def __compute_spe_modifiers(pokemon: Pokemon, weather: Weather = None, terrains: List[Field] = None) -> float:
-    spe_modifier = 1
-
-    # Pokémon with the "swift swim" ability have their speed doubled under rainy weather
-    if pokemon.ability == "swiftswim" and weather in [Weather.RAINDANCE, Weather.PRIMORDIALSEA]:
-        spe_modifier *= 2
-
-    # Pokémon with the "chlorophyll" ability have their speed doubled under sunny day
-    if pokemon.ability == "chlorophyll" and weather in [Weather.SUNNYDAY, Weather.DESOLATELAND]:
-        spe_modifier *= 2
-
-    # Pokémon with the "sand rush" ability have their speed doubled under sandstorm
-    if pokemon.ability == "sandrush" and weather is Weather.SANDSTORM:
-        spe_modifier *= 2
-
-    # Pokémon with the "slush rush" ability have their speed doubled under hail
-    if pokemon.ability == "slushrush" and weather is Weather.HAIL:
-        spe_modifier *= 2
-
-    # Pokémon with the "quick feet" ability have their speed increased if they have a status condition
-    if pokemon.ability == "quickfeet" and pokemon.status in STATUS_CONDITIONS:
-        spe_modifier *= 1.5
-
-    # Pokémon with the "surge surfer" ability have their speed doubled under electric terrain
-    if pokemon.ability == "surgesurfer" and Field.ELECTRIC_TERRAIN in terrains:
-        spe_modifier *= 2
-
-    # Pokémon with the "choice scarf" item have their speed increased
-    if pokemon.item == "choicescarf":
-        spe_modifier *= 1.5
-
-    # Ditto has its speed increased if it holds the "quick powder" item
-    if pokemon.species == "ditto" and pokemon.item == "quickpowder":
-        spe_modifier *= 1.5
-
-    # Pokémon with the "heavy ball" item have their speed halved
-    if pokemon.item == "heavyball":
-        spe_modifier *= 0.5
-
-    # Paralyzed Pokémon have their speed halved
-    if pokemon.status is Status.PAR:
-        spe_modifier *= 0.5
-
-    return spe_modifier
-
-
-def __compute_accuracy_modifiers(pokemon: Pokemon) -> float:
-    accuracy_modifier = 1
-
-    # Pokémon with the "compound eyes" have their accuracy increased
-    if pokemon.ability == "compoundeyes":
-        accuracy_modifier *= 1.3
-
-    # Pokémon with the "wide lens" item have their accuracy increased
-    if pokemon.item == "widelens":
-        accuracy_modifier *= 1.1
+def __weather_stat_modifier(weathers: List[Weather], multiplier: float) -> StatModifier:
+    """
+    Builds the modifier of the abilities that boost a stat under some weathers
+    :param weathers: weathers that activate the ability
+    :param multiplier: boost to the stat
+    :return: the modifier of the ability
+    """
+    return lambda pokemon, weather, terrains: multiplier if weather in weathers else 1
 
-    # Pokémon with the "victory star" item have their accuracy increased
-    if pokemon.item == "victorystar":
-        accuracy_modifier *= 1.1
 
-    return accuracy_modifier
+def __status_stat_modifier(multiplier: float) -> StatModifier:
+    """
+    Builds the modifier of the abilities that boost a stat when the Pokémon has a status condition
+    :param multiplier: boost to the stat
+    :return: the modifier of the ability
+    """
+    return lambda pokemon, weather, terrains: multiplier if pokemon.status in STATUS_CONDITIONS else 1
 
 
-def __compute_evasion_modifiers(pokemon: Pokemon, weather: Weather = None) -> float:
-    evasion_modifier = 1
+def __species_stat_modifier(species: List[str], multiplier: float) -> StatModifier:
+    """
+    Builds the modifier of the items that boost a stat only for some species
+    :param species: species that benefit from the item
+    :param multiplier: boost to the stat
+    :return: the modifier of the item
+    """
+    return lambda pokemon, weather, terrains: multiplier if pokemon.species in species else 1
 
-    # Pokémon with the "sand veil" ability have their evasion increased under sandstorm
-    if pokemon.ability == "sandveil" and weather is Weather.SANDSTORM:
-        evasion_modifier *= 1.2
 
-    # Pokémon with the "tangled feet" ability have their evasion increased if they are confused
-    if pokemon.ability == "tangledfeet" and Effect.CONFUSION in list(pokemon.effects.keys()):
-        evasion_modifier *= 1.5
+def __constant_stat_modifier(multiplier: float) -> StatModifier:
+    """
+    Builds the modifier of the abilities and items that always boost a stat
+    :param multiplier: boost to the stat
+    :return: the modifier of the ability or item
+    """
+    return lambda pokemon, weather, terrains: multiplier
 
-    # Pokémon with the "snow cloak" ability have their evasion increased under hail
-    if pokemon.ability == "snowcloak" and weather is Weather.HAIL:
-        evasion_modifier *= 1.2
 
-    # Pokémon with the "bright powder" item have their evasion increased
-    if pokemon.item == "brigthpowder":
-        evasion_modifier *= 1.1
+def __not_dynamaxed_stat_modifier(multiplier: float) -> StatModifier:
+    """
+    Builds the modifier of the abilities and items that boost a stat if the Pokémon is not dynamaxed
+    :param multiplier: boost to the stat
+    :return: the modifier of the ability or item
+    """
+    return lambda pokemon, weather, terrains: multiplier if not pokemon.is_dynamaxed else 1
 
-    # Pokémon with the "lax incense" item have their evasion increased
-    if pokemon.item == "laxincense":
-        evasion_modifier *= 1.05
 
-    return evasion_modifier
+def __light_ball_modifier(pokemon: Pokemon, weather: Weather, terrains: List[Field]) -> float:
+    """
+    Pikachu has its attack and special attack doubled if it holds the "light ball" item
+    :param pokemon: the Pokémon under consideration
+    :param weather: the current weather
+    :param terrains: the current terrains on the field
+    :return: the modifier of the item
+    """
+    return 2 if "pikachu" in pokemon.species else 1
+
+
+# Modifiers of the stats coming from the Pokémon's ability, for each stat they are keyed by the ability
+STAT_ABILITY_MODIFIERS: Dict[str, Dict[str, StatModifier]] = {
+    "atk": {
+        # Pokémon with the "flower gift" ability have their attack increased under sunny weather
+        "flowergift": __weather_stat_modifier([Weather.SUNNYDAY, Weather.DESOLATELAND], 1.5),
+
+        # Pokémon with the "defeatist" ability have their attack halved when their hp is <= 1/2
+        "defeatist": lambda pokemon, weather, terrains: 0.5 if pokemon.current_hp_fraction <= 0.5 else 1,
+
+        # Pokémon with the "guts" ability have their attack increased when they have a status condition
+        "guts": __status_stat_modifier(1.5),
+
+        # Pokémon with the "hustle" ability have their attack increased
+        "hustle": __constant_stat_modifier(1.5),
+
+        # Pokémon with the "gorilla tactics" have their attack increased if they are not dynamaxed
+        "gorillatactics": __not_dynamaxed_stat_modifier(1.5),
+
+        # Pokémon with the "huge power" or "pure power" abilities have their attack doubled
+        "hugepower": __constant_stat_modifier(2),
+        "purepower": __constant_stat_modifier(2),
+    },
+    "def": {
+        # Pokémon with the "grass pelt" ability have their defense increased under grassy terrain
+        "grasspelt": lambda pokemon, weather, terrains: 1.5 if Field.GRASSY_TERRAIN in terrains else 1,
+
+        # Pokémon with the "marvel scale" ability have their defense increased if they have a status condition
+        "marvelscale": __status_stat_modifier(1.5),
+    },
+    "spa": {
+        # Pokémon with the "flower gift" or "solar power" abilities have their special attack increased under sunny
+        # weather
+        "flowergift": __weather_stat_modifier([Weather.SUNNYDAY, Weather.DESOLATELAND], 1.5),
+        "solarpower": __weather_stat_modifier([Weather.SUNNYDAY, Weather.DESOLATELAND], 1.5),
+    },
+    "spd": {},
+    "spe": {
+        # Pokémon with the "swift swim" ability have their speed doubled under rainy weather
+        "swiftswim": __weather_stat_modifier([Weather.RAINDANCE, Weather.PRIMORDIALSEA], 2),
+
+        # Pokémon with the "chlorophyll" ability have their speed doubled under sunny day
+        "chlorophyll": __weather_stat_modifier([Weather.SUNNYDAY, Weather.DESOLATELAND], 2),
+
+        # Pokémon with the "sand rush" ability have their speed doubled under sandstorm
+        "sandrush": __weather_stat_modifier([Weather.SANDSTORM], 2),
+
+        # Pokémon with the "slush rush" ability have their speed doubled under hail
+        "slushrush": __weather_stat_modifier([Weather.HAIL], 2),
+
+        # Pokémon with the "quick feet" ability have their speed increased if they have a status condition
+        "quickfeet": __status_stat_modifier(1.5),
+
+        # Pokémon with the "surge surfer" ability have their speed doubled under electric terrain
+        "surgesurfer": lambda pokemon, weather, terrains: 2 if Field.ELECTRIC_TERRAIN in terrains else 1,
+    },
+    "accuracy": {
+        # Pokémon with the "compound eyes" have their accuracy increased
+        "compoundeyes": __constant_stat_modifier(1.3),
+    },
+    "evasion": {
+        # Pokémon with the "sand veil" ability have their evasion increased under sandstorm
+        "sandveil": __weather_stat_modifier([Weather.SANDSTORM], 1.2),
+
+        # Pokémon with the "tangled feet" ability have their evasion increased if they are confused
+        "tangledfeet": lambda pokemon, weather, terrains: 1.5 if Effect.CONFUSION in pokemon.effects else 1,
+
+        # Pokémon with the "snow cloak" ability have their evasion increased under hail
+        "snowcloak": __weather_stat_modifier([Weather.HAIL], 1.2),
+    },
+}
+
+# Modifiers of the stats coming from the Pokémon's item, for each stat they are keyed by the item
+STAT_ITEM_MODIFIERS: Dict[str, Dict[str, StatModifier]] = {
+    "atk": {
+        # Pokémon with the "choiceband" item have their attack increased
+        "choiceband": __not_dynamaxed_stat_modifier(1.5),
+
+        # Cubone and its evolutions have their attack doubled if they hold the "thick club" item
+        "thickclub": __species_stat_modifier(["cubone", "marowak", "marowakalola"], 2),
+
+        # Pikachu has its attack doubled if it holds the "light ball" item
+        "lightball": __light_ball_modifier,
+    },
+    "def": {
+        # The "eviolite" item works with only non-fully evolved pokèmon, we assume that this item is used only in such
+        # case
+        "eviolite": __constant_stat_modifier(1.5),
+
+        # Ditto has its defense doubled if it holds the "metal powder" item
+        "metalpowder": __species_stat_modifier(["ditto"], 2),
+    },
+    "spa": {
+        # Pokémon with the "choice specs" item have their special attack increased if not dynmaxed
+        "choicespecs": __not_dynamaxed_stat_modifier(1.5),
+
+        # Clamperl has its special attack doubled if it holds the "deep sea tooth" item
+        "deepseatooth": __species_stat_modifier(["clamperl"], 2),
+
+        # Pikachu has its special attack doubled if it holds the "light ball" item
+        "lightball": __light_ball_modifier,
+    },
+    "spd": {
+        # Pokémon with the "assault vest" item have their special defense increased
+        "assaultvest": __constant_stat_modifier(1.5),
+
+        # Clamperls has its special defense increased if it holds the "deep sea scale" item
+        "deepseascale": __species_stat_modifier(["clamperl"], 2),
+
+        # The "eviolite" item works with only non-fully evolved pokèmon, we assume that this item is used only for such
+        # case
+        "eviolite": __constant_stat_modifier(1.5),
+
+        # Ditto has its special defense doubled if it holds the "metal powder" item
+        "metalpowder": __species_stat_modifier(["ditto"], 2),
+    },
+    "spe": {
+        # Pokémon with the "choice scarf" item have their speed increased
+        "choicescarf": __constant_stat_modifier(1.5),
+
+        # Ditto has its speed increased if it holds the "quick powder" item
+        "quickpowder": __species_stat_modifier(["ditto"], 1.5),
+
+        # Pokémon with the "heavy ball" item have their speed halved
+        "heavyball": __constant_stat_modifier(0.5),
+    },
+    "accuracy": {
+        # Pokémon with the "wide lens" item have their accuracy increased
+        "widelens": __constant_stat_modifier(1.1),
+
+        # Pokémon with the "victory star" item have their accuracy increased
+        "victorystar": __constant_stat_modifier(1.1),
+    },
+    "evasion": {
+        # Pokémon with the "bright powder" item have their evasion increased
+        "brigthpowder": __constant_stat_modifier(1.1),
+
+        # Pokémon with the "lax incense" item have their evasion increased
+        "laxincense": __constant_stat_modifier(1.05),
+    },
+}
 
 
 def compute_stat_modifiers(pokemon: Pokemon, stat: str, weather: Weather = None, terrains: List[Field] = None) -> float:
     """
-    Compute all the modifiers for a Pokémon's stat coming from abilities, items, weather and terrains
+    Compute all the modifiers for a Pokémon's stat coming from abilities, items, weather and terrains. The ability and
+    the item are looked up in the registries of the stat, so only their rules are computed
     :param pokemon: the Pokémon under consideration
     :param stat: the stat under consideration
     :param weather: the current weather
     :param terrains: the current terrains on the field
     :return: the modifier to a Pokémon's stat
     """
-    match stat:
-        case "atk":
-            return __compute_atk_modifiers(pokemon, weather)
-        case "def":
-            return __compute_def_modifiers(pokemon, terrains)
-        case "spa":
-            return __compute_spa_modifiers(pokemon, weather)
-        case "spd":
-            return __compute_spd_modifiers(pokemon, weather)
-        case "spe":
-            return __compute_spe_modifiers(pokemon, weather, terrains)
-        case "accuracy":
-            return __compute_accuracy_modifiers(pokemon)
-        case "evasion":
-            return __compute_evasion_modifiers(pokemon, weather)
-
-    return 1
+    ability_modifiers = STAT_ABILITY_MODIFIERS.get(stat)
+    if ability_modifiers is None:
+        return 1
+
+    stat_modifier = 1
+
+    # Rock-type Pokémon have their special defense increased under sandstorm
+    if stat == "spd" and PokemonType.ROCK in pokemon.types and weather is Weather.SANDSTORM:
+        stat_modifier *= 1.5
+
+    ability_modifier = ability_modifiers.get(pokemon.ability)
+    if ability_modifier:
+        stat_modifier *= ability_modifier(pokemon, weather, terrains)
+
+    item_modifier = STAT_ITEM_MODIFIERS[stat].get(pokemon.item)
+    if item_modifier:
+        stat_modifier *= item_modifier(pokemon, weather, terrains)
+
+    # Paralyzed Pokémon have their speed halved
+    if stat == "spe" and pokemon.status is Status.PAR:
+        stat_modifier *= 0.5
+
+    return stat_modifier
 
 
 def compute_stat(pokemon: Pokemon,
@@ -320,7 +360,8 @@ def compute_stat(pokemon: Pokemon,
                  boost: int = None,
                  nature: str = "neutral") -> int:
     """
-    Compute the stat ("atk", "def", "spa", "spd", "spe", "accuracy", "evasion") of a Pokémon
+    Compute the stat ("atk", "def", "spa", "spd", "spe", "accuracy", "evasion") of a Pokémon. The opponent's stats are
+    read from the stat tables, the modifiers are applied on top of them only if there are any
     :param pokemon: the Pokémon under consideration
     :param stat: the stat we want to compute
     :param weather: the current weather
@@ -335,23 +376,58 @@ def compute_stat(pokemon: Pokemon,
     if ivs < 0 or ivs > 31 or evs < 0 or evs > 252:
         raise ValueError
 
+    if stat not in STATS and stat not in ["accuracy", "evasion"]:
+        raise ValueError
+
+    modifiers = compute_stat_modifiers(pokemon, stat, weather, terrains)
     if stat in ["accuracy", "evasion"]:
         stat_value = 1
     elif is_bot and stat != "hp":
         stat_value = pokemon.stats[stat]
+    elif stat == "hp":
+        return estimate_stat(pokemon, stat, ivs, evs, nature)
+    elif modifiers == 1:
+        return stat_table(pokemon, ivs, evs, nature)[stat][boost_stage(pokemon, stat, boost) + 6]
     else:
         stat_value = estimate_stat(pokemon, stat, ivs, evs, nature)
 
-    modifiers = compute_stat_modifiers(pokemon, stat, weather, terrains)
-    boost = compute_stat_boost(pokemon, stat, boost)
     stat_value *= modifiers
-    stat_value *= boost
+    stat_value *= compute_stat_boost(pokemon, stat, boost)
     if stat not in ["accuracy", "evasion"]:
         stat_value = int(stat_value)
 
     return stat_value
 
 
+def compute_stat_stages(pokemon: Pokemon,
+                        stat: str,
+                        weather: Weather = None,
+                        terrains: List[Field] = None,
+                        is_bot: bool = False) -> List[int]:
+    """
+    Compute a Pokémon's stat at each boost stage, so that the boosted values of the same stat can be looked up many
+    times. The values are the ones compute_stat returns when the boost stage is forced
+    :param pokemon: the Pokémon under consideration
+    :param stat: the stat we want to compute, it can't be "hp", "accuracy" or "evasion"
+    :param weather: the current weather
+    :param terrains: the current terrains on the field
+    :param is_bot: if the Pokémon belongs to the bot
+    :return: the values of the stat, indexed by the boost stage plus six
+    """
+    if stat not in STATS or stat == "hp":
+        raise ValueError
+
+    modifiers = compute_stat_modifiers(pokemon, stat, weather, terrains)
+    if is_bot:
+        stat_value = pokemon.stats[stat]
+    elif modifiers == 1:
+        return stat_table(pokemon)[stat]
+    else:
+        stat_value = estimate_stat(pokemon, stat)
+
+    return [int(stat_value * modifiers * multiplier) for multiplier in BOOST_MULTIPLIERS]
+
+
 def stats_to_string(pokemon: Pokemon,
                     stats: List[str],
                     weather: Weather = None,
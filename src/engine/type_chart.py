@@ -0,0 +1,77 @@
+from poke_env.data import TYPE_CHART
+from poke_env.environment import Pokemon, Move
+from poke_env.environment.pokemon_type import PokemonType
+from typing import Dict, List, Optional
+import numpy as np
+
+# Index of each type in the effectiveness tables, the last index stands for no type
+TYPE_INDICES: Dict[Optional[PokemonType], int] = {pokemon_type: i for i, pokemon_type in enumerate(PokemonType)}
+TYPE_INDICES[None] = len(TYPE_INDICES)
+
+
+def __build_type_chart() -> np.ndarray:
+    """
+    Builds the effectiveness of each attacking type against each pair of defending types, a move with no type is
+    neutral against every Pokémon and a missing second type is neutral against every move
+    :return: the table indexed by the attacking type, the first and the second defending types
+    """
+    types = list(PokemonType)
+    single_chart = np.ones((len(TYPE_INDICES), len(TYPE_INDICES)))
+    for attacking_type in types:
+        for defending_type in types:
+            single_chart[TYPE_INDICES[attacking_type], TYPE_INDICES[defending_type]] = \
+                TYPE_CHART[attacking_type.name][defending_type.name]
+
+    return single_chart[:, :, np.newaxis] * single_chart[:, np.newaxis, :]
+
+
+def __build_move_type_charts(type_chart: np.ndarray) -> np.ndarray:
+    """
+    Builds the effectiveness tables of the moves that ignore the type chart against some types
+    :param type_chart: the effectiveness table of the other moves
+    :return: the tables stacked along the first axis, in the order of MOVE_TYPE_CHARTS
+    """
+    ground, ice = TYPE_INDICES[PokemonType.GROUND], TYPE_INDICES[PokemonType.ICE]
+    flying, water = TYPE_INDICES[PokemonType.FLYING], TYPE_INDICES[PokemonType.WATER]
+    single_ground = type_chart[ground, :, TYPE_INDICES[None]]
+    single_ice = type_chart[ice, :, TYPE_INDICES[None]]
+
+    # The move "freeze-dry" is super-effective against water-type Pokémon
+    freeze_dry_chart = type_chart.copy()
+    freeze_dry_chart[ice, water, :] = 2 * single_ice
+    freeze_dry_chart[ice, :, water] = 2 * single_ice
+    freeze_dry_chart[ice, water, water] = 2
+
+    # The move "thousand-arrows" can deal damage to flying-type Pokémon, which are hit as if they had only their other
+    # type
+    thousand_arrows_chart = type_chart.copy()
+    thousand_arrows_chart[ground, flying, :] = single_ground
+    thousand_arrows_chart[ground, :, flying] = single_ground
+    thousand_arrows_chart[ground, flying, flying] = 1
+
+    return np.stack([type_chart, freeze_dry_chart, thousand_arrows_chart])
+
+
+# Index of the effectiveness table of the moves that ignore the type chart, the other moves use the first table
+MOVE_TYPE_CHARTS: Dict[str, int] = {"freezedry": 1, "thousandarrows": 2}
+
+# Effectiveness tables indexed by the table of the move, the attacking type, the first and the second defending types
+TYPE_CHARTS: np.ndarray = __build_move_type_charts(__build_type_chart())
+
+# The same tables as nested lists, since indexing them is faster than indexing an array for a single lookup
+TYPE_CHARTS_LISTS: List[List[List[List[float]]]] = TYPE_CHARTS.tolist()
+
+
+def type_effectiveness(move_type: Optional[PokemonType], defender: Pokemon, move: Move = None) -> float:
+    """
+    Computes the effectiveness of a move type against the defender's types with a single lookup in the precomputed
+    tables, it is equivalent to Pokemon.damage_multiplier
+    :param move_type: the current type of the move
+    :param defender: defending Pokémon
+    :param move: the move under consideration, if given the moves that ignore the type chart are taken into account
+    :return: the type multiplier
+    """
+    chart = MOVE_TYPE_CHARTS.get(move.id, 0) if move is not None else 0
+    first_type, second_type = defender.types
+    return TYPE_CHARTS_LISTS[chart][TYPE_INDICES[move_type]][TYPE_INDICES[first_type]][TYPE_INDICES[second_type]]
+
@@ -9,6 +9,13 @@ HEALING_MOVES = ["healorder", "milkdrink", "moonlight", "morningsun", "purify",
 ENTRY_HAZARDS = {"spikes": SideCondition.SPIKES, "stealhrock": SideCondition.STEALTH_ROCK,
                  "stickyweb": SideCondition.STICKY_WEB, "toxicspikes": SideCondition.TOXIC_SPIKES}
 ANTI_HAZARDS_MOVES = ["rapidspin", "defog"]
+DAMAGE_ROLLS = [roll / 100 for roll in range(85, 101)]
+CRIT_PROBABILITIES = {1: 1 / 24, 2: 1 / 8, 3: 1 / 2}
+CRIT_RATIO_ITEMS = ["razorclaw", "scopelens"]
+CRIT_IMMUNE_ABILITIES = ["battlearmor", "shellarmor"]
+MULTI_HIT_PROBABILITIES = {2: 0.35, 3: 0.35, 4: 0.15, 5: 0.15}
+INCREASING_POWER_HITS_MOVES = ["triplekick", "tripleaxel"]
+SWITCH_PRIORITY = 7
 DEFAULT_MOVES_IDS = {PokemonType.BUG: {MoveCategory.PHYSICAL: Gen8Move("xscissor"),
                                        MoveCategory.SPECIAL: Gen8Move("bugbuzz")},
                      PokemonType.DARK: {MoveCategory.PHYSICAL: Gen8Move("crunch"),
@@ -1,21 +1,24 @@
 import math
+from typing import Tuple, Optional, Callable
 from poke_env.environment import SideCondition
 from src.minimax.heuristic.Heuristic import Heuristic
 from src.minimax.NodePokemon import NodePokemon
-from src.engine.damage import compute_damage
-from src.engine.useful_data import HEALING_MOVES
+from src.minimax.TranspositionTable import pokemon_hash, pokemon_hash_delta, pokemon_state_delta, weather_hash, \
+    field_hash, team_hash, context_hash, SIDE_TO_MOVE_KEY
+from src.engine.damage import compute_damage, compute_crit_probability
+from src.engine.useful_data import HEALING_MOVES, DAMAGE_ROLLS, SWITCH_PRIORITY
 from src.engine.battle_utilities import *
+from src.strategy.matchup import matchup_on_types
 from src.engine.stats import *
 
 
 class BattleStatus:
-    last_id: int = 0
 
     def __init__(self, act_poke: NodePokemon, opp_poke: NodePokemon,
                  avail_switches: List[Pokemon],
                  opp_team: List[Pokemon],
-                 weather: Dict[Weather, int], terrains: List[Field], opp_conditions: List[SideCondition], ancestor,
-                 move: Move | Pokemon, poke_switched: bool):
+                 weather: Dict[Weather, int], terrains: List[Field], opp_conditions: List[SideCondition],
+                 move: Move | Pokemon, poke_switched: bool, zobrist_hash: int = None):
         """
         Instantiate a node representing the simulated status of the battle progress
         :param act_poke: bot Pokémon
@@ -25,9 +28,9 @@ class BattleStatus:
         :param weather: the weather of the battle
         :param terrains: list of active terrains in the battle
         :param opp_conditions: the conditions on the opponent field
-        :param ancestor: the anchestor node
-        :param move: current move
+        :param move: the action that leads to this node
         :param poke_switched: true if this node simulates a Pokémon switch, false otherwise
+        :param zobrist_hash: hash of the node, if None it is computed from scratch assuming that it is our turn
         """
         self.act_poke: NodePokemon = act_poke
         self.opp_poke: NodePokemon = opp_poke
@@ -36,43 +39,111 @@ class BattleStatus:
         self.weather = weather
         self.terrains = terrains
         self.opp_conditions = opp_conditions
-        self.ancestor: BattleStatus = ancestor
-        self.score = 0
         self.move: Move | Pokemon = move
         self.poke_switched: bool = poke_switched
         self.move_first = self.can_outspeed(0.8)
-        self.id = self.last_id
-        self.inc_id()
+        if zobrist_hash is None:
+            zobrist_hash = self.compute_zobrist_hash()
+        self.zobrist_hash: int = zobrist_hash
 
-    @classmethod
-    def inc_id(cls):
-        cls.last_id += 1
+        # Previous values of the fields changed by apply_action, the last action is undone first
+        self.undo_stack: List[Tuple] = []
 
-    def act_poke_avail_actions(self) -> List[Move | Pokemon]:
+    def compute_zobrist_hash(self) -> int:
+        """
+        Computes the Zobrist hash of the node from scratch, it considers both active Pokémon, the number of Pokémon left
+        in both teams, the weather and the terrains. The moves, items and abilities known in this turn are part of the
+        hash too, they don't change below the node but they let the entries be reused in the following turns
+        :return: the hash of the node
+        """
+        zobrist_hash = pokemon_hash(self.act_poke, True) ^ pokemon_hash(self.opp_poke, False)
+        zobrist_hash ^= team_hash(self.avail_switches, True) ^ team_hash(self.opp_team, False)
+        zobrist_hash ^= weather_hash(self.weather) ^ field_hash(self.terrains)
+        zobrist_hash ^= context_hash(self.act_poke, self.opp_poke, self.avail_switches, self.opp_team,
+                                     self.opp_conditions)
+        return zobrist_hash
+
+    def child_zobrist_hash(self, parent_weather: Dict[Weather, int], act_poke: NodePokemon, opp_poke: NodePokemon,
+                           avail_switches: List[Pokemon], opp_team: List[Pokemon],
+                           weather: Dict[Weather, int]) -> int:
+        """
+        Incrementally computes the hash of a child node by considering only what the action has changed
+        :param parent_weather: the weather of this node before the action was simulated
+        :param act_poke: bot Pokémon of the child
+        :param opp_poke: opponent Pokémon of the child
+        :param avail_switches: bot team of the child
+        :param opp_team: opponent team of the child
+        :param weather: weather of the child
+        :return: the hash of the child node
+        """
+        zobrist_hash = self.zobrist_hash ^ SIDE_TO_MOVE_KEY
+        zobrist_hash ^= pokemon_hash_delta(self.act_poke, act_poke, True)
+        zobrist_hash ^= pokemon_hash_delta(self.opp_poke, opp_poke, False)
+        # The teams are copied only when they change
+        if avail_switches is not self.avail_switches:
+            zobrist_hash ^= team_hash(self.avail_switches, True) ^ team_hash(avail_switches, True)
+
+        if opp_team is not self.opp_team:
+            zobrist_hash ^= team_hash(self.opp_team, False) ^ team_hash(opp_team, False)
+
+        if weather is not parent_weather:
+            zobrist_hash ^= weather_hash(parent_weather) ^ weather_hash(weather)
+
+        return zobrist_hash
+
+    def act_poke_avail_actions(self, max_switches: int = 0) -> List[Move | Pokemon]:
         """
         Computes all the actions that our player can do
+        :param max_switches: max number of switches among the actions, 0 excludes the switches
         :return: a list containing all the available actions
         """
         # outspeed_p = outspeed_prob(self.act_poke.pokemon, self.opp_poke.pokemon)["outspeed_p"]
 
-        all_actions: List[Move | Pokemon] = []  # self.avail_switches
+        all_actions: List[Move | Pokemon] = self.switch_candidates(True, max_switches)
         if not self.act_poke.is_fainted() and len(self.act_poke.moves) > 0:
             all_actions = self.act_poke.moves + all_actions
 
         return all_actions
 
-    def opp_poke_avail_actions(self) -> List[Move | Pokemon]:
+    def opp_poke_avail_actions(self, max_switches: int = 0) -> List[Move | Pokemon]:
         """
         Computes all the actions that the opponent player can do
+        :param max_switches: max number of switches among the actions, 0 excludes the switches
         :return: a list containing all the available actions
         """
         # all_moves = list[Move | Pokemon]
-        all_actions: List[Move | Pokemon] = []  # self.opp_team
+        all_actions: List[Move | Pokemon] = self.switch_candidates(False, max_switches)
         if not self.opp_poke.is_fainted():
             all_actions = self.opp_poke.moves + all_actions
 
         return all_actions
 
+    def switch_candidates(self, is_my_turn: bool, max_switches: int) -> List[Pokemon]:
+        """
+        Selects the Pokémon of the team that are worth switching in. They are sorted by their type matchup against the
+        opposing Pokémon and, unless the active Pokémon is fainted, those with a worse matchup than the active one are
+        discarded. Only the best max_switches are kept, so that the branching factor stays bounded
+        :param is_my_turn: true if the bot switches, false otherwise
+        :param max_switches: max number of switches, 0 excludes the switches
+        :return: the Pokémon to switch in
+        """
+        if max_switches <= 0:
+            return []
+
+        if is_my_turn:
+            active, opponent, team = self.act_poke, self.opp_poke, self.avail_switches
+        else:
+            active, opponent, team = self.opp_poke, self.act_poke, self.opp_team
+
+        matchups = [(matchup_on_types(pokemon, opponent.pokemon), pokemon) for pokemon in team
+                    if not pokemon.fainted and pokemon.current_hp_fraction > 0]
+        if not active.is_fainted():
+            active_matchup = matchup_on_types(active.pokemon, opponent.pokemon)
+            matchups = [matchup for matchup in matchups if matchup[0] > active_matchup]
+
+        matchups.sort(key=lambda matchup: matchup[0], reverse=True)
+        return [pokemon for _, pokemon in matchups[:max_switches]]
+
     def compute_score(self, heuristic: Heuristic, depth: int):
         """
         Computes the score of a minimax node, given a heuristic
@@ -83,77 +154,142 @@ class BattleStatus:
         score = heuristic.compute(self, depth)
         return score
 
-    def simulate_action(self, move: Move | Pokemon, is_my_turn: bool):
+    def simulate_action(self, move: Move | Pokemon, is_my_turn: bool, hit: bool = True, damage: int = None):
         """
-        Simulates a next state derived from the current one
+        Simulates a next state derived from the current one, which is left unchanged
         :param move: a move to apply that will produce a new state
         :param is_my_turn: true if is our turn, false otherwise
+        :param hit: false if the move misses, in which case it has no effect
+        :param damage: damage dealt by the move, if None it is estimated
         :return: a new battle state
         """
+        if isinstance(move, Move):
+            act_poke_hp, act_poke_boosts, opp_poke_hp, opp_poke_boosts, weather = \
+                self.compute_action_effects(move, is_my_turn, hit, damage)
+            act_poke = self.act_poke.clone(current_hp=act_poke_hp, boosts=act_poke_boosts)
+            opp_poke = self.opp_poke.clone(current_hp=opp_poke_hp, boosts=opp_poke_boosts)
+            avail_switches = self.remove_poke_from_switches(act_poke, self.avail_switches)
+            opp_team = self.remove_poke_from_switches(opp_poke, self.opp_team)
+            poke_switched = False
+        elif is_my_turn:
+            act_poke, opp_poke, weather = NodePokemon(move, True, moves=list(move.moves.values())), self.opp_poke, \
+                self.weather
+            avail_switches, opp_team = self.switch_team(self.act_poke, move, self.avail_switches), self.opp_team
+            poke_switched = True
+        else:
+            act_poke, opp_poke, weather = self.act_poke, NodePokemon(move, False, moves=list(move.moves.values())), \
+                self.weather
+            avail_switches, opp_team = self.avail_switches, self.switch_team(self.opp_poke, move, self.opp_team)
+            poke_switched = True
+
+        zobrist_hash = self.child_zobrist_hash(self.weather, act_poke, opp_poke, avail_switches, opp_team, weather)
+        return BattleStatus(act_poke, opp_poke, avail_switches, opp_team, weather, self.terrains, self.opp_conditions,
+                            move, poke_switched, zobrist_hash)
+
+    def apply_action(self, move: Move | Pokemon, is_my_turn: bool, hit: bool = True, damage: int = None):
+        """
+        Simulates an action by updating this state in place, as simulate_action does without allocating a new node. The
+        previous values of the fields that the action changes are pushed on the undo stack, so that undo_action can
+        restore them
+        :param move: a move or a Pokémon to switch
+        :param is_my_turn: true if is our turn, false otherwise
+        :param hit: false if the move misses, in which case it has no effect
+        :param damage: damage dealt by the move, if None it is estimated
+        """
+        act_poke, opp_poke = self.act_poke, self.opp_poke
+        self.undo_stack.append((act_poke, act_poke.current_hp, act_poke.boosts, opp_poke, opp_poke.current_hp,
+                                opp_poke.boosts, self.avail_switches, self.opp_team, self.weather, self.zobrist_hash))
+        zobrist_hash = self.zobrist_hash ^ SIDE_TO_MOVE_KEY
+        if isinstance(move, Move):
+            act_poke_hp, act_poke_boosts, opp_poke_hp, opp_poke_boosts, weather = \
+                self.compute_action_effects(move, is_my_turn, hit, damage)
+            act_poke_hp, opp_poke_hp = max(act_poke_hp, 0), max(opp_poke_hp, 0)
+            zobrist_hash ^= pokemon_state_delta(act_poke.current_hp, act_poke_hp, act_poke.boosts, act_poke_boosts,
+                                                True)
+            zobrist_hash ^= pokemon_state_delta(opp_poke.current_hp, opp_poke_hp, opp_poke.boosts, opp_poke_boosts,
+                                                False)
+            act_poke.current_hp, act_poke.boosts = act_poke_hp, act_poke_boosts
+            opp_poke.current_hp, opp_poke.boosts = opp_poke_hp, opp_poke_boosts
+            if weather is not self.weather:
+                zobrist_hash ^= weather_hash(self.weather) ^ weather_hash(weather)
+                self.weather = weather
+
+            avail_switches = self.remove_poke_from_switches(act_poke, self.avail_switches)
+            opp_team = self.remove_poke_from_switches(opp_poke, self.opp_team)
+        elif is_my_turn:
+            self.act_poke = NodePokemon(move, True, moves=list(move.moves.values()))
+            zobrist_hash ^= pokemon_hash(act_poke, True) ^ pokemon_hash(self.act_poke, True)
+            avail_switches, opp_team = self.switch_team(act_poke, move, self.avail_switches), self.opp_team
+        else:
+            self.opp_poke = NodePokemon(move, False, moves=list(move.moves.values()))
+            zobrist_hash ^= pokemon_hash(opp_poke, False) ^ pokemon_hash(self.opp_poke, False)
+            avail_switches, opp_team = self.avail_switches, self.switch_team(opp_poke, move, self.opp_team)
+
+        # The teams are copied only when they change
+        if avail_switches is not self.avail_switches:
+            zobrist_hash ^= team_hash(self.avail_switches, True) ^ team_hash(avail_switches, True)
+            self.avail_switches = avail_switches
+
+        if opp_team is not self.opp_team:
+            zobrist_hash ^= team_hash(self.opp_team, False) ^ team_hash(opp_team, False)
+            self.opp_team = opp_team
+
+        self.zobrist_hash = zobrist_hash
+
+    def undo_action(self):
+        """
+        Restores the state as it was before the last action applied by apply_action
+        """
+        act_poke, act_poke_hp, act_poke_boosts, opp_poke, opp_poke_hp, opp_poke_boosts, self.avail_switches, \
+            self.opp_team, self.weather, self.zobrist_hash = self.undo_stack.pop()
+        act_poke.current_hp, act_poke.boosts = act_poke_hp, act_poke_boosts
+        opp_poke.current_hp, opp_poke.boosts = opp_poke_hp, opp_poke_boosts
+        self.act_poke, self.opp_poke = act_poke, opp_poke
+
+    def compute_action_effects(self, move: Move, is_my_turn: bool, hit: bool, damage: Optional[int]) \
+            -> Tuple[int, Dict[str, int], int, Dict[str, int], Dict[Weather, int]]:
+        """
+        Computes how a move changes the state, without modifying it
+        :param move: a Pokémon move
+        :param is_my_turn: true if the bot uses the move, false otherwise
+        :param hit: false if the move misses, in which case it has no effect
+        :param damage: damage dealt by the move, if None it is estimated
+        :return: the health points and the boosts of the bot's Pokémon, the health points and the boosts of the
+        opponent's Pokémon and the weather after the move
+        """
         weather = None if len(self.weather.keys()) == 0 else next(iter(self.weather.keys()))
         if is_my_turn:
-            if isinstance(move, Move):
-                damage = self.guess_damage(is_my_turn, move, weather)
-
-                self.weather = self.get_active_weather(move, update_turn=False)
-                opp_poke_updated_hp = self.opp_poke.current_hp - damage
-
-                att_boost, def_boost = self.compute_updated_boosts(self.act_poke, self.opp_poke, move)
-                act_poke_upd_hp = self.act_poke.current_hp
-
-                heal, _ = self.compute_healing(self.act_poke, move, weather, self.terrains)
-                act_poke_upd_hp += heal
-
-                recoil: int = self.compute_recoil(self.act_poke, move, damage)
-                act_poke_upd_hp = act_poke_upd_hp - recoil
-
-                # Compute drain dealt by the move
-                drain, _ = self.compute_drain(self.act_poke, move, damage)
-                act_poke_upd_hp += drain
-
-                opp_poke = self.opp_poke.clone(current_hp=opp_poke_updated_hp, boosts=def_boost)
-                act_poke = self.act_poke.clone(current_hp=act_poke_upd_hp, boosts=att_boost)
-                opp_team = self.remove_poke_from_switches(opp_poke, self.opp_team)
-                child = BattleStatus(act_poke, opp_poke,
-                                     self.avail_switches, opp_team, self.weather, self.terrains,
-                                     self.opp_conditions, self, move, False)
-            else:
-                child = BattleStatus(NodePokemon(move, True, moves=list(move.moves.values())), self.opp_poke,
-                                     self.avail_switches, self.opp_team, self.weather, self.terrains,
-                                     self.opp_conditions, self, move, True)
-            return child
+            attacker, defender = self.act_poke, self.opp_poke
+        else:
+            attacker, defender = self.opp_poke, self.act_poke
+
+        if damage is None:
+            damage = self.estimate_damage(move, is_my_turn)
+
+        attacker_hp = attacker.current_hp
+        if hit:
+            defender_hp = defender.current_hp - damage
+            attacker_boosts, defender_boosts = self.compute_updated_boosts(attacker, defender, move)
+
+            heal, _ = self.compute_healing(attacker, move, weather, self.terrains)
+            attacker_hp += heal
+
+            recoil: int = self.compute_recoil(attacker, move, damage)
+            attacker_hp -= recoil
+
+            # Compute drain dealt by the move
+            drain, _ = self.compute_drain(self.act_poke, move, damage)
+            attacker_hp += drain
         else:
-            if isinstance(move, Move):
-                damage = compute_damage(move, self.opp_poke.pokemon, self.act_poke.pokemon, weather, self.terrains,
-                                        self.opp_conditions, self.opp_poke.boosts, self.act_poke.boosts, is_my_turn)[
-                    "ub"]
-
-                att_boost, def_boost = self.compute_updated_boosts(self.opp_poke, self.act_poke, move)
-                opp_poke_updated_hp = self.act_poke.current_hp - damage
-
-                act_poke_upd_hp = self.opp_poke.current_hp
-                heal, _ = self.compute_healing(self.opp_poke, move, weather, self.terrains)
-                act_poke_upd_hp += heal
-
-                recoil: int = self.compute_recoil(self.opp_poke, move, damage)
-                act_poke_upd_hp -= recoil
-
-                drain, _ = self.compute_drain(self.act_poke, move, damage)
-                act_poke_upd_hp += drain
-
-                act_poke = self.act_poke.clone(current_hp=opp_poke_updated_hp, boosts=def_boost)
-                opp_poke = self.opp_poke.clone(current_hp=act_poke_upd_hp, boosts=att_boost)
-                avail_switches = self.remove_poke_from_switches(act_poke, self.avail_switches)
-                self.weather = self.get_active_weather(move, update_turn=True)
-
-                return BattleStatus(act_poke, opp_poke,
-                                    avail_switches, self.opp_team, self.weather, self.terrains,
-                                    self.opp_conditions, self, move, False)
-            else:
-                child = BattleStatus(self.act_poke, NodePokemon(move, False, moves=list(move.moves.values())),
-                                     self.avail_switches, self.opp_team, self.weather, self.terrains,
-                                     self.opp_conditions, self, move, True)
-                return child
+            defender_hp = defender.current_hp
+            attacker_boosts, defender_boosts = attacker.boosts, defender.boosts
+
+        # The weather lasts one more turn after the opponent's action, which ends the turn
+        new_weather = self.get_active_weather(move, update_turn=not is_my_turn)
+        if is_my_turn:
+            return attacker_hp, attacker_boosts, defender_hp, defender_boosts, new_weather
+
+        return defender_hp, defender_boosts, attacker_hp, attacker_boosts, new_weather
 
     def can_outspeed(self, threshold: float) -> bool:
         """
@@ -161,10 +297,46 @@ class BattleStatus:
         :param threshold: level of confidence
         :return: true if our pokémon is faster, false otherwise
         """
+        return self.outspeed_probability() < threshold
+
+    def outspeed_probability(self) -> float:
+        """
+        Computes the probability that our Pokémon is faster than the opponent's one
+        :return: the outspeed probability
+        """
         weather = None if len(self.weather.keys()) == 0 else next(iter(self.weather.keys()))
-        outspeed_p = outspeed_prob(self.act_poke.pokemon, self.opp_poke.pokemon, weather, self.terrains)[
-            "outspeed_p"]
-        return outspeed_p < threshold
+        return outspeed_prob(self.act_poke.pokemon, self.opp_poke.pokemon, weather, self.terrains)["outspeed_p"]
+
+    def simulate_turn(self, bot_action: Optional[Move | Pokemon], opp_action: Optional[Move | Pokemon],
+                      outspeed_p: float, estimate_damage: Callable = None):
+        """
+        Simulates a whole turn in which both players choose their action at the same time. Switches are resolved
+        first, then the moves with higher priority and finally the move of the faster Pokémon. A Pokémon that is
+        knocked out before its turn doesn't act
+        :param bot_action: the bot's action, None if it can't act
+        :param opp_action: the opponent's action, None if it can't act
+        :param outspeed_p: probability that our Pokémon is faster than the opponent's one
+        :param estimate_damage: function (node, move, is_my_turn) that returns the damage of a move, it allows to
+        reuse the damage between the turns. If None the damage is computed by each action
+        :return: the battle state at the end of the turn
+        """
+        bot_priority = SWITCH_PRIORITY if isinstance(bot_action, Pokemon) else getattr(bot_action, "priority", 0)
+        opp_priority = SWITCH_PRIORITY if isinstance(opp_action, Pokemon) else getattr(opp_action, "priority", 0)
+        bot_first = bot_priority > opp_priority or (bot_priority == opp_priority and outspeed_p >= 0.5)
+
+        node = self
+        for action, is_my_turn in ([(bot_action, True), (opp_action, False)] if bot_first
+                                   else [(opp_action, False), (bot_action, True)]):
+            acting_poke = node.act_poke if is_my_turn else node.opp_poke
+            if action is None or acting_poke.is_fainted():
+                continue
+
+            damage = None
+            if estimate_damage is not None and isinstance(action, Move):
+                damage = estimate_damage(node, action, is_my_turn)
+            node = node.simulate_action(action, is_my_turn, damage=damage)
+
+        return node
 
     @staticmethod
     def remove_poke_from_switches(poke: NodePokemon, team: List[Pokemon]):
@@ -175,12 +347,28 @@ class BattleStatus:
         :return: the updated team
         """
         new_team: List[Pokemon] = team
-        if poke.is_fainted() and not poke.pokemon.active:
+        if poke.is_fainted() and not poke.pokemon.active and poke.pokemon in team:
             new_team = team.copy()
             new_team.remove(poke.pokemon)
 
         return new_team
 
+    @staticmethod
+    def switch_team(switched_out: NodePokemon, switched_in: Pokemon, team: List[Pokemon]) -> List[Pokemon]:
+        """
+        Updates a team after a switch: the Pokémon that is switched in leaves the team, while the one that is switched
+        out goes back to it with its simulated health points, unless it is fainted
+        :param switched_out: the active Pokémon before the switch
+        :param switched_in: the Pokémon that takes the field
+        :param team: the team before the switch
+        :return: the updated team
+        """
+        new_team = [pokemon for pokemon in team if pokemon is not switched_in]
+        if not switched_out.is_fainted():
+            new_team.append(switched_out.bench_pokemon())
+
+        return new_team
+
     def guess_damage(self, is_my_turn, move, weather) -> int:
         """
         Estimates the points of damage that a move could inflict to a Pokémon
@@ -195,6 +383,81 @@ class BattleStatus:
         #    damage = 0
         return damage
 
+    def estimate_damage(self, move: Move, is_my_turn: bool) -> int:
+        """
+        Estimates the damage of a move as it is done while simulating an action: the bot expects the lowest damage
+        from its moves and the highest damage from the opponent's ones
+        :param move: a Pokémon move
+        :param is_my_turn: true if the bot uses the move, false otherwise
+        :return: the damage
+        """
+        weather = None if len(self.weather.keys()) == 0 else next(iter(self.weather.keys()))
+        if is_my_turn:
+            return self.guess_damage(is_my_turn, move, weather)
+
+        return compute_damage(move, self.opp_poke.pokemon, self.act_poke.pokemon, weather, self.terrains,
+                              self.opp_conditions, self.opp_poke.boosts, self.act_poke.boosts, is_my_turn)["ub"]
+
+    def chance_outcomes(self, move: Move, is_my_turn: bool, damage_buckets: int = 3) -> List[Tuple[float, bool, int]]:
+        """
+        Computes the random outcomes of a move: whether it hits, the damage roll grouped in buckets and whether it is a
+        critical hit. Outcomes that deal the same damage are merged
+        :param move: a Pokémon move
+        :param is_my_turn: true if the bot uses the move, false otherwise
+        :param damage_buckets: number of buckets in which the 16 damage rolls are grouped
+        :return: a list of tuples made up of the probability of the outcome, whether the move hits and its damage,
+        sorted by decreasing probability
+        """
+        weather = None if len(self.weather.keys()) == 0 else next(iter(self.weather.keys()))
+        attacker, defender = (self.act_poke, self.opp_poke) if is_my_turn else (self.opp_poke, self.act_poke)
+        accuracy = compute_move_accuracy(move, attacker.pokemon, defender.pokemon, weather, self.terrains,
+                                         attacker.boosts["accuracy"], defender.boosts["evasion"])
+        accuracy = min(accuracy, 1)
+
+        outcomes: Dict[Tuple[bool, int], float] = dict()
+        if accuracy < 1:
+            outcomes[(False, 0)] = 1 - accuracy
+
+        if move.category is MoveCategory.STATUS:
+            outcomes[(True, 0)] = accuracy
+        else:
+            damage = compute_damage(move, attacker.pokemon, defender.pokemon, weather, self.terrains,
+                                    self.opp_conditions, attacker.boosts, defender.boosts, is_my_turn)
+            max_damage = damage["ub"]
+
+            # Fixed damage moves don't roll, moves that always crit already include it in their damage
+            crit_p = 0
+            if damage["lb"] != max_damage:
+                crit_p = compute_crit_probability(move, attacker.pokemon, defender.pokemon)
+
+            rolls = DAMAGE_ROLLS if damage["lb"] != max_damage else [1]
+            bucket_size = math.ceil(len(rolls) / damage_buckets)
+            for i in range(0, len(rolls), bucket_size):
+                bucket = rolls[i:i + bucket_size]
+                bucket_damage = int(max_damage * sum(bucket) / len(bucket))
+                bucket_p = accuracy * (1 - crit_p) * len(bucket) / len(rolls)
+                outcomes[(True, bucket_damage)] = outcomes.get((True, bucket_damage), 0) + bucket_p
+
+            if crit_p > 0:
+                crit_damage = int(max_damage * 1.5 * sum(DAMAGE_ROLLS) / len(DAMAGE_ROLLS))
+                outcomes[(True, crit_damage)] = outcomes.get((True, crit_damage), 0) + accuracy * crit_p
+
+        chance_outcomes = [(probability, hit, damage) for (hit, damage), probability in outcomes.items()
+                           if probability > 0]
+        chance_outcomes.sort(key=lambda outcome: outcome[0], reverse=True)
+        return chance_outcomes
+
+    def damage_key(self, move: Move, is_my_turn: bool) -> Tuple:
+        """
+        Computes a key that identifies the damage of a move between different nodes, since it only depends on the
+        Pokémon, their boosts and the weather
+        :param move: a Pokémon move
+        :param is_my_turn: true if the bot uses the move, false otherwise
+        :return: the key of the damage
+        """
+        return (is_my_turn, move.id, self.act_poke.pokemon.species, self.opp_poke.pokemon.species,
+                tuple(self.act_poke.boosts.values()), tuple(self.opp_poke.boosts.values()), tuple(self.weather))
+
     def get_active_weather(self, move: Move, update_turn: bool) -> Dict[Weather, int]:
         """
         Simulates the weather conditions during the battle progress
@@ -347,15 +610,18 @@ class BattleStatus:
         :param move: a Pokémon move
         :return: the updated boosts
         """
-        att_upd_boosts = att_poke.boosts.copy()
-        def_upd_boosts = def_poke.boosts.copy()
+        att_upd_boosts = att_poke.boosts
+        def_upd_boosts = def_poke.boosts
         boosts = move.self_boost if move.boosts is None else move.boosts
         if boosts is not None:
+            # The boosts are shared between nodes, so they are copied only when the move changes them
             if move.target == 'self':
+                att_upd_boosts = att_upd_boosts.copy()
                 for stat_boost, boost in boosts.items():
                     # upd_stats = compute_stat_boost(att_poke.pokemon, stat_boost, boost)
                     att_upd_boosts[stat_boost] += boost
             elif move.target == 'normal':
+                def_upd_boosts = def_upd_boosts.copy()
                 for stat_boost, boost in boosts.items():
                     def_upd_boosts[stat_boost] += boost
 
@@ -364,6 +630,5 @@ class BattleStatus:
     def __str__(self):
         mv = self.move.species if isinstance(self.move, Pokemon) else str(self.move).split(" ")[0]
         to_string = "My: " + self.act_poke.pokemon.species + "  opp: " + self.opp_poke.pokemon.species
-        to_string = to_string + "  sc: " + str(round(self.score, 2)) + "  mv: " + mv + "  mf: " + str(
-            self.move_first) + " an: " + str(self.ancestor.id)
+        to_string = to_string + "  mv: " + mv + "  mf: " + str(self.move_first)
         return to_string
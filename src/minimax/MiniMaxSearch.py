@@ -0,0 +1,1227 @@
+import multiprocessing
+import threading
+import time
+import warnings
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import List, Dict, Tuple, Optional
+from poke_env.environment import Move, Pokemon
+from src.minimax.BattleStatus import BattleStatus
+from src.minimax.heuristic.Heuristic import Heuristic
+from src.minimax.matrix_game import solve_matrix_game
+from src.minimax.MoveOrdering import MoveOrdering, action_key
+from src.minimax.OpponentModel import OpponentModel
+from src.minimax.SearchConfiguration import SearchConfiguration
+from src.minimax.SearchStatistics import SearchStatistics
+from src.minimax.TranspositionTable import TranspositionTable, TranspositionEntry, BoundType, ENTRY_BYTES
+
+# Approximate bytes taken by an entry of the damage and outcomes caches, whose keys are tuples of about ten fields
+CACHE_ENTRY_BYTES = 400
+
+# Width of the null window of the principal variation search, the scores are floats so the window can't be empty
+NULL_WINDOW = 1e-9
+
+# Number of times an aspiration window is widened before the root is searched with the full window
+ASPIRATION_RETRIES = 2
+
+# Number of nodes between two checks of the memory budget, the memory is estimated from the sizes of the tables
+MEMORY_CHECK_NODES = 256
+
+# Number of Pokémon in a team, the opponent's Pokémon that have not been revealed yet are alive
+TEAM_SIZE = 6
+
+# Number of slots of the table that memoizes the positions of an endgame
+ENDGAME_TABLE_SIZE = 2 ** 16
+
+
+class SearchTimeout(Exception):
+    """
+    Raised by the minimax search when the time budget of the current decision is over, or its budget of nodes or memory
+    """
+    pass
+
+
+class MiniMaxSearch:
+
+    def __init__(self, heuristic: Heuristic, max_depth: int = 2, configuration: Optional[SearchConfiguration] = None):
+        """
+        Instantiate the alpha-beta search used by the minimax player. It is kept apart from the player, which holds the
+        connection to the server, so that it can also run in the worker processes of the parallel search
+        :param heuristic: the heuristic used to evaluate the leaves
+        :param max_depth: max depth of the minimax tree, a level of depth equals to one turn of the game
+        :param configuration: the options of the search, None uses the default ones
+        """
+        if configuration is None:
+            configuration = SearchConfiguration()
+        self.configuration: SearchConfiguration = configuration
+        self.heuristic: Heuristic = heuristic
+        self.max_depth: int = max_depth
+        self.search_stats: SearchStatistics = SearchStatistics()
+
+        # Triangular array of the principal variations, the row of each ply holds the best line found from that ply
+        self.pv_table: List[List[Optional[Move | Pokemon]]] = []
+        self.pv_length: List[int] = []
+        self.transposition_table: Optional[TranspositionTable] = None
+        transposition_table_size = configuration.transposition_table_size
+        max_memory = configuration.max_memory
+        if max_memory is not None and transposition_table_size:
+            transposition_table_size = min(transposition_table_size, max_memory // (2 * ENTRY_BYTES))
+        if transposition_table_size:
+            self.transposition_table = TranspositionTable(transposition_table_size)
+
+        # If a time budget is given, the search deepens iteratively until the budget is over or max_depth is reached
+        self.time_budget_ms: Optional[int] = configuration.time_budget_ms
+        self.search_deadline: Optional[float] = None
+
+        # The budgets of nodes and memory are checked when the nodes reach next_budget_check, so that a search without
+        # budgets only compares two numbers in each node
+        self.max_nodes: Optional[int] = configuration.max_nodes
+        self.max_memory: Optional[int] = max_memory
+        self.next_budget_check: float = float('+inf')
+
+        # The aspiration window is centred on the last score of the root, which is kept between the turns if the tree
+        # is reused
+        self.pvs: bool = configuration.pvs
+        self.aspiration_window: Optional[float] = configuration.aspiration_window
+        self.aspiration_score: Optional[float] = None
+
+        # The extensions and the reductions move the horizon of the current line, the tree ends at max_depth plus the
+        # depth adjustment
+        self.max_extensions: int = configuration.max_extensions
+        self.reduction_index: Optional[int] = configuration.reduction_index
+        self.reduction_ply: int = configuration.reduction_ply
+        self.depth_adjustment: int = 0
+        self.line_extensions: int = 0
+
+        # The dominance between the moves assumes that the heuristic never scores a Pokémon higher with fewer health
+        # points at the same depth, which holds for all the heuristics of the bot
+        self.action_pruning: bool = configuration.action_pruning
+        self.opponent_model: Optional[OpponentModel] = configuration.opponent_model
+
+        # When few Pokémon are left the positions are solved much deeper, each iteration of the endgame search memoizes
+        # them in its own table so that it knows whether any line stopped at the horizon
+        self.endgame_pokemon: int = configuration.endgame_pokemon
+        self.endgame_depth: int = configuration.endgame_depth
+        self.endgame_time_ms: int = configuration.endgame_time_ms
+        self.endgame_table: Optional[TranspositionTable] = None
+        self.solving_endgame: bool = False
+        self.horizon_reached: bool = False
+
+        # The killer and history heuristics and the damage-based ordering can be disabled to compare the node counts
+        self.move_ordering: MoveOrdering = MoveOrdering(configuration.move_ordering)
+
+        # The chance nodes are pruned with Star1 and Star2, which need the bounds of the heuristic
+        self.chance_nodes: bool = configuration.chance_nodes
+        self.damage_buckets: int = configuration.damage_buckets
+        self.chance_depth: int = configuration.chance_depth
+        self.outcomes_cache: Dict[Tuple, List[Tuple[float, bool, int]]] = dict()
+        if self.chance_nodes and float('inf') in map(abs, heuristic.score_bounds(0, max_depth)):
+            warnings.warn("{0} has no score bounds, the chance nodes won't be pruned".format(type(heuristic).__name__))
+
+        # In the simultaneous search each turn is a matrix game, whose value is the one of its mixed strategy
+        self.simultaneous: bool = configuration.simultaneous
+
+        # Only the best switches by type matchup are expanded, so that the branching factor stays bounded
+        self.max_switches: int = configuration.max_switches
+
+        # The leaves of the last ply are scored in batches, the chance nodes are excluded since their leaves are
+        # reached through the outcomes
+        self.batch_leaves: bool = configuration.batch_leaves
+
+        # The entries of the transposition table remember the turn of their search, so that the following turns can
+        # rebase their scores
+        self.reuse_tree: bool = configuration.reuse_tree or configuration.ponder
+        self.root_turn: int = 0
+
+        # The principal variation found by pondering after each of the opponent's actions, by key of the action
+        self.ponder_lines: Dict[str, List[Move | Pokemon]] = dict()
+
+        # The process pool is created by the first parallel search and kept for the following decisions
+        self.workers: int = configuration.workers
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+
+    def reset_search(self):
+        """
+        Prepares the player for a new search by resetting the statistics, the move ordering and the transposition table
+        """
+        self.search_stats.reset()
+        self.move_ordering.reset()
+        self.outcomes_cache = dict()
+        self.aspiration_score = None
+        self.reset_principal_variation()
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+
+    def reroot_search(self, turn: int, last_turn_actions: List[Move | Pokemon]):
+        """
+        Prepares the player for the search of a following turn by keeping what the previous search has learnt. The
+        entries of the transposition table are kept and their scores are rebased to the new root, the killer actions are
+        moved up to the new root and the previous principal variation is searched first if the battle went as predicted
+        :param turn: turn of the battle in which the new search starts
+        :param last_turn_actions: the bot's action and the opponent's action since the previous search, only the known
+        ones
+        """
+        turns = turn - self.root_turn
+        if turns < 1:
+            self.reset_search()
+            self.root_turn = turn
+            return
+
+        principal_variation = self.principal_variation() if len(self.pv_length) > 0 else []
+        self.search_stats.reset()
+        self.outcomes_cache = dict()
+        self.reset_principal_variation()
+        self.root_turn = turn
+
+        # The principal variation starts from the new root only if both players did what it predicted
+        played = [action_key(action) for action in last_turn_actions]
+        predicted = [action_key(action) for action in principal_variation[:2]]
+        if turns > 1 or len(played) < 2 or played != predicted:
+            principal_variation = []
+
+        self.move_ordering.reroot(2 * turns, principal_variation[2:])
+
+    def reset_principal_variation(self):
+        """
+        Clears the principal variation array, it is allocated once for each max depth and reused by the following
+        decisions. The lines can be extended, so it has room for the extensions too
+        """
+        plies = 2 * (self.max_depth + self.max_extensions) + 1
+        if len(self.pv_table) != plies:
+            self.pv_table = [[None] * plies for _ in range(plies)]
+            self.pv_length = [0] * (plies + 1)
+        else:
+            self.pv_length[:] = [0] * (plies + 1)
+
+    def search(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Searches the minimax tree with the search mode chosen for this player
+        :param root_battle_status: root node from which the minimax algorithm starts
+        :return: a tuple containing the value of the root and the best action, None if the bot can't act
+        """
+        if self.is_endgame(root_battle_status):
+            return self.endgame_search(root_battle_status)
+
+        if self.time_budget_ms is not None or self.max_nodes is not None or self.max_memory is not None:
+            return self.iterative_deepening(root_battle_status)
+
+        result = self.search_root(root_battle_status)
+        self.search_stats.completed_depth = self.max_depth
+        return result
+
+    def is_endgame(self, node: BattleStatus) -> bool:
+        """
+        Checks whether a position is an endgame, i.e. both teams have at most endgame_pokemon Pokémon left and all the
+        opponent's ones have been revealed, otherwise the search would ignore some of them
+        :param node: a node representing a game state
+        :return: true if the position is solved by the endgame search, false otherwise
+        """
+        if self.endgame_pokemon <= 0 or self.simultaneous:
+            return False
+
+        bot_left = int(not node.act_poke.is_fainted()) + len([poke for poke in node.avail_switches if not poke.fainted])
+        opp_known = int(not node.opp_poke.is_fainted()) + len([poke for poke in node.opp_team if not poke.fainted])
+        opp_left = opp_known + TEAM_SIZE - 1 - len(node.opp_team)
+        return bot_left <= self.endgame_pokemon and opp_left == opp_known and opp_left <= self.endgame_pokemon
+
+    def endgame_search(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Solves an endgame by deepening iteratively up to endgame_depth within endgame_time_ms, the switches of all the
+        Pokémon that are left are searched. Before each iteration the table that memoizes the positions is cleared, so
+        its entries never come from a shallower iteration: if no line of an iteration stopped at the horizon the score
+        is exact and the deepening stops
+        :param root_battle_status: root node from which the minimax algorithm starts
+        :return: the result of the deepest completed iteration
+        """
+        if self.endgame_table is None:
+            self.endgame_table = TranspositionTable(ENDGAME_TABLE_SIZE)
+
+        saved = (self.max_depth, self.max_switches, self.time_budget_ms, self.workers, self.transposition_table)
+        self.max_depth = max(self.max_depth, self.endgame_depth)
+        self.max_switches = max(self.max_switches, self.endgame_pokemon - 1)
+        self.time_budget_ms = self.endgame_time_ms
+        self.workers = 1
+        self.transposition_table = self.endgame_table
+        self.solving_endgame = True
+        self.reset_principal_variation()
+        try:
+            return self.iterative_deepening(root_battle_status)
+        finally:
+            self.max_depth, self.max_switches, self.time_budget_ms, self.workers, self.transposition_table = saved
+            self.solving_endgame = False
+
+    def reach_horizon(self, node: BattleStatus):
+        """
+        Records that a line of the endgame search stopped at a node of the horizon, unless the node ends the battle
+        :param node: a leaf at the horizon
+        """
+        if self.solving_endgame and not self.horizon_reached and not self.is_terminal_node(node):
+            self.horizon_reached = True
+
+    def search_root(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Searches the minimax tree up to max_depth, either in this process or by splitting the root between the workers
+        :param root_battle_status: root node from which the minimax algorithm starts
+        :return: a tuple containing the value of the root and the best action, None if the bot can't act
+        """
+        if self.simultaneous:
+            score, best_action = self.simultaneous_search(root_battle_status, 0)
+        elif self.workers > 1 and self.max_depth > 0 and not self.is_terminal_node(root_battle_status):
+            score, best_action = self.parallel_alphabeta(root_battle_status)
+        else:
+            return self.aspiration_search(root_battle_status)
+
+        # These searches don't follow the line below the root, so the principal variation is made of the best action
+        self.pv_length[0] = 0
+        if best_action is not None:
+            self.pv_table[0][0] = best_action
+            self.pv_length[0] = 1
+
+        return score, best_action
+
+    def aspiration_search(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Searches the root with a window around the last score of the root. If the score falls outside the window, the
+        root is searched again with a window that is widened on the failing side, until the full window is used
+        :param root_battle_status: root node from which the minimax algorithm starts
+        :return: a tuple containing the value of the root and the best action, None if the bot can't act
+        """
+        if self.aspiration_window is None or self.aspiration_score is None:
+            result = self.alphabeta(root_battle_status, 0, float('-inf'), float('+inf'), True)
+            self.aspiration_score = result[0]
+            return result
+
+        window = self.aspiration_window
+        alpha, beta = self.aspiration_score - window, self.aspiration_score + window
+        retries = 0
+        while True:
+            score, best_action = self.alphabeta(root_battle_status, 0, alpha, beta, True)
+
+            # An unbounded side of the window can't fail, so a score of +-inf is exact there
+            if (alpha < score or alpha == float('-inf')) and (score < beta or beta == float('+inf')):
+                break
+
+            # The score is a bound, so the window is moved past it and widened
+            self.search_stats.re_searches += 1
+            retries += 1
+            window *= 4
+            if score <= alpha:
+                alpha = score - window if retries < ASPIRATION_RETRIES else float('-inf')
+            else:
+                beta = score + window if retries < ASPIRATION_RETRIES else float('+inf')
+
+        self.aspiration_score = score
+        return score, best_action
+
+    def principal_variation(self) -> List[Move | Pokemon]:
+        """
+        Retrieves the principal variation of the last search, i.e. the sequence of best actions from the root
+        :return: the actions of the principal variation
+        """
+        return self.pv_table[0][:self.pv_length[0]]
+
+    def update_principal_variation(self, ply: int, action: Move | Pokemon):
+        """
+        Sets the best action of a ply, which is followed by the principal variation of the ply below
+        :param ply: number of actions between the root and the node
+        :param action: the new best action of the node
+        """
+        row, child_row = self.pv_table[ply], self.pv_table[ply + 1]
+        child_length = self.pv_length[ply + 1]
+        row[ply] = action
+        row[ply + 1:child_length] = child_row[ply + 1:child_length]
+        self.pv_length[ply] = child_length
+
+    def parallel_alphabeta(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Searches the children of the root in the worker processes. The first child is searched alone, then the others
+        are searched in parallel and each of them starts with the best score found so far as alpha bound. The children
+        that are searched at the same time split the nodes left in the budget, and the memory budget is split among the
+        workers, so that together they stay within the budgets of the decision
+        :param root_battle_status: root node from which the minimax algorithm starts
+        :return: a tuple containing the value of the root and its best action
+        """
+        self.search_stats.nodes += 1
+        self.search_stats.interior_nodes += 1
+        pool = self.get_process_pool()
+        actions = self.search_actions(root_battle_status, True)
+        actions = self.move_ordering.order(root_battle_status, actions, 0, True, None)
+        self.move_ordering.follow_pv = False
+
+        # The budgets are enforced only when the search checks them, the first iteration of a deepening never does
+        check_budgets = self.next_budget_check < float('+inf')
+        max_memory = None
+        if check_budgets and self.max_memory is not None:
+            max_memory = max((self.max_memory - self.search_memory()) // self.workers, 0)
+
+        alpha, best_index = float('-inf'), None
+        pending: Dict[Future, Tuple[int, float, int]] = dict()
+        next_child = 0
+        while next_child < len(actions) or len(pending) > 0:
+            # Until the first child is searched there is no bound to share, so the other workers would search blindly
+            max_pending = self.workers if best_index is not None else 1
+            while next_child < len(actions) and len(pending) < max_pending:
+                time_left = None
+                if self.search_deadline is not None:
+                    time_left = self.search_deadline - time.perf_counter()
+
+                # The nodes that are not reserved by the children being searched are split among the free workers,
+                # what a child doesn't use goes back to the following ones
+                max_nodes = None
+                if check_budgets and self.max_nodes is not None:
+                    reserved = sum(child_nodes for _, _, child_nodes in pending.values())
+                    max_nodes = max((self.max_nodes - self.search_stats.nodes - reserved)
+                                    // (max_pending - len(pending)), 0)
+
+                future = pool.submit(search_root_action, root_battle_status, actions[next_child], self.max_depth,
+                                     alpha, time_left, max_nodes, max_memory)
+                pending[future] = (next_child, alpha, max_nodes or 0)
+                next_child += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, child_alpha, _ = pending.pop(future)
+                child_score, child_stats = future.result()
+                if child_score is None:
+                    for other_future in pending:
+                        other_future.cancel()
+                    raise SearchTimeout
+
+                self.search_stats.merge(child_stats)
+                if self.search_stats.nodes >= self.next_budget_check and self.search_budget_exceeded():
+                    for other_future in pending:
+                        other_future.cancel()
+                    raise SearchTimeout
+
+                # On ties the first action wins as in the serial search, unless its score is just the bound it got
+                if best_index is None or child_score > alpha or \
+                        (child_score == alpha and index < best_index and child_score > child_alpha):
+                    best_index = index
+                alpha = max(alpha, child_score)
+
+        return alpha, actions[best_index]
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        """
+        Retrieves the pool of processes of the parallel search, the pool is created the first time it is needed and
+        again after it is shut down
+        :return: the process pool
+        """
+        if self.process_pool is None:
+            # The processes are spawned and not forked, since the player runs the threads of the websocket connection
+            table_size = self.transposition_table.size if self.transposition_table is not None else 0
+            self.process_pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                    mp_context=multiprocessing.get_context("spawn"),
+                                                    initializer=init_search_worker,
+                                                    initargs=(self.heuristic,
+                                                              self.configuration.helper_configuration(table_size)))
+
+        return self.process_pool
+
+    def search_memory(self) -> int:
+        """
+        Estimates the memory taken by the state of the search, the undo stack and the principal variation array are
+        left out since they are bounded by the max depth
+        :return: the approximate size of the search state in bytes
+        """
+        memory = (len(self.move_ordering.damage_cache) + len(self.outcomes_cache)) * CACHE_ENTRY_BYTES
+        if self.transposition_table is not None:
+            memory += self.transposition_table.memory()
+
+        return memory
+
+    def search_budget_exceeded(self) -> bool:
+        """
+        Checks whether the search has visited more nodes or taken more memory than its budgets, and schedules the next
+        check
+        :return: true if one of the budgets is over, false otherwise
+        """
+        nodes = self.search_stats.nodes
+        if self.max_nodes is not None and nodes >= self.max_nodes:
+            return True
+
+        if self.max_memory is not None:
+            if self.search_memory() > self.max_memory:
+                return True
+            self.next_budget_check = nodes + MEMORY_CHECK_NODES
+        else:
+            self.next_budget_check = self.max_nodes if self.max_nodes is not None else float('+inf')
+
+        return False
+
+    def shutdown_process_pool(self):
+        """
+        Terminates the processes of the parallel search, if they were started
+        """
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+            self.process_pool = None
+
+    def iterative_deepening(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Searches the minimax tree with increasing depth until the time budget, the node budget or the memory budget is
+        over or max_depth is reached. Each iteration starts by exploring the principal variation of the previous one
+        :param root_battle_status: root node from which the minimax algorithm starts
+        :return: the result of the deepest completed iteration
+        """
+        max_depth = self.max_depth
+        start = time.perf_counter()
+        deadline = start + self.time_budget_ms / 1000 if self.time_budget_ms is not None else None
+        result = None
+        try:
+            for depth in range(1, max_depth + 1):
+                # The first iteration always completes, so that there is always a move to play
+                self.search_deadline = deadline if result is not None else None
+                self.next_budget_check = 0 if result is not None else float('+inf')
+                self.max_depth = depth
+                self.move_ordering.follow_pv = True
+                if self.solving_endgame:
+                    self.transposition_table.clear()
+                    self.horizon_reached = False
+
+                iteration_start = time.perf_counter()
+                try:
+                    result = self.search_root(root_battle_status)
+                except SearchTimeout:
+                    break
+
+                self.search_stats.completed_depth = depth
+                self.move_ordering.principal_variation = self.principal_variation()
+                if self.solving_endgame and not self.horizon_reached:
+                    break
+
+                # The next iteration is deeper, it can't complete if this one took longer than the remaining time
+                now = time.perf_counter()
+                if deadline is not None and now - iteration_start > deadline - now:
+                    break
+        finally:
+            self.max_depth = max_depth
+            self.search_deadline = None
+            self.next_budget_check = float('+inf')
+
+        return result
+
+    def ponder(self, node: BattleStatus, opp_actions: List[Move | Pokemon], stop: threading.Event):
+        """
+        Searches the turns that may follow the one that is being played, while the opponent is choosing its action.
+        The positions reached by the opponent's actions are searched one at a time, each deepening iteratively up to
+        max_depth, until all of them are searched or the search is stopped. The principal variation of the deepest
+        completed iteration after each action is kept in ponder_lines, so that the search of the next turn can start
+        from the one of the action the opponent chose, while the scores are kept in the transposition table
+        :param node: the node reached by the bot's action
+        :param opp_actions: the opponent's actions, the most likely ones first
+        :param stop: event that is set when the next turn starts, the search is stopped by also setting its deadline in
+        the past
+        """
+        max_depth = self.max_depth
+        self.ponder_lines = dict()
+        try:
+            for opp_action in opp_actions:
+                node.apply_action(opp_action, False)
+                try:
+                    self.move_ordering.principal_variation = []
+                    for depth in range(1, max_depth + 1):
+                        # The deadline is set before checking the event, so a stop is never missed
+                        self.search_deadline = float('+inf')
+                        if stop.is_set():
+                            return
+
+                        self.max_depth = depth
+                        self.move_ordering.follow_pv = True
+                        self.search_root(node)
+                        self.search_stats.completed_depth = depth
+                        self.move_ordering.principal_variation = self.principal_variation()
+                        self.ponder_lines[action_key(opp_action)] = self.move_ordering.principal_variation
+                finally:
+                    node.undo_action()
+        except SearchTimeout:
+            pass
+        finally:
+            self.max_depth = max_depth
+            self.search_deadline = None
+
+    def alphabeta(self, node: BattleStatus,
+                  depth: int,
+                  alpha: float,
+                  beta: float,
+                  is_my_turn: bool) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Build the minimax tree with alpha-beta pruning. The children are not allocated: the actions are applied to the
+        node in place and undone once their subtree is searched, so the node is left as it was
+        :param node: to start exploring from
+        :param depth: current depth of the minimax tree. A level of depth equals to one turn of the game
+        :param alpha: alpha value of the alpha-beta pruning. Initial call: alpha=-inf
+        :param beta: beta value of the alpha-beta pruning. Initial call: beta=-inf
+        :param is_my_turn: true if the bot attacks, false otherwise
+        :return: a tuple containing the value of the node and its best action, None if it is a leaf or a cutoff
+        (* Initial call *) alphabeta(origin, 0, −inf, +inf, TRUE)
+        """
+        self.search_stats.nodes += 1
+        if self.search_deadline is not None and time.perf_counter() > self.search_deadline:
+            raise SearchTimeout
+        if self.search_stats.nodes >= self.next_budget_check and self.search_budget_exceeded():
+            raise SearchTimeout
+
+        # Number of plies that are left to search below this node
+        horizon = self.max_depth + self.depth_adjustment
+        draft = 2 * (horizon - depth) - (0 if is_my_turn else 1)
+        ply = 2 * depth + (0 if is_my_turn else 1)
+        self.pv_length[ply] = ply
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        if self.transposition_table is not None:
+            entry = self.transposition_table.lookup(node.zobrist_hash)
+            if entry is not None:
+                self.search_stats.tt_hits += 1
+                if entry.turn < self.root_turn:
+                    self.search_stats.tt_previous_hits += 1
+                tt_move = entry.best_move
+                tt_score = self.transposition_score(entry, depth)
+                if tt_score is not None and entry.draft >= draft and (depth > 0 or not is_my_turn):
+                    if entry.bound is BoundType.EXACT:
+                        alpha, beta = tt_score, tt_score
+                    elif entry.bound is BoundType.LOWER:
+                        alpha = max(alpha, tt_score)
+                    else:
+                        beta = min(beta, tt_score)
+
+                    if alpha >= beta:
+                        self.move_ordering.follow_pv = False
+                        self.search_stats.tt_cutoffs += 1
+                        return tt_score, None
+
+        if depth >= horizon or self.is_terminal_node(node):
+            if depth >= horizon:
+                self.reach_horizon(node)
+            self.move_ordering.follow_pv = False
+            self.search_stats.leaves += 1
+            score = node.compute_score(self.heuristic, depth)
+            self.store_in_transposition_table(node, depth, draft, score, float('-inf'), float('+inf'), None)
+            return score, None
+
+        # The dominated moves are only dropped when the children are evaluated by the heuristic, and the extensions
+        # may search them deeper
+        child_depth = depth if is_my_turn else depth + 1
+        drop_dominated = child_depth >= horizon and self.max_extensions == 0
+        actions = self.move_ordering.order(node, self.search_actions(node, is_my_turn, drop_dominated), ply,
+                                           is_my_turn, tt_move)
+        self.search_stats.interior_nodes += 1
+
+        leaf_scores = None
+        if self.batch_leaves and not self.chance_nodes and child_depth == horizon:
+            leaf_scores = self.evaluate_leaves(node, actions, child_depth, is_my_turn)
+
+        best_action = None
+        if is_my_turn:
+            score = float('-inf')
+            # print(str(depth) + " bot -> " + str(node))
+            for i, poss_act in enumerate(actions):
+                self.pv_length[ply + 1] = ply + 1
+                if leaf_scores is not None and leaf_scores[i] is not None:
+                    child_score = leaf_scores[i]
+                else:
+                    child_score = self.principal_variation_search(node, poss_act, i, depth, alpha, beta, is_my_turn)
+                if score < child_score:
+                    best_action = poss_act
+                    self.update_principal_variation(ply, poss_act)
+                score = max(score, child_score)
+                if score >= beta:
+                    self.record_cutoff(poss_act, i, ply, is_my_turn, draft)
+                    break  # beta cutoff
+                alpha = max(alpha, score)
+
+            # print(str(depth) + " bot -> " + str(best_action))
+        else:
+            score = float('inf')
+            # print(str(depth) + " bot -> " + str(node))
+            for i, poss_act in enumerate(actions):
+                self.pv_length[ply + 1] = ply + 1
+                if leaf_scores is not None and leaf_scores[i] is not None:
+                    child_score = leaf_scores[i]
+                else:
+                    child_score = self.principal_variation_search(node, poss_act, i, depth, alpha, beta, is_my_turn)
+                if score > child_score:
+                    best_action = poss_act
+                    self.update_principal_variation(ply, poss_act)
+                score = min(score, child_score)
+                if score <= alpha:
+                    self.record_cutoff(poss_act, i, ply, is_my_turn, draft)
+                    break  # alpha cutoff
+                beta = min(beta, score)
+
+            # print(str(depth) + " opp -> " + str(best_action))
+
+        self.store_in_transposition_table(node, depth, draft, score, alpha_orig, beta_orig, best_action)
+        return score, best_action
+
+    def simultaneous_search(self, node: BattleStatus, depth: int) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Searches the tree in which each node is a turn, whose children are the outcomes of each pair of actions of the
+        two players. The payoff matrix of the turn is solved as a zero-sum game, and the solutions are stored in the
+        transposition table so that each state is solved once
+        :param node: a node at the beginning of a turn
+        :param depth: current depth of the tree, a level of depth equals to one turn of the game
+        :return: a tuple containing the value of the turn and the bot's action with the highest probability in its
+        strategy, None in the leaves
+        """
+        self.search_stats.nodes += 1
+        if self.search_deadline is not None and time.perf_counter() > self.search_deadline:
+            raise SearchTimeout
+        if self.search_stats.nodes >= self.next_budget_check and self.search_budget_exceeded():
+            raise SearchTimeout
+
+        draft = 2 * (self.max_depth - depth)
+        if self.transposition_table is not None and depth > 0:
+            entry = self.transposition_table.lookup(node.zobrist_hash)
+            if entry is not None:
+                self.search_stats.tt_hits += 1
+                if entry.turn < self.root_turn:
+                    self.search_stats.tt_previous_hits += 1
+                tt_score = self.transposition_score(entry, depth)
+                if tt_score is not None and entry.draft >= draft:
+                    self.search_stats.tt_cutoffs += 1
+                    return tt_score, entry.best_move
+
+        if depth == self.max_depth or self.is_terminal_node(node):
+            self.search_stats.leaves += 1
+            score = node.compute_score(self.heuristic, depth)
+            self.store_in_transposition_table(node, depth, draft, score, float('-inf'), float('+inf'), None)
+            return score, None
+
+        # A player without actions lets the other one act alone
+        bot_actions = self.search_actions(node, True) or [None]
+        opp_actions = self.search_actions(node, False) or [None]
+        outspeed_p = node.outspeed_probability()
+        self.search_stats.interior_nodes += 1
+
+        payoffs = np.empty((len(bot_actions), len(opp_actions)))
+        for i, bot_action in enumerate(bot_actions):
+            for j, opp_action in enumerate(opp_actions):
+                child = node.simulate_turn(bot_action, opp_action, outspeed_p, self.move_ordering.estimate_damage)
+                payoffs[i, j], _ = self.simultaneous_search(child, depth + 1)
+
+        score, bot_strategy, _ = solve_matrix_game(payoffs)
+        best_action = bot_actions[int(np.argmax(bot_strategy))]
+        self.store_in_transposition_table(node, depth, draft, score, float('-inf'), float('+inf'), best_action)
+        return score, best_action
+
+    def evaluate_leaves(self, node: BattleStatus, actions: List[Move | Pokemon], depth: int,
+                        is_my_turn: bool) -> List[Optional[float]]:
+        """
+        Evaluates all the children of a node that are leaves with a single call to the heuristic. The features of each
+        child are extracted while its action is applied, then the whole batch is scored at once and stored in the
+        transposition table. Every leaf is scored, even the ones after a cutoff that the search would have skipped, so
+        batching pays off when the heuristic is much cheaper per leaf in a batch than alone. The leaves count as nodes
+        as soon as they are reached, so the time and the budgets are checked before each of them as in alphabeta
+        :param node: the node whose children are leaves
+        :param actions: the actions of the node
+        :param depth: depth of the children
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :return: the scores of the children in the same order of the actions, None for the children that are extended
+        and must be searched
+        """
+        features, leaves, hashes = [], [], []
+        for i, action in enumerate(actions):
+            # The damage of the moves is taken from the cache of the move ordering, which already computed it
+            damage = self.move_ordering.estimate_damage(node, action, is_my_turn) if isinstance(action, Move) else None
+            node.apply_action(action, is_my_turn, damage=damage)
+            is_leaf = not self.should_extend(node, depth, not is_my_turn)
+            if is_leaf:
+                self.reach_horizon(node)
+                features.append(self.heuristic.leaf_features(node, depth))
+                leaves.append(i)
+                hashes.append(node.zobrist_hash)
+            node.undo_action()
+
+            if is_leaf:
+                self.search_stats.nodes += 1
+                if self.search_deadline is not None and time.perf_counter() > self.search_deadline:
+                    raise SearchTimeout
+                if self.search_stats.nodes >= self.next_budget_check and self.search_budget_exceeded():
+                    raise SearchTimeout
+
+        scores = [None] * len(actions)
+        if len(leaves) > 0:
+            self.search_stats.leaves += len(leaves)
+            for i, score in zip(leaves, self.heuristic.compute_batch(np.array(features)).tolist()):
+                scores[i] = score
+
+            # The leaves are stored as exact scores like the ones evaluated one at a time, without replacing the
+            # deeper searches of the same states
+            if self.transposition_table is not None:
+                draft = 2 * (self.max_depth + self.depth_adjustment - depth) - (1 if is_my_turn else 0)
+                for i, zobrist_hash in zip(leaves, hashes):
+                    entry = self.transposition_table.lookup(zobrist_hash)
+                    if entry is None or entry.draft < draft:
+                        self.transposition_table.store(zobrist_hash, depth, draft, scores[i], BoundType.EXACT, None,
+                                                       self.root_turn)
+
+        return scores
+
+    def should_extend(self, node: BattleStatus, depth: int, is_my_turn: bool) -> bool:
+        """
+        Checks whether the line is searched one more turn beyond a node, which happens if the node is at the horizon of
+        the line, the line can still be extended and a Pokémon may faint in the next turn
+        :param node: a node at the beginning of a turn or in the middle of it
+        :param depth: depth of the node
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :return: true if the line is extended, false otherwise
+        """
+        return is_my_turn and self.line_extensions < self.max_extensions \
+            and depth == self.max_depth + self.depth_adjustment and not self.is_terminal_node(node) \
+            and self.faint_threat(node)
+
+    def faint_threat(self, node: BattleStatus) -> bool:
+        """
+        Checks whether one of the active Pokémon may faint in the next turn, because a move of the other one knocks it
+        out, or because of the recoil of its own move or a self-destruct
+        :param node: a node at the beginning of a turn
+        :return: true if a Pokémon may faint, false otherwise
+        """
+        if node.act_poke.is_fainted() or node.opp_poke.is_fainted():
+            return False
+
+        for is_my_turn, attacker, defender in [(True, node.act_poke, node.opp_poke),
+                                               (False, node.opp_poke, node.act_poke)]:
+            for move in attacker.moves:
+                if move.self_destruct:
+                    return True
+
+                damage = self.move_ordering.estimate_damage(node, move, is_my_turn)
+                if damage >= defender.current_hp or node.compute_recoil(attacker, move, damage) >= attacker.current_hp:
+                    return True
+
+        return False
+
+    def reduce_action(self, node: BattleStatus, action: Move | Pokemon, index: int, depth: int,
+                      is_my_turn: bool) -> bool:
+        """
+        Checks whether an action is searched one turn less deep. Only the moves ranked late enough by the move ordering
+        are reduced, in the nodes far enough from the root that have at least a turn left below them after the
+        reduction. The moves that knock out the defender are never reduced
+        :param node: the node in which the action is done
+        :param action: the action under consideration
+        :param index: position of the action in the sorted actions of the node
+        :param depth: current depth of the minimax tree
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :return: true if the action is reduced, false otherwise
+        """
+        if self.reduction_index is None or index < self.reduction_index or not isinstance(action, Move):
+            return False
+
+        ply = 2 * depth + (0 if is_my_turn else 1)
+        draft = 2 * (self.max_depth + self.depth_adjustment - depth) - (0 if is_my_turn else 1)
+        if ply < self.reduction_ply or draft < 3:
+            return False
+
+        defender = node.opp_poke if is_my_turn else node.act_poke
+        return self.move_ordering.estimate_damage(node, action, is_my_turn) < defender.current_hp
+
+    def principal_variation_search(self, node: BattleStatus, action: Move | Pokemon, index: int, depth: int,
+                                   alpha: float, beta: float, is_my_turn: bool) -> float:
+        """
+        Searches an action of a node. The late moves may be searched with a reduced depth first. The first action is
+        expected to be the best one, so the others are searched with a null window that only tells whether they are
+        better. If one of them is, it is searched again with the window of the node
+        :param node: the node in which the action is done
+        :param action: the action under consideration
+        :param index: position of the action in the sorted actions of the node
+        :param depth: current depth of the minimax tree
+        :param alpha: alpha value of the alpha-beta pruning
+        :param beta: beta value of the alpha-beta pruning
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :return: the value of the action
+        """
+        if self.reduce_action(node, action, index, depth, is_my_turn):
+            self.depth_adjustment -= 1
+            try:
+                score = self.search_action(node, action, depth, alpha, beta, is_my_turn)
+            finally:
+                self.depth_adjustment += 1
+
+            # The reduced search is trusted only if the action isn't better than the ones already searched
+            if (is_my_turn and score <= alpha) or (not is_my_turn and score >= beta):
+                return score
+
+            self.search_stats.re_searches += 1
+
+        if not self.pvs or index == 0 or beta - alpha <= NULL_WINDOW:
+            return self.search_action(node, action, depth, alpha, beta, is_my_turn)
+
+        if is_my_turn:
+            score = self.search_action(node, action, depth, alpha, alpha + NULL_WINDOW, is_my_turn)
+            if alpha + NULL_WINDOW <= score < beta:
+                self.search_stats.re_searches += 1
+                score = self.search_action(node, action, depth, alpha, beta, is_my_turn)
+        else:
+            score = self.search_action(node, action, depth, beta - NULL_WINDOW, beta, is_my_turn)
+            if alpha < score <= beta - NULL_WINDOW:
+                self.search_stats.re_searches += 1
+                score = self.search_action(node, action, depth, alpha, beta, is_my_turn)
+
+        return score
+
+    def search_action(self, node: BattleStatus, action: Move | Pokemon, depth: int, alpha: float, beta: float,
+                      is_my_turn: bool) -> float:
+        """
+        Searches the subtree reached by an action, through a chance node if the action has random outcomes
+        :param node: the node in which the action is done
+        :param action: the action under consideration
+        :param depth: current depth of the minimax tree
+        :param alpha: alpha value of the alpha-beta pruning
+        :param beta: beta value of the alpha-beta pruning
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :return: the value of the action
+        """
+        # The turn is over after the opponent's action
+        child_depth = depth if is_my_turn else depth + 1
+        if not self.chance_nodes or not isinstance(action, Move):
+            return self.search_child(node, action, child_depth, alpha, beta, is_my_turn)
+
+        outcomes = self.action_outcomes(node, action, is_my_turn)
+        if len(outcomes) == 1:
+            _, hit, damage = outcomes[0]
+            return self.search_child(node, action, child_depth, alpha, beta, is_my_turn, hit, damage)
+
+        # Beyond the chance depth the outcomes are collapsed into a single node that takes the expected damage
+        if depth >= self.chance_depth:
+            damage = int(sum(probability * damage for probability, hit, damage in outcomes if hit))
+            return self.search_child(node, action, child_depth, alpha, beta, is_my_turn, True, damage)
+
+        return self.expectation(node, action, outcomes, child_depth, alpha, beta, is_my_turn)
+
+    def action_outcomes(self, node: BattleStatus, move: Move, is_my_turn: bool) -> List[Tuple[float, bool, int]]:
+        """
+        Retrieves the random outcomes of a move, they only depend on the same fields of the damage so they are cached
+        :param node: the node in which the move is used
+        :param move: the move under consideration
+        :param is_my_turn: true if the bot uses the move, false otherwise
+        :return: the probability, whether the move hits and the damage of each outcome
+        """
+        key = node.damage_key(move, is_my_turn)
+        outcomes = self.outcomes_cache.get(key)
+        if outcomes is None:
+            outcomes = node.chance_outcomes(move, is_my_turn, self.damage_buckets)
+            self.outcomes_cache[key] = outcomes
+
+        return outcomes
+
+    def search_actions(self, node: BattleStatus, is_my_turn: bool,
+                       drop_dominated: bool = False) -> List[Move | Pokemon]:
+        """
+        Computes the actions that are searched in a node, after the pruning of the equivalent and dominated moves if it
+        is enabled. In the opponent's nodes only the most likely moves are kept if there is an opponent model
+        :param node: the node under consideration
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :param drop_dominated: whether the dominated moves are dropped, otherwise only the equivalent ones are merged
+        :return: the actions of the node
+        """
+        if is_my_turn:
+            actions = node.act_poke_avail_actions(self.max_switches)
+        else:
+            actions = node.opp_poke_avail_actions(self.max_switches)
+
+        if self.action_pruning and len(actions) > 1:
+            actions = self.prune_actions(node, actions, is_my_turn, drop_dominated)
+
+        if self.opponent_model is not None and not is_my_turn:
+            damages = [self.move_ordering.estimate_damage(node, action, False) if isinstance(action, Move) else None
+                       for action in actions]
+            searched_actions = self.opponent_model.select(node, actions, damages)
+            self.search_stats.pruned_actions += len(actions) - len(searched_actions)
+            actions = searched_actions
+
+        return actions
+
+    def prune_actions(self, node: BattleStatus, actions: List[Move | Pokemon], is_my_turn: bool,
+                      drop_dominated: bool) -> List[Move | Pokemon]:
+        """
+        Merges the moves that lead to the same state, e.g. the status moves that the simulation treats as no-ops and the
+        default moves of the same type and power, only the first one of them is kept. The dominated moves change the
+        state in the same way as another move apart from the health points of the defender, of which they leave more.
+        They can only be dropped when the children of the node are evaluated by the heuristic, since a Pokémon with
+        fewer health points may faint earlier in a deeper line, which ends the line with a different score. With the
+        chance nodes the moves are merged only if they have the same outcomes. The switches are always kept
+        :param node: the node under consideration
+        :param actions: available actions of the node
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :param drop_dominated: whether the dominated moves are dropped, otherwise only the equivalent ones are merged
+        :return: the actions that are left, in the same order
+        """
+        # When both moves of a turn are resolved together, or the damage is random, the health points of the defender
+        # change the effects of the other moves too
+        drop_dominated = drop_dominated and not self.simultaneous and not self.chance_nodes
+        groups: Dict[Tuple, int] = dict()
+        pruned_actions: List[Move | Pokemon] = []
+        defender_hps: List[Optional[int]] = []
+        for action in actions:
+            if not isinstance(action, Move):
+                pruned_actions.append(action)
+                defender_hps.append(None)
+                continue
+
+            damage = self.move_ordering.estimate_damage(node, action, is_my_turn)
+            act_hp, act_boosts, opp_hp, opp_boosts, weather = node.compute_action_effects(action, is_my_turn, True,
+                                                                                          damage)
+            if is_my_turn:
+                key = (act_hp, tuple(act_boosts.values()), tuple(opp_boosts.values()), tuple(weather.items()))
+                defender_hp = opp_hp
+            else:
+                key = (opp_hp, tuple(opp_boosts.values()), tuple(act_boosts.values()), tuple(weather.items()))
+                defender_hp = act_hp
+
+            if not drop_dominated:
+                key += (defender_hp,)
+            if self.simultaneous:
+                # The priority decides which move of the turn is done first
+                key += (action.priority,)
+            if self.chance_nodes:
+                key += (action.recoil, action.drain, tuple(self.action_outcomes(node, action, is_my_turn)))
+
+            index = groups.get(key)
+            if index is None:
+                groups[key] = len(pruned_actions)
+                pruned_actions.append(action)
+                defender_hps.append(defender_hp)
+            elif defender_hp < defender_hps[index]:
+                pruned_actions[index] = action
+                defender_hps[index] = defender_hp
+
+        self.search_stats.pruned_actions += len(actions) - len(pruned_actions)
+        return pruned_actions
+
+    def search_child(self, node: BattleStatus, action: Move | Pokemon, depth: int, alpha: float, beta: float,
+                     is_my_turn: bool, hit: bool = True, damage: Optional[int] = None) -> float:
+        """
+        Applies an action to the node, searches the resulting state and undoes the action. The line is extended by a
+        turn if the state is at its horizon and a Pokémon may faint
+        :param node: the node in which the action is done
+        :param action: the action under consideration
+        :param depth: depth of the child
+        :param alpha: alpha value of the alpha-beta pruning
+        :param beta: beta value of the alpha-beta pruning
+        :param is_my_turn: true if the bot does the action, false otherwise
+        :param hit: false if the move misses
+        :param damage: damage dealt by the move, if None it is estimated
+        :return: the value of the child
+        """
+        node.apply_action(action, is_my_turn, hit, damage)
+        extension = 1 if self.should_extend(node, depth, not is_my_turn) else 0
+        self.depth_adjustment += extension
+        self.line_extensions += extension
+        try:
+            score, _ = self.alphabeta(node, depth, alpha, beta, not is_my_turn)
+        finally:
+            # The node must be restored even if the time is over, since it is the root of the next searches
+            self.depth_adjustment -= extension
+            self.line_extensions -= extension
+            node.undo_action()
+
+        return score
+
+    def expectation(self, node: BattleStatus, action: Move, outcomes: List[Tuple[float, bool, int]], depth: int,
+                    alpha: float, beta: float, is_my_turn: bool) -> float:
+        """
+        Searches a chance node, whose value is the expected value of its outcomes. The outcomes are pruned with Star1:
+        the bounds of the heuristic limit how much the outcomes that are left can change the expected value. Star2
+        first probes a single action of each outcome, which bounds its value, to look for a cutoff before the full
+        search
+        :param node: the node in which the action is done
+        :param action: the action with random outcomes
+        :param outcomes: the probability, whether the move hits and the damage of each outcome
+        :param depth: depth of the outcome nodes
+        :param alpha: alpha value of the alpha-beta pruning
+        :param beta: beta value of the alpha-beta pruning
+        :param is_my_turn: true if the bot does the action, false otherwise
+        :return: the expected value of the action
+        """
+        self.search_stats.chance_nodes += 1
+        probabilities = [probability for probability, _, _ in outcomes]
+        lower, upper = self.heuristic.score_bounds(depth, self.max_depth + self.max_extensions)
+        lower_bounds = [lower] * len(outcomes)
+        upper_bounds = [upper] * len(outcomes)
+
+        # The bot moves in the outcomes of the opponent's actions, so probing one action gives a lower bound of the
+        # outcome, while it gives an upper bound in the outcomes of the bot's actions
+        child_is_my_turn = not is_my_turn
+        for i, (_, hit, damage) in enumerate(outcomes):
+            node.apply_action(action, is_my_turn, hit, damage)
+            try:
+                if depth >= self.max_depth + self.depth_adjustment or self.is_terminal_node(node):
+                    continue
+
+                child_actions = self.search_actions(node, child_is_my_turn)
+
+                ply = 2 * depth + (0 if child_is_my_turn else 1)
+                probe_action = self.move_ordering.order(node, child_actions, ply, child_is_my_turn, None)[0]
+                probe_score = self.search_action(node, probe_action, depth, lower_bounds[i], upper_bounds[i],
+                                                 child_is_my_turn)
+            finally:
+                node.undo_action()
+
+            if child_is_my_turn:
+                lower_bounds[i] = max(lower_bounds[i], probe_score)
+                expected_lower = sum(p * bound for p, bound in zip(probabilities, lower_bounds))
+                if expected_lower >= beta:
+                    self.search_stats.chance_cutoffs += 1
+                    return expected_lower
+            else:
+                upper_bounds[i] = min(upper_bounds[i], probe_score)
+                expected_upper = sum(p * bound for p, bound in zip(probabilities, upper_bounds))
+                if expected_upper <= alpha:
+                    self.search_stats.chance_cutoffs += 1
+                    return expected_upper
+
+        expected_score = 0
+        for i, (probability, hit, damage) in enumerate(outcomes):
+            left_lower = sum(p * bound for p, bound in zip(probabilities[i + 1:], lower_bounds[i + 1:]))
+            left_upper = sum(p * bound for p, bound in zip(probabilities[i + 1:], upper_bounds[i + 1:]))
+
+            # Window of the outcome outside which the expected value is surely out of the window of the chance node
+            child_alpha = (alpha - expected_score - left_upper) / probability
+            child_beta = (beta - expected_score - left_lower) / probability
+            child_score = self.search_child(node, action, depth, max(child_alpha, lower_bounds[i]),
+                                            min(child_beta, upper_bounds[i]), is_my_turn, hit, damage)
+            if child_score <= child_alpha:
+                self.search_stats.chance_cutoffs += 1
+                return expected_score + probability * child_score + left_upper
+
+            if child_score >= child_beta:
+                self.search_stats.chance_cutoffs += 1
+                return expected_score + probability * child_score + left_lower
+
+            expected_score += probability * child_score
+
+        return expected_score
+
+    def record_cutoff(self, action: Move | Pokemon, index: int, ply: int, is_my_turn: bool, draft: int):
+        """
+        Updates the statistics and the move ordering after an action caused a cutoff
+        :param action: the action that caused the cutoff
+        :param index: position of the action in the sorted actions of the node
+        :param ply: number of actions between the root and the node
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :param draft: number of plies searched below the node
+        """
+        self.search_stats.cutoffs += 1
+        if index == 0:
+            self.search_stats.first_move_cutoffs += 1
+
+        self.move_ordering.update(action, ply, is_my_turn, draft)
+
+    def transposition_score(self, entry: TranspositionEntry, depth: int) -> Optional[float]:
+        """
+        Retrieves the score of an entry of the transposition table as seen from the current root. The heuristics
+        penalize the depth, so a score can be reused only at the same depth of the tree, or at the same turn of the
+        battle if the entry was stored by the search of a previous turn, in which case its score is rebased
+        :param entry: an entry of the transposition table
+        :param depth: current depth of the minimax tree
+        :return: the score of the entry, None if it can't be reused at this depth
+        """
+        turns = self.root_turn - entry.turn
+        if entry.depth - turns != depth:
+            return None
+
+        if turns == 0:
+            return entry.score
+
+        return self.heuristic.rebase_score(entry.score, turns)
+
+    def store_in_transposition_table(self, node: BattleStatus, depth: int, draft: int, score: float,
+                                     alpha: float, beta: float, best_action: Optional[Move | Pokemon]):
+        """
+        Stores the result of the search of a node in the transposition table, if the table is enabled
+        :param node: the searched node
+        :param depth: current depth of the minimax tree
+        :param draft: number of plies searched below the node
+        :param score: the score of the node
+        :param alpha: alpha value with which the search of the node started
+        :param beta: beta value with which the search of the node started
+        :param best_action: the best action found in the node
+        """
+        if self.transposition_table is None:
+            return
+
+        if score <= alpha:
+            bound = BoundType.UPPER
+        elif score >= beta:
+            bound = BoundType.LOWER
+        else:
+            bound = BoundType.EXACT
+
+        self.transposition_table.store(node.zobrist_hash, depth, draft, score, bound, best_action, self.root_turn)
+
+    def opponent_loose(self, node: BattleStatus) -> bool:
+        """
+        Checks whether the opponent player is defeated
+        :param node: a node representing a game state
+        :return: a boolean indicating whether the opponent player is defeated
+        """
+        return node.opp_poke.is_fainted() and len(node.opp_poke_avail_actions(self.max_switches)) == 0
+
+    def player_loose(self, node: BattleStatus) -> bool:
+        """
+        Checks whether our player is defeated
+        :param node: a node representing a game state
+        :return: a boolean indicating whether our player is defeated
+        """
+        return node.act_poke.is_fainted() and len(node.act_poke_avail_actions(self.max_switches)) == 0
+
+    def is_terminal_node(self, node: BattleStatus) -> bool:
+        """
+        Check if a node is a terminal node
+        :param node: a node representing a game state
+        :return: a boolean indicating whether a node is a terminal one
+        """
+        return self.player_loose(node) or self.opponent_loose(node)
+
+
+# Search of the worker process, it is instantiated once when the process starts
+__worker_search: Optional[MiniMaxSearch] = None
+
+
+def init_search_worker(heuristic: Heuristic, configuration: SearchConfiguration):
+    """
+    Instantiates the search of a worker process of the parallel search
+    :param heuristic: the heuristic used to evaluate the leaves
+    :param configuration: the options of the worker search
+    """
+    global __worker_search
+    __worker_search = MiniMaxSearch(heuristic, configuration=configuration)
+
+
+def search_root_action(root_battle_status: BattleStatus, action: Move | Pokemon, max_depth: int, alpha: float,
+                       time_left: Optional[float], max_nodes: Optional[int] = None,
+                       max_memory: Optional[int] = None) -> Tuple[Optional[float], SearchStatistics]:
+    """
+    Searches an action of the root in a worker process
+    :param root_battle_status: root node of the minimax tree
+    :param action: one of the bot's actions in the root
+    :param max_depth: max depth of the minimax tree
+    :param alpha: best score found so far by the other children of the root
+    :param time_left: seconds left before the deadline of the search, None if there is no deadline
+    :param max_nodes: nodes of the budget of the decision left to this child, None if there is no budget
+    :param max_memory: bytes of the memory budget of the decision left to this worker, None if there is no budget
+    :return: the score of the child, None if the time or one of the budgets was over, and the statistics of the worker
+    search
+    """
+    search = __worker_search
+    search.max_depth = max_depth
+    search.reset_search()
+    if time_left is not None:
+        search.search_deadline = time.perf_counter() + time_left
+    search.max_nodes, search.max_memory = max_nodes, max_memory
+    if max_nodes is not None or max_memory is not None:
+        search.next_budget_check = 0
+
+    try:
+        score = search.search_action(root_battle_status, action, 0, alpha, float('+inf'), True)
+    except SearchTimeout:
+        score = None
+    finally:
+        search.search_deadline = None
+        search.max_nodes, search.max_memory = None, None
+        search.next_budget_check = float('+inf')
+
+    search.search_stats.stop()
+    return score, search.search_stats
@@ -0,0 +1,155 @@
+from typing import List, Dict, Tuple, Optional
+from poke_env.environment import Move, Pokemon
+from src.minimax.BattleStatus import BattleStatus
+
+# Number of killer actions remembered for each ply
+KILLER_SLOTS = 2
+
+
+def action_key(action: Move | Pokemon) -> str:
+    """
+    Computes a key that identifies an action between different nodes of the minimax tree
+    :param action: a move or a Pokémon to switch
+    :return: the key of the action
+    """
+    return action.species if isinstance(action, Pokemon) else action.id
+
+
+def find_action(action: Move | Pokemon, actions: List[Move | Pokemon]) -> Optional[Move | Pokemon]:
+    """
+    Finds an action among the actions of a node, the action may come from a search that worked on copies of the moves
+    and the Pokémon, so it is matched by key if it is not one of them
+    :param action: the action to find
+    :param actions: available actions of the node
+    :return: the action of the node with the same key, None if there isn't any
+    """
+    if action in actions:
+        return action
+
+    key = action_key(action)
+    for candidate in actions:
+        if action_key(candidate) == key:
+            return candidate
+
+    return None
+
+
+class MoveOrdering:
+
+    def __init__(self, use_heuristics: bool = True):
+        """
+        Instantiate the move ordering of the minimax search. The actions of a node are sorted by: the action of the
+        previous principal variation, the best action stored in the transposition table, the moves that knock out the
+        defender, the killer actions of the ply, the history score and finally the damage they deal
+        :param use_heuristics: if false only the principal variation and the transposition table are used
+        """
+        self.use_heuristics: bool = use_heuristics
+        self.principal_variation: List[Move | Pokemon] = []
+        self.follow_pv: bool = False
+        self.killers: List[List[str]] = []
+        self.history: Dict[Tuple[bool, str], int] = dict()
+        self.damage_cache: Dict[Tuple, int] = dict()
+
+    def reset(self):
+        """
+        Forgets everything that was learnt during the previous search
+        """
+        self.principal_variation = []
+        self.follow_pv = False
+        self.killers = []
+        self.history = dict()
+        self.damage_cache = dict()
+
+    def reroot(self, plies: int, principal_variation: List[Move | Pokemon]):
+        """
+        Keeps what was learnt during the previous search for a search that starts some plies below its root. The
+        killer actions are moved up by the same number of plies and the history is halved, so that the new cutoffs
+        count more than the old ones. The damage is estimated again, since the Pokémon may have changed
+        :param plies: number of actions between the previous root and the new one
+        :param principal_variation: the part of the previous principal variation that starts from the new root, empty
+        if the battle didn't go as predicted
+        """
+        self.principal_variation = principal_variation
+        self.follow_pv = len(principal_variation) > 0
+        self.killers = self.killers[plies:]
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+        self.damage_cache = dict()
+
+    def estimate_damage(self, node: BattleStatus, move: Move, is_my_turn: bool) -> int:
+        """
+        Estimates the damage of a move with the same model used to simulate the actions, the damage only depends on
+        the Pokémon, their boosts and the weather, so it is computed once for each search
+        :param node: node in which the move is used
+        :param move: the move under consideration
+        :param is_my_turn: true if the bot uses the move, false otherwise
+        :return: the estimated damage
+        """
+        key = node.damage_key(move, is_my_turn)
+        damage = self.damage_cache.get(key)
+        if damage is None:
+            damage = node.estimate_damage(move, is_my_turn)
+            self.damage_cache[key] = damage
+
+        return damage
+
+    def order(self, node: BattleStatus, actions: List[Move | Pokemon], ply: int, is_my_turn: bool,
+              tt_move: Optional[Move | Pokemon]) -> List[Move | Pokemon]:
+        """
+        Sorts the actions of a node so that the most promising ones are searched first
+        :param node: the node under consideration
+        :param actions: available actions of the node
+        :param ply: number of actions between the root and the node
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :param tt_move: best action of the node stored in the transposition table
+        :return: the sorted actions
+        """
+        first_actions = []
+        if self.follow_pv:
+            # The principal variation is searched first, so it is left as soon as one of its actions is not available
+            pv_action = find_action(self.principal_variation[ply], actions) \
+                if ply < len(self.principal_variation) else None
+            if pv_action is not None:
+                first_actions.append(pv_action)
+            else:
+                self.follow_pv = False
+
+        tt_action = find_action(tt_move, actions) if tt_move is not None else None
+        if tt_action is not None and tt_action not in first_actions:
+            first_actions.append(tt_action)
+
+        other_actions = [action for action in actions if action not in first_actions]
+        if self.use_heuristics and len(other_actions) > 1:
+            killers = self.killers[ply] if ply < len(self.killers) else []
+            defender = node.opp_poke if is_my_turn else node.act_poke
+
+            def sort_key(action: Move | Pokemon) -> Tuple[bool, bool, int, int]:
+                key = action_key(action)
+                damage = self.estimate_damage(node, action, is_my_turn) if isinstance(action, Move) else 0
+                return damage >= defender.current_hp, key in killers, self.history.get((is_my_turn, key), 0), damage
+
+            other_actions.sort(key=sort_key, reverse=True)
+
+        return first_actions + other_actions
+
+    def update(self, action: Move | Pokemon, ply: int, is_my_turn: bool, draft: int):
+        """
+        Updates the killer actions and the history table with an action that caused a cutoff
+        :param action: the action that caused the cutoff
+        :param ply: number of actions between the root and the node
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :param draft: number of plies searched below the node
+        """
+        if not self.use_heuristics:
+            return
+
+        key = action_key(action)
+        while len(self.killers) <= ply:
+            self.killers.append([])
+
+        killers = self.killers[ply]
+        if key not in killers:
+            killers.insert(0, key)
+            del killers[KILLER_SLOTS:]
+
+        # Cutoffs close to the root prune larger subtrees, so they weigh more
+        self.history[(is_my_turn, key)] = self.history.get((is_my_turn, key), 0) + draft * draft
@@ -1,11 +1,13 @@
+import copy
 from typing import List, Dict
 from poke_env.environment import Pokemon, Move, MoveCategory, Weather, Field, Status
 from src.engine.useful_data import DEFAULT_MOVES_IDS
 from src.engine.stats import estimate_stat, compute_stat_modifiers, compute_stat_boost
-import copy
 
 
 class NodePokemon:
+    # A node only holds the fields that can change during the search, everything else is read from the shared Pokémon
+    __slots__ = ("pokemon", "is_act_poke", "current_hp", "max_hp", "boosts", "status", "moves", "effects")
 
     def __init__(self,
                  pokemon: Pokemon,
@@ -29,13 +31,15 @@ class NodePokemon:
         """
 
         self.pokemon: Pokemon = pokemon
-        self.poke = copy.deepcopy(pokemon)
         self.is_act_poke: bool = is_act_poke
 
+        # The opponent's health points are only known as a fraction, so they are simulated on the estimated max hp
+        self.max_hp: int = pokemon.max_hp if is_act_poke else estimate_stat(pokemon, 'hp')
+
         if current_hp is None and is_act_poke:
             current_hp = pokemon.current_hp
         elif current_hp is None and not is_act_poke:
-            current_hp = estimate_stat(pokemon, 'hp') * pokemon.current_hp_fraction
+            current_hp = self.max_hp * pokemon.current_hp_fraction
         elif current_hp < 0:
             current_hp = 0
         self.current_hp: int = current_hp
@@ -82,22 +86,36 @@ class NodePokemon:
               moves: list[Move] = None,
               effects: Dict = None):
         """
-        Clones the current object with the possibility of specifying some custom fields
+        Clones the current object with the possibility of specifying some custom fields. The clone is a copy-on-write
+        view: the fields that are not specified are shared with this object, so they must never be modified in place
         :return: a copy of this object
         """
-        if is_act_poke is None:
-            is_act_poke = self.is_act_poke
+        clone = NodePokemon.__new__(NodePokemon)
+        clone.pokemon = self.pokemon
+        clone.is_act_poke = self.is_act_poke if is_act_poke is None else is_act_poke
+        clone.max_hp = self.max_hp
         if current_hp is None:
             current_hp = self.current_hp
-        if boosts is None:
-            boosts = self.boosts.copy()
-        if status is None:
-            status = self.status
-        if moves is None:
-            moves = self.moves.copy()
-        if effects is None:
-            effects = self.effects.copy()
-        return NodePokemon(self.pokemon, is_act_poke, current_hp, boosts, status, moves, effects)
+        clone.current_hp = current_hp if current_hp > 0 else 0
+        clone.boosts = self.boosts if boosts is None else boosts
+        clone.status = self.status if status is None else status
+        clone.moves = self.moves if moves is None else moves
+        clone.effects = self.effects if effects is None else effects
+        return clone
+
+    def bench_pokemon(self) -> Pokemon:
+        """
+        Creates the Pokémon that goes back to the team when this one is switched out during the search. It keeps the
+        simulated health points and status, while the boosts are cleared as it happens in the game
+        :return: a shallow copy of the Pokémon with the simulated state
+        """
+        pokemon = copy.copy(self.pokemon)
+        pokemon._current_hp = int(self.current_hp) if self.is_act_poke \
+            else self.pokemon.max_hp * self.current_hp / self.max_hp
+        pokemon._status = self.status
+        pokemon._boosts = {stat: 0 for stat in self.pokemon.boosts}
+        pokemon._active = False
+        return pokemon
 
     def retrieve_stats(self, weather: Weather, terrains: List[Field]):
         """
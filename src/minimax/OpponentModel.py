@@ -0,0 +1,84 @@
+import math
+from typing import List, Optional
+from poke_env.environment import Move, Pokemon
+from src.minimax.BattleStatus import BattleStatus
+
+
+class OpponentModel:
+
+    def __init__(self,
+                 top_k: Optional[int] = 2,
+                 damage_weight: float = 2.0,
+                 knockout_weight: float = 2.0,
+                 revealed_weight: float = 1.0,
+                 usage_weight: float = 0.5):
+        """
+        Instantiate the model that predicts the moves of the opponent. The likelihood of a move is a softmax over a
+        linear combination of its features: the fraction of the bot's health points it takes, whether it knocks out the
+        bot's Pokémon, whether the opponent has revealed it and how many times it has been used. The weights are fixed
+        by hand, but they can be fitted on the logs of past battles
+        :param top_k: number of the most likely moves that are searched in the opponent's nodes, None searches them all
+        :param damage_weight: weight of the fraction of the bot's health points taken by the move
+        :param knockout_weight: weight of the moves that knock out the bot's Pokémon
+        :param revealed_weight: weight of the moves revealed by the opponent, the others are the default moves added by
+        the search
+        :param usage_weight: weight of the logarithm of the number of times the move has been used
+        """
+        self.top_k: Optional[int] = top_k
+        self.damage_weight: float = damage_weight
+        self.knockout_weight: float = knockout_weight
+        self.revealed_weight: float = revealed_weight
+        self.usage_weight: float = usage_weight
+
+    def move_logit(self, node: BattleStatus, move: Move, damage: int) -> float:
+        """
+        Computes the unnormalized log-likelihood that the opponent uses a move
+        :param node: the node in which the opponent acts
+        :param move: one of the opponent's moves
+        :param damage: damage dealt by the move to the bot's Pokémon
+        :return: the logit of the move
+        """
+        bot_hp = node.act_poke.current_hp
+        logit = self.damage_weight * min(damage / max(bot_hp, 1), 1)
+        if damage >= bot_hp:
+            logit += self.knockout_weight
+
+        # The default moves are distinct objects, even if the opponent has revealed a move with the same id
+        revealed_move = node.opp_poke.pokemon.moves.get(move.id)
+        if revealed_move is move:
+            logit += self.revealed_weight + self.usage_weight * math.log1p(max(move.max_pp - move.current_pp, 0))
+
+        return logit
+
+    def likelihoods(self, node: BattleStatus, moves: List[Move], damages: List[int]) -> List[float]:
+        """
+        Computes the probability that the opponent uses each of its moves
+        :param node: the node in which the opponent acts
+        :param moves: the opponent's moves
+        :param damages: damage dealt by each move to the bot's Pokémon
+        :return: the probabilities of the moves, they sum to one
+        """
+        logits = [self.move_logit(node, move, damage) for move, damage in zip(moves, damages)]
+        max_logit = max(logits)
+        weights = [math.exp(logit - max_logit) for logit in logits]
+        total = sum(weights)
+        return [weight / total for weight in weights]
+
+    def select(self, node: BattleStatus, actions: List[Move | Pokemon],
+               damages: List[Optional[int]]) -> List[Move | Pokemon]:
+        """
+        Keeps the top_k most likely moves of the opponent, the switches are always kept since their number is already
+        bounded by the search
+        :param node: the node in which the opponent acts
+        :param actions: the opponent's actions
+        :param damages: damage dealt by each action to the bot's Pokémon, None for the switches
+        :return: the actions that are searched, in the same order
+        """
+        move_indices = [i for i, action in enumerate(actions) if isinstance(action, Move)]
+        if self.top_k is None or len(move_indices) <= self.top_k:
+            return actions
+
+        probabilities = self.likelihoods(node, [actions[i] for i in move_indices], [damages[i] for i in move_indices])
+        ranking = sorted(range(len(move_indices)), key=lambda j: probabilities[j], reverse=True)
+        dropped = {move_indices[j] for j in ranking[self.top_k:]}
+        return [action for i, action in enumerate(actions) if i not in dropped]
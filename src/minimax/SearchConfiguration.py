@@ -0,0 +1,89 @@
+from dataclasses import dataclass, replace
+from typing import Optional
+from src.minimax.OpponentModel import OpponentModel
+
+
+@dataclass
+class SearchConfiguration:
+    """
+    Options of the minimax search, they are shared by the player, the worker processes of the parallel search and the
+    search of the next turn, so that a new option is only added here and where it is used
+    :param transposition_table_size: number of slots of the transposition table, 0 or None disables the table
+    :param time_budget_ms: time budget of each decision, if given the search deepens iteratively
+    :param move_ordering: whether the killer, history and damage-based move ordering is enabled
+    :param workers: number of processes that search the children of the root, 1 searches in this process
+    :param chance_nodes: whether the search branches on the accuracy, the damage roll and the critical hits of the
+    moves and averages the outcomes, instead of assuming the worst damage for the bot
+    :param damage_buckets: number of buckets in which the damage rolls are grouped by the chance nodes
+    :param chance_depth: number of turns in which the chance nodes are expanded, in the following ones the moves deal
+    their expected damage
+    :param simultaneous: whether each turn is searched as a simultaneous game between the two players, instead of
+    letting the bot move first
+    :param max_switches: max number of switches of each player expanded in a node, the Pokémon of the team are ranked
+    by their type matchup, 0 searches only the moves
+    :param batch_leaves: whether the leaves below a node are evaluated together by a single call to the heuristic, the
+    leaves after a cutoff are scored as well, so the search visits more nodes
+    :param reuse_tree: whether the transposition table, the move ordering and the principal variation of a turn are
+    kept to warm-start the search of the following one
+    :param ponder: whether the player searches the next turn while the opponent is choosing its action, it implies
+    reuse_tree
+    :param max_nodes: max number of nodes visited by each decision, if given the search deepens iteratively and returns
+    the result of the deepest iteration that completed within the budget
+    :param max_memory: max bytes of search state of each decision, i.e. the transposition table and the caches, if given
+    the search deepens iteratively as with max_nodes. The transposition table takes at most half of it
+    :param pvs: whether the actions after the first one of each node are searched with a null window, and searched
+    again with the full window only if they turn out to be better
+    :param aspiration_window: half width of the window around the score of the previous iteration, or of the previous
+    turn, with which the root is searched. The window is widened if the score falls outside it, None searches the root
+    with the full window
+    :param max_extensions: max number of turns by which a line is searched beyond max_depth, a turn is added when a
+    leaf is reached in which a Pokémon may faint, by a knock out, the recoil of its move or a self-destruct
+    :param reduction_index: position in the sorted actions of a node from which the moves are searched one turn less
+    deep, unless they knock out the defender. If such a move turns out to be better it is searched again at full depth,
+    None disables the reductions
+    :param reduction_ply: min number of actions between the root and a node for its moves to be reduced
+    :param action_pruning: whether the moves of a node that lead to the same state are merged and those that are
+    dominated by another move are dropped before the node is searched
+    :param opponent_model: model that predicts the opponent's moves, only its most likely moves are searched, None
+    searches all of them
+    :param endgame_pokemon: max number of Pokémon left in each team for a position to be solved as an endgame, 0
+    disables the endgame search
+    :param endgame_depth: max depth of the endgame search
+    :param endgame_time_ms: time budget of the endgame search
+    """
+    transposition_table_size: Optional[int] = 2 ** 16
+    time_budget_ms: Optional[int] = None
+    move_ordering: bool = True
+    workers: int = 1
+    chance_nodes: bool = False
+    damage_buckets: int = 3
+    chance_depth: int = 1
+    simultaneous: bool = False
+    max_switches: int = 0
+    batch_leaves: bool = False
+    reuse_tree: bool = False
+    ponder: bool = False
+    max_nodes: Optional[int] = None
+    max_memory: Optional[int] = None
+    pvs: bool = False
+    aspiration_window: Optional[float] = None
+    max_extensions: int = 0
+    reduction_index: Optional[int] = None
+    reduction_ply: int = 2
+    action_pruning: bool = False
+    opponent_model: Optional[OpponentModel] = None
+    endgame_pokemon: int = 0
+    endgame_depth: int = 10
+    endgame_time_ms: int = 1000
+
+    def helper_configuration(self, transposition_table_size: int) -> "SearchConfiguration":
+        """
+        Builds the configuration of the searches that help the one of a decision, i.e. the worker processes and the
+        search of the next turn. They search the tree in the same way in a single process, while the budgets, the
+        deepening, the aspiration windows and the endgames are left to the search of the decision
+        :param transposition_table_size: number of slots of the transposition table of the helper, 0 disables the table
+        :return: the configuration of the helper
+        """
+        return replace(self, transposition_table_size=transposition_table_size, time_budget_ms=None, workers=1,
+                       simultaneous=False, reuse_tree=False, ponder=False, max_nodes=None, max_memory=None,
+                       aspiration_window=None, endgame_pokemon=0)
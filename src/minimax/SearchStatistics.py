@@ -0,0 +1,107 @@
+import time
+
+
+class SearchStatistics:
+
+    def __init__(self):
+        """
+        Instantiate the counters that describe how much work the minimax search has done for a single decision
+        """
+        self.nodes: int = 0
+        self.leaves: int = 0
+        self.interior_nodes: int = 0
+        self.cutoffs: int = 0
+        self.first_move_cutoffs: int = 0
+        self.tt_hits: int = 0
+        self.tt_previous_hits: int = 0
+        self.tt_cutoffs: int = 0
+        self.chance_nodes: int = 0
+        self.chance_cutoffs: int = 0
+        self.re_searches: int = 0
+        self.pruned_actions: int = 0
+        self.completed_depth: int = 0
+        self.start_time: float = time.perf_counter()
+        self.end_time: float = self.start_time
+
+    def reset(self):
+        """
+        Resets all the counters, it should be called before starting a new search
+        """
+        self.nodes = 0
+        self.leaves = 0
+        self.interior_nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_hits = 0
+        self.tt_previous_hits = 0
+        self.tt_cutoffs = 0
+        self.chance_nodes = 0
+        self.chance_cutoffs = 0
+        self.re_searches = 0
+        self.pruned_actions = 0
+        self.completed_depth = 0
+        self.start_time = time.perf_counter()
+        self.end_time = self.start_time
+
+    def merge(self, other: "SearchStatistics"):
+        """
+        Adds the counters of another search, e.g. the one of a worker of the parallel search
+        :param other: the statistics of the other search
+        """
+        self.nodes += other.nodes
+        self.leaves += other.leaves
+        self.interior_nodes += other.interior_nodes
+        self.cutoffs += other.cutoffs
+        self.first_move_cutoffs += other.first_move_cutoffs
+        self.tt_hits += other.tt_hits
+        self.tt_previous_hits += other.tt_previous_hits
+        self.tt_cutoffs += other.tt_cutoffs
+        self.chance_nodes += other.chance_nodes
+        self.chance_cutoffs += other.chance_cutoffs
+        self.re_searches += other.re_searches
+        self.pruned_actions += other.pruned_actions
+
+    def stop(self):
+        """
+        Stops the timer of the search
+        """
+        self.end_time = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """
+        Computes the time spent by the search
+        :return: the elapsed time in seconds
+        """
+        return self.end_time - self.start_time
+
+    def nodes_per_second(self) -> float:
+        """
+        Computes the number of nodes visited each second by the search
+        :return: the nodes per second
+        """
+        elapsed = self.elapsed()
+        return self.nodes / elapsed if elapsed > 0 else 0
+
+    def cutoff_rate(self) -> float:
+        """
+        Computes the fraction of expanded nodes in which a cutoff happened
+        :return: the cutoff rate
+        """
+        return self.cutoffs / self.interior_nodes if self.interior_nodes > 0 else 0
+
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Computes the fraction of cutoffs caused by the first action searched, the closer to 1 the better the move
+        ordering is
+        :return: the first move cutoff rate
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs > 0 else 0
+
+    def __str__(self):
+        return "nodes: {0}, leaves: {1}, cutoff rate: {2:.2f}, first move cutoffs: {3:.2f}, tt hits: {4} " \
+               "({5} from previous turns), tt cutoffs: {6}, chance nodes: {7}, chance cutoffs: {8}, " \
+               "re-searches: {9}, pruned actions: {10}, depth: {11}, time: {12:.3f}s, nodes/s: {13:.0f}"\
+            .format(self.nodes, self.leaves, self.cutoff_rate(), self.first_move_cutoff_rate(), self.tt_hits,
+                    self.tt_previous_hits, self.tt_cutoffs, self.chance_nodes, self.chance_cutoffs, self.re_searches,
+                    self.pruned_actions, self.completed_depth,
+                    self.elapsed(), self.nodes_per_second())
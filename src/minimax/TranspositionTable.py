@@ -0,0 +1,265 @@
+import random
+import struct
+import sys
+from enum import Enum
+from typing import Dict, List, Tuple, Optional, Hashable
+from poke_env.environment import Move, Pokemon, Weather, Field
+
+# The random keys are generated from a fixed seed, so that the hashes are the same between different runs
+__ZOBRIST_RANDOM = random.Random(8080435)
+__ZOBRIST_KEYS: Dict[Tuple, int] = dict()
+
+
+def zobrist_key(*feature: Hashable) -> int:
+    """
+    Retrieves the random 64-bit key of a feature of the battle state, the key is generated the first time the feature is
+    seen
+    :param feature: a tuple that identifies the feature, e.g. ("hp", True, 120)
+    :return: the Zobrist key of the feature
+    """
+    key = __ZOBRIST_KEYS.get(feature)
+    if key is None:
+        key = __ZOBRIST_RANDOM.getrandbits(64)
+        __ZOBRIST_KEYS[feature] = key
+
+    return key
+
+
+def pokemon_hash(poke, is_act_poke: bool) -> int:
+    """
+    Computes the hash of the features of a node Pokémon that can change during the search
+    :param poke: a node representing the attributes of a Pokémon
+    :param is_act_poke: true if it is the bot's Pokémon, false otherwise
+    :return: the hash of the Pokémon
+    """
+    poke_hash = zobrist_key("species", is_act_poke, poke.pokemon.species)
+    poke_hash ^= zobrist_key("hp", is_act_poke, int(poke.current_hp))
+    poke_hash ^= zobrist_key("status", is_act_poke, poke.status)
+    for stat, boost in poke.boosts.items():
+        if boost != 0:
+            poke_hash ^= zobrist_key("boost", is_act_poke, stat, boost)
+
+    return poke_hash
+
+
+def pokemon_hash_delta(old_poke, new_poke, is_act_poke: bool) -> int:
+    """
+    Computes the value to xor to a hash in order to replace a node Pokémon with an updated one. Only the fields that are
+    different between the two nodes are considered
+    :param old_poke: the node Pokémon before the action
+    :param new_poke: the node Pokémon after the action
+    :param is_act_poke: true if it is the bot's Pokémon, false otherwise
+    :return: the hash delta
+    """
+    if old_poke is new_poke:
+        return 0
+
+    if old_poke.pokemon is not new_poke.pokemon:
+        return pokemon_hash(old_poke, is_act_poke) ^ pokemon_hash(new_poke, is_act_poke)
+
+    delta = pokemon_state_delta(old_poke.current_hp, new_poke.current_hp, old_poke.boosts, new_poke.boosts,
+                                is_act_poke)
+    if old_poke.status != new_poke.status:
+        delta ^= zobrist_key("status", is_act_poke, old_poke.status)
+        delta ^= zobrist_key("status", is_act_poke, new_poke.status)
+
+    return delta
+
+
+def pokemon_state_delta(old_hp: int, new_hp: int, old_boosts: Dict[str, int], new_boosts: Dict[str, int],
+                        is_act_poke: bool) -> int:
+    """
+    Computes the value to xor to a hash when the health points and the boosts of a Pokémon change
+    :param old_hp: health points before the action
+    :param new_hp: health points after the action
+    :param old_boosts: boosts before the action
+    :param new_boosts: boosts after the action
+    :param is_act_poke: true if it is the bot's Pokémon, false otherwise
+    :return: the hash delta
+    """
+    delta = 0
+    if int(old_hp) != int(new_hp):
+        delta ^= zobrist_key("hp", is_act_poke, int(old_hp))
+        delta ^= zobrist_key("hp", is_act_poke, int(new_hp))
+
+    if old_boosts is not new_boosts:
+        for stat, boost in new_boosts.items():
+            old_boost = old_boosts[stat]
+            if old_boost != boost:
+                if old_boost != 0:
+                    delta ^= zobrist_key("boost", is_act_poke, stat, old_boost)
+                if boost != 0:
+                    delta ^= zobrist_key("boost", is_act_poke, stat, boost)
+
+    return delta
+
+
+def weather_hash(weather: Dict[Weather, int]) -> int:
+    """
+    Computes the hash of the weather and the number of turns it has been active
+    :param weather: the active weather
+    :return: the hash of the weather
+    """
+    weather_key = 0
+    for active_weather, turns in weather.items():
+        weather_key ^= zobrist_key("weather", active_weather, turns)
+
+    return weather_key
+
+
+def field_hash(terrains: List[Field]) -> int:
+    """
+    Computes the hash of the active terrains
+    :param terrains: the active terrains
+    :return: the hash of the terrains
+    """
+    field_key = 0
+    for terrain in terrains:
+        field_key ^= zobrist_key("terrain", terrain)
+
+    return field_key
+
+
+def team_hash(team: List[Pokemon], is_act_poke: bool) -> int:
+    """
+    Computes the hash of the Pokémon that are left in a team, since the Pokémon switched out during the search go back
+    to the team, their health points are part of the hash
+    :param team: a team
+    :param is_act_poke: true if it is the bot's team, false otherwise
+    :return: the hash of the team
+    """
+    team_key = zobrist_key("team", is_act_poke, len(team))
+    for pokemon in team:
+        team_key ^= zobrist_key("bench", is_act_poke, pokemon.species, round(pokemon.current_hp_fraction, 2))
+
+    return team_key
+
+
+def context_hash(act_poke, opp_poke, avail_switches: List[Pokemon], opp_team: List[Pokemon],
+                 opp_conditions: List) -> int:
+    """
+    Computes the hash of what can't change during a search but may change between two turns, e.g. the moves revealed by
+    the opponent, so that the entries stored in the previous turns are found only if the battle is still the same
+    :param act_poke: the bot's node Pokémon
+    :param opp_poke: the opponent's node Pokémon
+    :param avail_switches: the bot's team
+    :param opp_team: the opponent's team
+    :param opp_conditions: the conditions on the opponent field
+    :return: the hash of the context
+    """
+    context_key = 0
+    for condition in opp_conditions:
+        context_key ^= zobrist_key("condition", condition)
+
+    for poke, is_act_poke in [(act_poke, True), (opp_poke, False)]:
+        context_key ^= zobrist_key("active", is_act_poke, poke.pokemon.species, poke.pokemon.item, poke.pokemon.ability)
+        for move in poke.moves:
+            context_key ^= zobrist_key("active move", is_act_poke, move.id)
+
+    for team, is_act_poke in [(avail_switches, True), (opp_team, False)]:
+        for pokemon in team:
+            context_key ^= zobrist_key("member", is_act_poke, pokemon.species, pokemon.item, pokemon.ability)
+            for move_id in pokemon.moves:
+                context_key ^= zobrist_key("member move", is_act_poke, pokemon.species, move_id)
+
+    return context_key
+
+
+# Key that is xored whenever the player to move changes
+SIDE_TO_MOVE_KEY = zobrist_key("opponent to move")
+
+
+class BoundType(Enum):
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+class TranspositionEntry:
+    __slots__ = ("key", "depth", "draft", "score", "bound", "best_move", "turn")
+
+    def __init__(self, key: int, depth: int, draft: int, score: float, bound: BoundType,
+                 best_move: Optional[Move | Pokemon], turn: int = 0):
+        """
+        Instantiate an entry of the transposition table
+        :param key: the full hash of the battle state
+        :param depth: depth of the minimax tree at which the state was searched
+        :param draft: number of plies that were searched below the state
+        :param score: the score of the state
+        :param bound: whether the score is exact, a lower bound or an upper bound
+        :param best_move: the best action found in the state
+        :param turn: turn of the battle in which the root of the search was
+        """
+        self.key: int = key
+        self.depth: int = depth
+        self.draft: int = draft
+        self.score: float = score
+        self.bound: BoundType = bound
+        self.best_move: Optional[Move | Pokemon] = best_move
+        self.turn: int = turn
+
+
+# Approximate bytes taken by an entry of the table, with its key and its score, and by each slot of the table
+ENTRY_BYTES = sys.getsizeof(TranspositionEntry(2 ** 63, 0, 0, 0.0, BoundType.EXACT, None)) + sys.getsizeof(2 ** 63) \
+              + sys.getsizeof(0.0)
+SLOT_BYTES = struct.calcsize("P")
+
+
+class TranspositionTable:
+
+    def __init__(self, size: int = 2 ** 16):
+        """
+        Instantiate a bounded transposition table, each hash maps to a single slot and an entry is replaced only by the
+        ones that were searched at least as deep or in a later turn
+        :param size: number of slots of the table
+        """
+        self.size: int = size
+        self.entries: List[Optional[TranspositionEntry]] = [None] * size
+        self.stored: int = 0
+
+    def clear(self):
+        """
+        Removes all the entries from the table
+        """
+        self.entries = [None] * self.size
+        self.stored = 0
+
+    def memory(self) -> int:
+        """
+        Estimates the memory taken by the table, the slots are allocated at once while the entries are added over time
+        :return: the approximate size of the table in bytes
+        """
+        return self.size * SLOT_BYTES + self.stored * ENTRY_BYTES
+
+    def lookup(self, key: int) -> Optional[TranspositionEntry]:
+        """
+        Retrieves the entry of a battle state
+        :param key: the hash of the battle state
+        :return: the entry if the state is stored in the table, None otherwise
+        """
+        entry = self.entries[key % self.size]
+        if entry is not None and entry.key == key:
+            return entry
+
+        return None
+
+    def store(self, key: int, depth: int, draft: int, score: float, bound: BoundType,
+              best_move: Optional[Move | Pokemon], turn: int = 0):
+        """
+        Stores the result of a search in the table, by following the replace-by-depth scheme. The entries of the
+        previous turns are kept to warm-start the search, but they are the first to be replaced
+        :param key: the hash of the battle state
+        :param depth: depth of the minimax tree at which the state was searched
+        :param draft: number of plies that were searched below the state
+        :param score: the score of the state
+        :param bound: whether the score is exact, a lower bound or an upper bound
+        :param best_move: the best action found in the state
+        :param turn: turn of the battle in which the root of the search is
+        """
+        index = key % self.size
+        entry = self.entries[index]
+        if entry is None:
+            self.stored += 1
+
+        if entry is None or entry.key == key or entry.turn < turn or draft >= entry.draft:
+            self.entries[index] = TranspositionEntry(key, depth, draft, score, bound, best_move, turn)
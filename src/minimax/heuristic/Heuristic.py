@@ -1,4 +1,11 @@
 from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Tuple, Optional
+import numpy as np
+
+# Columns of the leaf features scored by compute_batch
+BOT_HP, TEAM_HP, ALIVE_TEAM, OPP_HP, OPP_TEAM, DEPTH = range(6)
+FEATURES_NUM = 6
 
 
 class Heuristic(ABC):
@@ -12,3 +19,75 @@ class Heuristic(ABC):
     @abstractmethod
     def compute(self, battle_node, depth: int) -> float:
         pass
+
+    def compute_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluates many leaves at once, it gives the same scores of compute. By default each leaf is rebuilt from its
+        features and scored by compute, the heuristics override it to score the whole matrix with array operations
+        :param features: matrix with a row of features for each leaf, as returned by leaf_features
+        :return: the scores of the leaves
+        """
+        return np.array([self.compute(leaf_from_features(row), int(row[DEPTH])) for row in features], dtype=float)
+
+    @staticmethod
+    def leaf_features(battle_node, depth: int) -> Tuple[float, float, int, float, int, int]:
+        """
+        Extracts from a node the features used by the heuristics, so that the node can be evaluated later in a batch
+        even if it has been modified in the meantime
+        :param battle_node: minimax node containing the state information
+        :param depth: depth of the node in the minimax tree
+        :return: the hp fraction of the bot's Pokémon, the sum of the hp fractions of the bot's team, the number of the
+        bot's Pokémon that are alive, the hp fraction of the opponent's Pokémon, the number of the opponent's Pokémon
+        that are not known to be fainted and the depth
+        """
+        bot_hp = battle_node.act_poke.current_hp / battle_node.act_poke.max_hp
+        team_hp = bot_hp
+        for poke in battle_node.avail_switches:
+            team_hp += poke.current_hp_fraction
+
+        alive_team = len(battle_node.avail_switches)
+        if not battle_node.act_poke.is_fainted():
+            alive_team += 1
+
+        opp_hp = battle_node.opp_poke.current_hp / battle_node.opp_poke.max_hp
+        opp_team_len = 6 - len([pokemon for pokemon in battle_node.opp_team if pokemon.fainted])
+        return bot_hp, team_hp, alive_team, opp_hp, opp_team_len, depth
+
+    def score_bounds(self, min_depth: int, max_depth: int) -> Tuple[float, float]:
+        """
+        Computes the lowest and the highest score that the heuristic can give to the nodes between two depths, they
+        are used to prune the chance nodes of the search. Unbounded heuristics return infinite bounds
+        :param min_depth: lowest depth of the nodes
+        :param max_depth: highest depth of the nodes
+        :return: the lower and upper bound of the score
+        """
+        return float('-inf'), float('+inf')
+
+    def rebase_score(self, score: float, turns: int) -> Optional[float]:
+        """
+        Computes the score that a node would get if it was searched some turns closer to the root, with the same number
+        of turns below it. It lets the search reuse the scores stored in the previous turns
+        :param score: the score of the node
+        :param turns: how many turns closer to the root the node is
+        :return: the rebased score, None if the heuristic can't rebase its scores
+        """
+        return None
+
+
+def leaf_from_features(features: np.ndarray) -> SimpleNamespace:
+    """
+    Rebuilds a leaf from its features, with the same hp fractions, alive Pokémon and fainted opponents. The hp of the
+    bot's team is split evenly between the Pokémon that can switch in, so only the heuristics that use the features of
+    leaf_features score it as the original leaf
+    :param features: the features of the leaf, as returned by leaf_features
+    :return: an object with the attributes of a minimax node read by the heuristics
+    """
+    bot_hp, team_hp, alive_team, opp_hp, opp_team_len = features[:DEPTH].tolist()
+    bot_alive = bot_hp > 0
+    switches = int(alive_team) - int(bot_alive)
+    switch_hp = (team_hp - bot_hp) / switches if switches > 0 else 0
+    return SimpleNamespace(
+        act_poke=SimpleNamespace(current_hp=bot_hp, max_hp=1, is_fainted=lambda: not bot_alive),
+        avail_switches=[SimpleNamespace(current_hp_fraction=switch_hp) for _ in range(switches)],
+        opp_poke=SimpleNamespace(current_hp=opp_hp, max_hp=1, is_fainted=lambda: opp_hp <= 0),
+        opp_team=[SimpleNamespace(fainted=True) for _ in range(6 - int(opp_team_len))])
@@ -1,5 +1,6 @@
-from src.minimax.heuristic.Heuristic import Heuristic
-from src.engine.stats import estimate_stat
+from typing import Tuple, Optional
+from src.minimax.heuristic.Heuristic import Heuristic, OPP_HP
+import numpy as np
 
 
 class OpponentHPHeuristic(Heuristic):
@@ -12,6 +13,32 @@ class OpponentHPHeuristic(Heuristic):
         :return: evaluation score of the minimax node
         """
         opp_hp = battle_node.opp_poke.current_hp
-        opp_max_hp = estimate_stat(battle_node.opp_poke.pokemon, "hp")
+        opp_max_hp = battle_node.opp_poke.max_hp
 
         return - (opp_hp / opp_max_hp)
+
+    def compute_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluate many states at once using only the opponent's Pokèmon health points
+        :param features: matrix with a row of features for each leaf
+        :return: evaluation scores of the leaves
+        """
+        return - features[:, OPP_HP]
+
+    def score_bounds(self, min_depth: int, max_depth: int) -> Tuple[float, float]:
+        """
+        The score is the opposite of the hp fraction of the opponent's Pokémon
+        :param min_depth: lowest depth of the nodes
+        :param max_depth: highest depth of the nodes
+        :return: the lower and upper bound of the score
+        """
+        return -1, 0
+
+    def rebase_score(self, score: float, turns: int) -> Optional[float]:
+        """
+        The score doesn't depend on the depth, so it is the same at any depth
+        :param score: the score of the node
+        :param turns: how many turns closer to the root the node is
+        :return: the rebased score
+        """
+        return score
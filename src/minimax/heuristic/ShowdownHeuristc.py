@@ -1,6 +1,7 @@
+from typing import Tuple, Optional
 from src.minimax.BattleStatus import BattleStatus
-from src.minimax.heuristic.Heuristic import Heuristic
-from src.engine.stats import estimate_stat
+from src.minimax.heuristic.Heuristic import Heuristic, BOT_HP, OPP_HP, DEPTH
+import numpy as np
 
 
 class ShowdownHeuristic(Heuristic):
@@ -15,7 +16,33 @@ class ShowdownHeuristic(Heuristic):
         """
         bot_hp = battle_node.act_poke.current_hp
         opp_hp = battle_node.opp_poke.current_hp
-        opp_max_hp = estimate_stat(battle_node.opp_poke.pokemon, "hp")
-        score = (bot_hp / battle_node.act_poke.pokemon.max_hp) - 3 * (opp_hp / opp_max_hp) - 0.3 * depth
+        opp_max_hp = battle_node.opp_poke.max_hp
+        score = (bot_hp / battle_node.act_poke.max_hp) - 3 * (opp_hp / opp_max_hp) - 0.3 * depth
 
         return score
+
+    def compute_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluate many states at once with the same function of compute
+        :param features: matrix with a row of features for each leaf
+        :return: evaluation scores of the leaves
+        """
+        return features[:, BOT_HP] - 3 * features[:, OPP_HP] - 0.3 * features[:, DEPTH]
+
+    def score_bounds(self, min_depth: int, max_depth: int) -> Tuple[float, float]:
+        """
+        The hp fractions range from 0 to 1 and the depth penalty grows with the depth
+        :param min_depth: lowest depth of the nodes
+        :param max_depth: highest depth of the nodes
+        :return: the lower and upper bound of the score
+        """
+        return -3 - 0.3 * max_depth, 1 - 0.3 * min_depth
+
+    def rebase_score(self, score: float, turns: int) -> Optional[float]:
+        """
+        The depth penalty is linear, so each turn closer to the root removes 0.3 from it
+        :param score: the score of the node
+        :param turns: how many turns closer to the root the node is
+        :return: the rebased score
+        """
+        return score + 0.3 * turns
@@ -1,6 +1,7 @@
+from typing import Tuple, Optional
 from src.minimax.BattleStatus import BattleStatus
-from src.minimax.heuristic.Heuristic import Heuristic
-from src.engine.stats import estimate_stat
+from src.minimax.heuristic.Heuristic import Heuristic, BOT_HP, OPP_HP
+import numpy as np
 
 
 class SimpleHeuristic(Heuristic):
@@ -14,8 +15,34 @@ class SimpleHeuristic(Heuristic):
         """
         bot_hp = battle_node.act_poke.current_hp
         opp_hp = battle_node.opp_poke.current_hp
-        opp_max_hp = estimate_stat(battle_node.opp_poke.pokemon, "hp")
-        score = (bot_hp / battle_node.act_poke.pokemon.max_hp) - (
+        opp_max_hp = battle_node.opp_poke.max_hp
+        score = (bot_hp / battle_node.act_poke.max_hp) - (
                 opp_hp / opp_max_hp)
 
         return score
+
+    def compute_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluate many states at once using only the hp fractions of the two active Pokémon
+        :param features: matrix with a row of features for each leaf
+        :return: evaluation scores of the leaves
+        """
+        return features[:, BOT_HP] - features[:, OPP_HP]
+
+    def score_bounds(self, min_depth: int, max_depth: int) -> Tuple[float, float]:
+        """
+        The score is the difference between the hp fractions of the two active Pokémon
+        :param min_depth: lowest depth of the nodes
+        :param max_depth: highest depth of the nodes
+        :return: the lower and upper bound of the score
+        """
+        return -1, 1
+
+    def rebase_score(self, score: float, turns: int) -> Optional[float]:
+        """
+        The score doesn't depend on the depth, so it is the same at any depth
+        :param score: the score of the node
+        :param turns: how many turns closer to the root the node is
+        :return: the rebased score
+        """
+        return score
@@ -1,7 +1,6 @@
-from typing import List
+from typing import List, Tuple, Optional
 from src.minimax.BattleStatus import BattleStatus
-from src.minimax.heuristic.Heuristic import Heuristic
-from src.engine.stats import estimate_stat
+from src.minimax.heuristic.Heuristic import Heuristic, TEAM_HP, ALIVE_TEAM, OPP_HP, OPP_TEAM, DEPTH, FEATURES_NUM
 import numpy as np
 
 # Best parameters obtained by random search
@@ -18,6 +17,11 @@ class TeamHeuristic(Heuristic):
         self.parameters = np.array(self.parameters)
         self.penalty: float = penalty
 
+        # The score is linear in the leaf features, so a batch of leaves is scored by a single matrix product
+        b1, b2, m1, m2 = self.parameters
+        self.weights: np.ndarray = np.zeros(FEATURES_NUM)
+        self.weights[[TEAM_HP, ALIVE_TEAM, OPP_HP, OPP_TEAM, DEPTH]] = [b1 / 6, b2 / 6, -m1, -m2 / 6, -penalty]
+
     def compute(self, battle_node: BattleStatus, depth: int) -> float:
         """
         Evaluate state in the minimax algorithm using all the knowledge about the bot team and the opponent team
@@ -26,7 +30,7 @@ class TeamHeuristic(Heuristic):
         :return: evaluation score of the minimax node
         """
         bot_hp = battle_node.act_poke.current_hp
-        bot_max_hp = battle_node.act_poke.pokemon.max_hp
+        bot_max_hp = battle_node.act_poke.max_hp
         team_hp = bot_hp / bot_max_hp
         for poke in battle_node.avail_switches:
             team_hp += poke.current_hp_fraction
@@ -36,7 +40,7 @@ class TeamHeuristic(Heuristic):
             alive_team += 1
 
         opp_hp = battle_node.opp_poke.current_hp
-        opp_max_hp = estimate_stat(battle_node.opp_poke.pokemon, "hp")
+        opp_max_hp = battle_node.opp_poke.max_hp
         opp_team_len = 6 - len([pokemon for pokemon in battle_node.opp_team if pokemon.fainted])
         b1 = self.parameters[0]
         b2 = self.parameters[1]
@@ -48,3 +52,33 @@ class TeamHeuristic(Heuristic):
                 opp_team_len / 6) - p1 * depth
 
         return score
+
+    def compute_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluate many states at once with the same function of compute
+        :param features: matrix with a row of features for each leaf
+        :return: evaluation scores of the leaves
+        """
+        return features @ self.weights
+
+    def score_bounds(self, min_depth: int, max_depth: int) -> Tuple[float, float]:
+        """
+        Each term of the score is a fraction multiplied by a parameter, so its bounds depend on the parameter sign
+        :param min_depth: lowest depth of the nodes
+        :param max_depth: highest depth of the nodes
+        :return: the lower and upper bound of the score
+        """
+        b1, b2, m1, m2 = self.parameters
+        terms = [(0, b1), (0, b2), (0, -m1), (0, -m2), (-self.penalty * min_depth, -self.penalty * max_depth)]
+        lower = sum(min(term) for term in terms)
+        upper = sum(max(term) for term in terms)
+        return float(lower), float(upper)
+
+    def rebase_score(self, score: float, turns: int) -> Optional[float]:
+        """
+        The depth penalty is linear, so each turn closer to the root removes the penalty once
+        :param score: the score of the node
+        :param turns: how many turns closer to the root the node is
+        :return: the rebased score
+        """
+        return score + self.penalty * turns
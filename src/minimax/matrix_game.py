@@ -0,0 +1,74 @@
+import numpy as np
+from typing import Tuple
+
+# Tolerance used by the simplex to compare the entries of the tableau with zero
+EPSILON = 1e-9
+
+
+def solve_matrix_game(payoffs: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Solves a two-player zero-sum game in which the row player maximizes the payoff and the column player minimizes it.
+    Games with a saddle point are solved directly, the others with the simplex method
+    :param payoffs: matrix of the payoffs of the row player
+    :return: value of the game, mixed strategy of the row player and mixed strategy of the column player
+    """
+    rows, cols = payoffs.shape
+    row_mins = payoffs.min(axis=1)
+    col_maxs = payoffs.max(axis=0)
+    best_row = int(np.argmax(row_mins))
+    best_col = int(np.argmin(col_maxs))
+
+    # If the best worst case of both players is the same, the game is solved by pure strategies
+    if row_mins[best_row] >= col_maxs[best_col] - EPSILON:
+        row_strategy = np.zeros(rows)
+        col_strategy = np.zeros(cols)
+        row_strategy[best_row] = 1
+        col_strategy[best_col] = 1
+        return float(row_mins[best_row]), row_strategy, col_strategy
+
+    return __solve_with_simplex(payoffs)
+
+
+def __solve_with_simplex(payoffs: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Solves a zero-sum game as the linear program max sum(y) s.t. A y <= 1, y >= 0, where A are the payoffs shifted to
+    be positive. The solution y is the strategy of the column player, while the one of the row player is read from the
+    reduced costs of the slack variables. Bland's rule is used to choose the pivots, so that the method doesn't cycle
+    :param payoffs: matrix of the payoffs of the row player
+    :return: value of the game, mixed strategy of the row player and mixed strategy of the column player
+    """
+    rows, cols = payoffs.shape
+    shift = 1 - payoffs.min()
+
+    # Tableau made up of the constraints [A | I | 1] and of the objective row [-1 | 0 | 0]
+    tableau = np.zeros((rows + 1, cols + rows + 1))
+    tableau[:rows, :cols] = payoffs + shift
+    tableau[:rows, cols:cols + rows] = np.eye(rows)
+    tableau[:rows, -1] = 1
+    tableau[rows, :cols] = -1
+    basis = list(range(cols, cols + rows))
+
+    while True:
+        entering = np.flatnonzero(tableau[rows, :-1] < -EPSILON)
+        if len(entering) == 0:
+            break
+
+        col = entering[0]
+        ratios = [(tableau[row, -1] / tableau[row, col], basis[row], row) for row in range(rows)
+                  if tableau[row, col] > EPSILON]
+        _, _, pivot_row = min(ratios)
+
+        tableau[pivot_row] /= tableau[pivot_row, col]
+        for row in range(rows + 1):
+            if row != pivot_row and tableau[row, col] != 0:
+                tableau[row] -= tableau[row, col] * tableau[pivot_row]
+        basis[pivot_row] = col
+
+    total = tableau[rows, -1]
+    col_strategy = np.zeros(cols)
+    for row, variable in enumerate(basis):
+        if variable < cols:
+            col_strategy[variable] = tableau[row, -1]
+
+    row_strategy = tableau[rows, cols:cols + rows].copy()
+    return float(1 / total - shift), row_strategy / total, col_strategy / total
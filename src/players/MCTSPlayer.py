@@ -0,0 +1,334 @@
+from poke_env import PlayerConfiguration, ServerConfiguration
+from poke_env.environment import Move, Pokemon
+from poke_env.teambuilder import Teambuilder
+from src.minimax.BattleStatus import BattleStatus
+from src.minimax.SearchConfiguration import SearchConfiguration
+from src.minimax.heuristic.Heuristic import Heuristic
+from src.minimax.heuristic.SimpleHeuristic import SimpleHeuristic
+from src.minimax.MiniMaxSearch import MiniMaxSearch
+from src.players.MiniMaxPlayer import MiniMaxPlayer
+from typing import Optional, Union, Tuple, List
+import numpy as np
+import math
+import time
+
+
+class MCTSTree:
+    # The nodes are the indices of parallel arrays, so a search doesn't allocate an object for each node
+    __slots__ = ("capacity", "size", "states", "parents", "actions", "is_my_turn", "depths", "first_child",
+                 "last_child", "next_sibling", "untried_actions", "visits", "total_scores")
+
+    def __init__(self, capacity: int):
+        """
+        Instantiate the pool of nodes of the Monte Carlo tree, it is allocated once and reset before each search
+        :param capacity: max number of nodes, each iteration adds at most one node to the tree
+        """
+        self.capacity: int = capacity
+        self.size: int = 0
+        self.states: List[Optional[BattleStatus]] = [None] * capacity
+        self.parents: List[int] = [-1] * capacity
+        self.actions: List[Optional[Move | Pokemon]] = [None] * capacity
+        self.is_my_turn: List[bool] = [False] * capacity
+        self.depths: List[int] = [0] * capacity
+        self.first_child: List[int] = [-1] * capacity
+        self.last_child: List[int] = [-1] * capacity
+        self.next_sibling: List[int] = [-1] * capacity
+        self.untried_actions: List[Optional[List[Move | Pokemon]]] = [None] * capacity
+        self.visits: List[int] = [0] * capacity
+        self.total_scores: List[float] = [0] * capacity
+
+    def reset(self):
+        """
+        Removes all the nodes, the states of the previous search are released so that they can be collected
+        """
+        self.states[:self.size] = [None] * self.size
+        self.actions[:self.size] = [None] * self.size
+        self.untried_actions[:self.size] = [None] * self.size
+        self.size = 0
+
+    def add(self, state: BattleStatus, parent: int, action: Optional[Move | Pokemon], is_my_turn: bool, depth: int,
+            untried_actions: List[Move | Pokemon]) -> int:
+        """
+        Adds a node to the tree as the last child of its parent
+        :param state: the battle state of the node
+        :param parent: index of the parent node, -1 for the root
+        :param action: the action that leads from the parent to the node
+        :param is_my_turn: true if the bot acts in the node, false otherwise
+        :param depth: number of turns between the root and the node
+        :param untried_actions: the actions of the node that have not been expanded yet
+        :return: the index of the new node
+        """
+        node = self.size
+        assert node < self.capacity, "the Monte Carlo tree is full"
+        self.size += 1
+        self.states[node] = state
+        self.parents[node] = parent
+        self.actions[node] = action
+        self.is_my_turn[node] = is_my_turn
+        self.depths[node] = depth
+        self.first_child[node] = -1
+        self.last_child[node] = -1
+        self.next_sibling[node] = -1
+        self.untried_actions[node] = untried_actions
+        self.visits[node] = 0
+        self.total_scores[node] = 0
+        if parent >= 0:
+            if self.first_child[parent] < 0:
+                self.first_child[parent] = node
+            else:
+                self.next_sibling[self.last_child[parent]] = node
+            self.last_child[parent] = node
+
+        return node
+
+    def children(self, node: int) -> List[int]:
+        """
+        Retrieves the children of a node in the order in which they were added
+        :param node: index of the node
+        :return: the indices of the children
+        """
+        children = []
+        child = self.first_child[node]
+        while child >= 0:
+            children.append(child)
+            child = self.next_sibling[child]
+
+        return children
+
+
+class MCTSSearch(MiniMaxSearch):
+
+    def __init__(self, heuristic: Heuristic, max_depth: int, configuration: SearchConfiguration, iterations: int,
+                 exploration: float, batch_size: int):
+        """
+        Instantiate the Monte Carlo Tree Search (UCT) of a battle, it reuses the move ordering, the terminal nodes and
+        the statistics of the minimax search
+        :param heuristic: the heuristic that evaluates the states at the end of the rollouts
+        :param max_depth: number of turns simulated from the root, by the tree and the rollouts together
+        :param configuration: the options of the search, only the time budget and the switches are used
+        :param iterations: max number of iterations of each search
+        :param exploration: exploration constant of the UCB1 formula
+        :param batch_size: number of rollouts whose final states are evaluated together by the heuristic
+        """
+        super(MCTSSearch, self).__init__(heuristic, max_depth, configuration)
+        self.iterations: int = iterations
+        self.exploration: float = exploration
+        self.batch_size: int = batch_size
+
+        # Each iteration expands at most one node, so the pool never holds more than iterations + 1 nodes
+        self.tree: MCTSTree = MCTSTree(iterations + 1)
+
+    def search(self, root_battle_status: BattleStatus) -> Tuple[float, Optional[Move | Pokemon]]:
+        """
+        Runs the iterations of the Monte Carlo Tree Search: selection, expansion, rollout and backpropagation
+        :param root_battle_status: root node from which the search starts
+        :return: a tuple containing the mean score of the most visited action of the root and the action itself
+        """
+        tree = self.tree
+        tree.reset()
+        root = tree.add(root_battle_status, -1, None, True, 0, self.node_actions(root_battle_status, True, 0))
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000
+
+        # The scores are normalized so that the exploration constant doesn't depend on the heuristic
+        lower, upper = self.heuristic.score_bounds(0, self.max_depth)
+        iteration = 0
+        while iteration < self.iterations and (iteration == 0 or deadline is None or time.perf_counter() < deadline):
+            nodes, features = [], []
+            while len(nodes) < self.batch_size and iteration < self.iterations:
+                node = self.select(root, lower, upper)
+                if len(tree.untried_actions[node]) > 0:
+                    node = self.expand(node)
+
+                # Until the batch is evaluated the path counts as lost, so that the next iterations explore elsewhere
+                features.append(self.rollout(node))
+                self.add_virtual_loss(node, lower, upper, 1)
+                nodes.append(node)
+                iteration += 1
+
+            scores = self.heuristic.compute_batch(np.array(features)).tolist()
+            for node, score in zip(nodes, scores):
+                self.add_virtual_loss(node, lower, upper, -1)
+                self.backpropagate(node, score)
+
+        root_children = tree.children(root)
+        if len(root_children) == 0:
+            return root_battle_status.compute_score(self.heuristic, 0), None
+
+        best_child = max(root_children, key=lambda child: tree.visits[child])
+        return tree.total_scores[best_child] / tree.visits[best_child], tree.actions[best_child]
+
+    def node_actions(self, state: BattleStatus, is_my_turn: bool, depth: int) -> List[Move | Pokemon]:
+        """
+        Computes the actions that can be expanded from a state, the states at the horizon are not expanded
+        :param state: the battle state
+        :param is_my_turn: true if the bot acts in the state, false otherwise
+        :param depth: number of turns between the root and the state
+        :return: the actions of the state
+        """
+        if depth >= self.max_depth or self.is_terminal_node(state):
+            return []
+
+        if is_my_turn:
+            return state.act_poke_avail_actions(self.max_switches)
+
+        return state.opp_poke_avail_actions(self.max_switches)
+
+    def select(self, node: int, lower: float, upper: float) -> int:
+        """
+        Descends the tree by following the UCB1 formula until a node that is not fully expanded is reached
+        :param node: the root of the tree
+        :param lower: lower bound of the heuristic scores
+        :param upper: upper bound of the heuristic scores
+        :return: the selected node
+        """
+        tree = self.tree
+        normalize = math.isfinite(lower) and math.isfinite(upper) and upper > lower
+        while len(tree.untried_actions[node]) == 0 and tree.first_child[node] >= 0:
+            log_visits = math.log(tree.visits[node])
+            is_my_turn = tree.is_my_turn[node]
+
+            def ucb(child: int) -> float:
+                mean = tree.total_scores[child] / tree.visits[child]
+                if normalize:
+                    mean = (mean - lower) / (upper - lower)
+                    value = mean if is_my_turn else 1 - mean
+                else:
+                    value = mean if is_my_turn else -mean
+
+                return value + self.exploration * math.sqrt(log_visits / tree.visits[child])
+
+            node = max(tree.children(node), key=ucb)
+
+        return node
+
+    def expand(self, node: int) -> int:
+        """
+        Adds to the tree the child of one of the actions of a node that have not been tried yet
+        :param node: the node to expand
+        :return: the new child
+        """
+        tree = self.tree
+        self.search_stats.nodes += 1
+        action = tree.untried_actions[node].pop(0)
+        is_my_turn = tree.is_my_turn[node]
+        state = tree.states[node].simulate_action(action, is_my_turn)
+
+        # The turn is over after the opponent's action
+        depth = tree.depths[node] if is_my_turn else tree.depths[node] + 1
+        self.search_stats.completed_depth = max(self.search_stats.completed_depth, depth)
+        return tree.add(state, node, action, not is_my_turn, depth, self.node_actions(state, not is_my_turn, depth))
+
+    def rollout(self, node: int) -> Tuple:
+        """
+        Simulates the battle from a node until the horizon, both players use the move that deals the most damage as
+        the BestDamage player does
+        :param node: the node from which the rollout starts
+        :return: the features of the state at the end of the rollout, which are evaluated with the rest of the batch
+        """
+        tree = self.tree
+        self.search_stats.leaves += 1
+        state, is_my_turn, depth = tree.states[node], tree.is_my_turn[node], tree.depths[node]
+        actions = tree.untried_actions[node] + [tree.actions[child] for child in tree.children(node)]
+        while len(actions) > 0:
+            action = max(actions, key=lambda act: self.move_ordering.estimate_damage(state, act, is_my_turn)
+                         if isinstance(act, Move) else 0)
+            state = state.simulate_action(action, is_my_turn)
+            if not is_my_turn:
+                depth += 1
+
+            is_my_turn = not is_my_turn
+            actions = self.node_actions(state, is_my_turn, depth)
+
+        return self.heuristic.leaf_features(state, depth)
+
+    def add_virtual_loss(self, node: int, lower: float, upper: float, sign: int):
+        """
+        Adds or removes a virtual loss along the path from a node to the root: each node gets a visit with the worst
+        score for the player that chose it. Unbounded heuristics only get the visit
+        :param node: the node where the rollout started
+        :param lower: lower bound of the heuristic scores
+        :param upper: upper bound of the heuristic scores
+        :param sign: 1 to add the virtual loss, -1 to remove it
+        """
+        tree = self.tree
+        bounded = math.isfinite(lower) and math.isfinite(upper)
+        parent = tree.parents[node]
+        while parent >= 0:
+            tree.visits[node] += sign
+            if bounded:
+                tree.total_scores[node] += sign * (lower if tree.is_my_turn[parent] else upper)
+            node, parent = parent, tree.parents[parent]
+
+        tree.visits[node] += sign
+
+    def backpropagate(self, node: int, score: float):
+        """
+        Updates the visits and the scores of the nodes from a node up to the root
+        :param node: the node where the rollout started
+        :param score: the score of the rollout
+        """
+        tree = self.tree
+        while node >= 0:
+            tree.visits[node] += 1
+            tree.total_scores[node] += score
+            node = tree.parents[node]
+
+
+class MCTSPlayer(MiniMaxPlayer):
+
+    def __init__(self,
+                 heuristic: Optional[Heuristic] = SimpleHeuristic(),
+                 max_depth: int = 3,
+                 iterations: int = 1000,
+                 time_budget_ms: Optional[int] = None,
+                 exploration: float = math.sqrt(2),
+                 max_switches: int = 0,
+                 batch_size: int = 8,
+                 verbose: bool = False,
+                 player_configuration: Optional[PlayerConfiguration] = None,
+                 *,
+                 avatar: Optional[int] = None,
+                 battle_format: str = "gen8randombattle",
+                 log_level: Optional[int] = None,
+                 max_concurrent_battles: int = 1,
+                 save_replays: Union[bool, str] = False,
+                 server_configuration: Optional[ServerConfiguration] = None,
+                 start_listening: bool = True,
+                 ping_interval: Optional[float] = 20.0,
+                 ping_timeout: Optional[float] = 20.0,
+                 team: Optional[Union[str, Teambuilder]] = None,
+                 ):
+        """
+        Player that chooses its moves with a Monte Carlo Tree Search (UCT) over the simulated battle states, it acts as
+        the minimax player in every other situation, e.g. switches and dynamax
+        :param heuristic: the heuristic that evaluates the states at the end of the rollouts
+        :param max_depth: number of turns simulated from the root, by the tree and the rollouts together
+        :param iterations: max number of iterations of each search
+        :param time_budget_ms: time budget of each search, the search stops at the first limit that is reached
+        :param exploration: exploration constant of the UCB1 formula
+        :param max_switches: max number of switches of each player expanded in a node, 0 searches only the moves
+        :param batch_size: number of rollouts whose final states are evaluated together by the heuristic, the
+        iterations of a batch are kept apart by a virtual loss
+        """
+        super(MCTSPlayer, self).__init__(heuristic=heuristic, max_depth=max_depth, verbose=verbose,
+                                         search_configuration=SearchConfiguration(transposition_table_size=0,
+                                                                                  time_budget_ms=time_budget_ms,
+                                                                                  max_switches=max_switches),
+                                         player_configuration=player_configuration, avatar=avatar,
+                                         battle_format=battle_format, log_level=log_level,
+                                         max_concurrent_battles=max_concurrent_battles, save_replays=save_replays,
+                                         server_configuration=server_configuration, start_listening=start_listening,
+                                         ping_interval=ping_interval, ping_timeout=ping_timeout, team=team)
+        self.iterations: int = iterations
+        self.exploration: float = exploration
+        self.batch_size: int = max(batch_size, 1)
+
+    def create_search(self) -> MiniMaxSearch:
+        """
+        Instantiate the Monte Carlo Tree Search of a new battle
+        :return: the search that chooses the moves of the battle
+        """
+        return MCTSSearch(self.heuristic, self.max_depth, self.configuration, self.iterations, self.exploration,
+                          self.batch_size)
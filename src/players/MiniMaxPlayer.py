@@ -5,6 +5,9 @@ from poke_env.teambuilder import Teambuilder
 from src.minimax.BattleStatus import BattleStatus
 from src.minimax.heuristic.Heuristic import Heuristic
 from src.minimax.NodePokemon import NodePokemon
+from src.minimax.MiniMaxSearch import MiniMaxSearch
+from src.minimax.MoveOrdering import action_key
+from src.minimax.SearchConfiguration import SearchConfiguration
 from src.engine.battle_utilities import *
 from src.engine.stats import compute_stat
 from src.strategy.gimmick import should_dynamax
@@ -13,8 +16,13 @@ from src.strategy.switch import should_switch, compute_best_switch
 from src.minimax.heuristic.SimpleHeuristic import SimpleHeuristic
 from src.utilities import matchups_to_string
 from src.engine.damage import compute_damage
-from typing import Optional, Union, Tuple
+from typing import Optional, Union, Tuple, List, Dict
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import copy
 import math
+import threading
 
 
 class MiniMaxPlayer(Player):
@@ -23,6 +31,7 @@ class MiniMaxPlayer(Player):
                  heuristic: Optional[Heuristic] = SimpleHeuristic(),
                  max_depth: Optional[int] = 2,
                  verbose: bool = False,
+                 search_configuration: Optional[SearchConfiguration] = None,
                  player_configuration: Optional[PlayerConfiguration] = None,
                  *,
                  avatar: Optional[int] = None,
@@ -44,20 +53,40 @@ class MiniMaxPlayer(Player):
                                             start_timer_on_battle_start=True,
                                             start_listening=start_listening,
                                             ping_interval=ping_interval, ping_timeout=ping_timeout, team=team)
+        if search_configuration is None:
+            search_configuration = SearchConfiguration()
         self.heuristic: Heuristic = heuristic
         self.max_depth: int = max_depth
+        self.configuration: SearchConfiguration = search_configuration
         self.verbose: bool = verbose
         self.best_stats_pokemon = 0
         self.previous_pokemon = None
         self.max_team_matchup: int = -8
         self.toxic_turn: int = 0
 
+        # The battles are played concurrently, so each of them has its own search, by battle tag, with its transposition
+        # table and move ordering. They share the processes of the parallel search, which are started by the first
+        # search that needs them
+        self.searches: Dict[str, MiniMaxSearch] = dict()
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+
+        # Action and opponent's Pokémon of the last search of each battle, with the pp of the opponent's moves, they
+        # tell which actions were done in the last turn when the tree is reused
+        self.last_searches: Dict[str, Tuple[Move | Pokemon, Pokemon, Dict[str, int]]] = dict()
+
+        # While the opponent is choosing, a second search of each battle shares its transposition table and searches
+        # the next turn, pondering implies that the tree is reused
+        self.ponder_enabled: bool = self.configuration.ponder
+        self.ponder_searches: Dict[str, MiniMaxSearch] = dict()
+        self.ponder_threads: Dict[str, Tuple[threading.Thread, threading.Event]] = dict()
+
     def choose_move(self, battle):
         """
         Overrides the poke_env library method and return the best action to do, either a Move or a Pokémon to switch
         :param battle: current state of the battle
         :return: the best action to do, either a Move or a Pokémon switch
         """
+        self.stop_pondering(battle.battle_tag)
 
         # Retrieve both active pokémon
         bot_pokemon: Pokemon = battle.active_pokemon
@@ -82,8 +111,9 @@ class MiniMaxPlayer(Player):
         best_switch, bot_matchup, outspeed_p, team_matchups = self.best_switch_on_matchup(battle, bot_pokemon, bot_team,
                                                                                           opp_pokemon, terrains,
                                                                                           weather)
-        if should_switch(bot_pokemon, bot_matchup, outspeed_p, self.max_team_matchup, self.toxic_turn) \
-                and battle.available_switches:
+        # If the switches are part of the minimax tree, the search decides whether to switch
+        if self.configuration.max_switches == 0 and battle.available_switches \
+                and should_switch(bot_pokemon, bot_matchup, outspeed_p, self.max_team_matchup, self.toxic_turn):
             self.previous_pokemon = bot_pokemon
             if self.verbose:
                 print("Switching to {0}\n{1}".format(best_switch.species, "-" * 110))
@@ -101,7 +131,7 @@ class MiniMaxPlayer(Player):
                 NodePokemon(battle.opponent_active_pokemon, is_act_poke=False, current_hp=opp_max_hp,
                             moves=list(battle.opponent_active_pokemon.moves.values())),
                 avail_switches, opp_team, battle.weather, terrains,
-                opp_conditions, None, Gen8Move('splash'), True)
+                opp_conditions, Gen8Move('splash'), True)
 
             can_defeat, best_move = False, Gen8Move('splash')
             if root_battle_status.move_first and len(battle.available_moves) > 0:
@@ -202,7 +232,7 @@ class MiniMaxPlayer(Player):
                 NodePokemon(battle.opponent_active_pokemon, is_act_poke=False, current_hp=opp_hp,
                             moves=list(battle.opponent_active_pokemon.moves.values())),
                 [], [], battle.weather, terrains,
-                opp_conditions, None, move, True)
+                opp_conditions, move, True)
             opp_is_fainted = battle_status.simulate_action(move, True).opp_poke.is_fainted()
             if opp_is_fainted:
                 return True, move
@@ -225,6 +255,29 @@ class MiniMaxPlayer(Player):
 
         print()
 
+    def create_search(self) -> MiniMaxSearch:
+        """
+        Instantiate the search of a new battle
+        :return: the search that chooses the moves of the battle
+        """
+        return MiniMaxSearch(self.heuristic, self.max_depth, self.configuration)
+
+    def battle_search(self, battle_tag: str) -> MiniMaxSearch:
+        """
+        Retrieves the search of a battle, it is created the first time the bot chooses a move in the battle
+        :param battle_tag: the tag of the battle
+        :return: the search of the battle
+        """
+        search = self.searches.get(battle_tag)
+        if search is None:
+            search = self.create_search()
+            if search.workers > 1:
+                search.process_pool = self.process_pool
+                self.process_pool = search.get_process_pool()
+            self.searches[battle_tag] = search
+
+        return search
+
     def get_best_move(self, battle: AbstractBattle, root_battle_status: BattleStatus) -> Pokemon | Move:
         """
         Computes the best move or the best pokémon to switch
@@ -232,91 +285,164 @@ class MiniMaxPlayer(Player):
         :param root_battle_status: root node from which the minimax algorithm starts
         :return: the best move or the best pokémon to switch
         """
-        ris = self.alphabeta(root_battle_status, 0, float('-inf'), float('+inf'), True)
-        node: BattleStatus = ris[1]
-        best_move = self.choose_random_move(battle)  # il bot ha fatto U-turn e node diventava none
-        if node is not None and node.move != Gen8Move('splash'):
-            best_move = node.move  # self.choose_random_move(battle)
-            curr_node = node
-            while curr_node.ancestor is not None:
-                best_move = curr_node.move
-                curr_node = curr_node.ancestor
+        search = self.battle_search(battle.battle_tag)
+        if search.reuse_tree and battle.battle_tag in self.last_searches:
+            last_turn_actions = self.last_turn_actions(battle)
+            search.reroot_search(battle.turn, last_turn_actions)
+            self.follow_pondering(battle.battle_tag, last_turn_actions)
+        else:
+            search.reset_search()
+            search.root_turn = battle.turn
+
+        ris = search.search(root_battle_status)
+        search.search_stats.stop()
+        if self.verbose:
+            print("Search {0}".format(search.search_stats))
+
+        best_move = ris[1]
+        if best_move is None:
+            best_move = self.choose_random_move(battle)  # il bot ha fatto U-turn e non aveva azioni
+        else:
+            opp_pokemon = battle.opponent_active_pokemon
+            self.last_searches[battle.battle_tag] = (best_move, opp_pokemon, {move_id: move.current_pp for move_id, move
+                                                                              in opp_pokemon.moves.items()})
+            if self.ponder_enabled:
+                # Copying the root takes a few milliseconds, so the search of the next turn starts once the event loop
+                # has sent the order, before it handles the next message
+                asyncio.get_running_loop().call_soon(self.start_pondering, battle.battle_tag, root_battle_status,
+                                                     best_move)
         return best_move
 
-    def alphabeta(self, node: BattleStatus,
-                  depth: int,
-                  alpha: float,
-                  beta: float,
-                  is_my_turn: bool) -> Tuple[float, BattleStatus]:
+    def start_pondering(self, battle_tag: str, root_battle_status: BattleStatus, best_move: Move | Pokemon):
         """
-        Build the minimax tree with alpha-beta pruning
-        :param node: to start exploring from
-        :param depth: current depth of the minimax tree. A level of depth equals to one turn of the game
-        :param alpha: alpha value of the alpha-beta pruning. Initial call: alpha=-inf
-        :param beta: beta value of the alpha-beta pruning. Initial call: beta=-inf
-        :param is_my_turn: true if the bot attacks, false otherwise
-        :return: a tuple containing the best game state with its value
-        (* Initial call *) alphabeta(origin, 0, −inf, +inf, TRUE)
+        Starts searching the next turn in a background thread while the opponent chooses its action. The positions
+        reached by the bot's action are searched starting from the opponent's action predicted by the principal
+        variation. The search works on a copy of the root, moves included, since the battle and its moves are updated
+        by the messages of the turn while it runs
+        :param battle_tag: the tag of the battle
+        :param root_battle_status: root node of the search that chose the action
+        :param best_move: the action chosen by the bot
         """
-        if depth == self.max_depth or self.is_terminal_node(node):
-            score = node.compute_score(self.heuristic, depth)
-            node.score = score
-            return score, node
-        if is_my_turn:
-            score = float('-inf')
-            ret_node = node
-            # print(str(depth) + " bot -> " + str(node))
-            for poss_act in node.act_poke_avail_actions():
-                new_state = node.simulate_action(poss_act, is_my_turn)
-                child_score, child_node = self.alphabeta(new_state, depth, alpha, beta, False)
-                if score < child_score:
-                    ret_node = child_node
-                score = max(score, child_score)
-                if score >= beta:
-                    break  # beta cutoff
-                alpha = max(alpha, score)
-
-            # print(str(depth) + " bot -> " + str(ret_node))
-            return score, ret_node
-        else:
-            score = float('inf')
-            ret_node = node
-            # print(str(depth) + " bot -> " + str(node))
-            for poss_act in node.opp_poke_avail_actions():
-                new_state = node.simulate_action(poss_act, is_my_turn)
-                child_score, child_node = self.alphabeta(new_state, depth + 1, alpha, beta, True)
-                if score > child_score:
-                    ret_node = child_node
-                score = min(score, child_score)
-                if score <= alpha:
-                    break  # alpha cutoff
-                beta = min(beta, score)
-
-            # print(str(depth) + " opp -> " + str(ret_node))
-            return score, ret_node
-
-    @staticmethod
-    def opponent_loose(node: BattleStatus) -> bool:
+        battle_search = self.battle_search(battle_tag)
+        search = self.ponder_searches.get(battle_tag)
+        if search is not None:
+            search.ponder_lines = dict()
+
+        principal_variation = battle_search.principal_variation()
+        if battle_search.transposition_table is None or len(principal_variation) < 2 \
+                or principal_variation[0] is not best_move:
+            return
+
+        # The actions found by pondering are copies, the following search matches them with its own ones by key
+        memo = dict()
+        node = copy.deepcopy(root_battle_status, memo)
+        node.apply_action(memo.get(id(best_move), best_move), True)
+        predicted_action = memo.get(id(principal_variation[1]), principal_variation[1])
+        opp_actions = [predicted_action] + [action for action in
+                                            node.opp_poke_avail_actions(battle_search.max_switches)
+                                            if action is not predicted_action]
+
+        if search is None:
+            # The search shares the transposition table of the battle and rebases its entries like the following turns
+            configuration = replace(self.configuration.helper_configuration(0), reuse_tree=True)
+            search = MiniMaxSearch(self.heuristic, self.max_depth, configuration)
+            self.ponder_searches[battle_tag] = search
+        search.transposition_table = battle_search.transposition_table
+        search.max_depth = battle_search.max_depth
+        search.root_turn = battle_search.root_turn
+        search.reroot_search(battle_search.root_turn + 1, [])
+
+        # The history of the cutoffs is added to the battle's one after the turn, so each pondering starts without it
+        search.move_ordering.reset()
+
+        stop = threading.Event()
+        thread = threading.Thread(target=search.ponder, args=(node, opp_actions, stop), daemon=True)
+        self.ponder_threads[battle_tag] = (thread, stop)
+        thread.start()
+
+    def follow_pondering(self, battle_tag: str, last_turn_actions: List[Move | Pokemon]):
+        """
+        Warm-starts the search of a turn with what pondering found, if the opponent's action of the last turn is known
+        and was pondered on: its principal variation is searched first and the history of the cutoffs is added to the
+        battle's one. The pondered positions are seldom the same as the new root, since the opponent's health points
+        are only known as a percentage, so the move ordering is what mostly carries over
+        :param battle_tag: the tag of the battle
+        :param last_turn_actions: the bot's action and the opponent's action of the last turn
+        """
+        search = self.ponder_searches.get(battle_tag)
+        if search is None or len(last_turn_actions) < 2:
+            return
+
+        line = search.ponder_lines.get(action_key(last_turn_actions[1]))
+        search.ponder_lines = dict()
+        if line is None:
+            return
+
+        move_ordering = self.battle_search(battle_tag).move_ordering
+        move_ordering.principal_variation = line
+        move_ordering.follow_pv = len(line) > 0
+        history = move_ordering.history
+        for key, score in search.move_ordering.history.items():
+            history[key] = history.get(key, 0) + score
+
+    def stop_pondering(self, battle_tag: str):
+        """
+        Stops the search of the next turn of a battle, if it is running. What it has found is kept in the transposition
+        table
+        :param battle_tag: the tag of the battle
         """
-        Checks whether the opponent player is defeated
-        :param node: a node representing a game state
-        :return: a boolean indicating whether the opponent player is defeated
+        if battle_tag not in self.ponder_threads:
+            return
+
+        thread, stop = self.ponder_threads.pop(battle_tag)
+        search = self.ponder_searches[battle_tag]
+        stop.set()
+        search.search_deadline = float('-inf')
+        thread.join()
+        search.search_stats.stop()
+        if self.verbose:
+            print("Ponder {0}".format(search.search_stats))
+
+    def shutdown_process_pool(self):
         """
-        return node.opp_poke.is_fainted() and len(node.opp_poke_avail_actions()) == 0
+        Terminates the processes of the parallel search, if they were started
+        """
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+            self.process_pool = None
+            for search in self.searches.values():
+                search.process_pool = None
 
-    @staticmethod
-    def player_loose(node: BattleStatus) -> bool:
+    def _battle_finished_callback(self, battle: AbstractBattle):
         """
-        Checks whether our player is defeated
-        :param node: a node representing a game state
-        :return: a boolean indicating whether our player is defeated
+        Overrides the poke_env library method, the search of the next turn of a finished battle is stopped and the
+        searches of the battle are dropped. The processes of the parallel search are terminated once every battle is
+        over, they are started again if the player takes part in another battle
+        :param battle: the battle that has just finished
         """
-        return node.act_poke.is_fainted() and len(node.act_poke_avail_actions()) == 0
+        self.stop_pondering(battle.battle_tag)
+        self.searches.pop(battle.battle_tag, None)
+        self.ponder_searches.pop(battle.battle_tag, None)
+        self.last_searches.pop(battle.battle_tag, None)
+
+        if all(battle.finished for battle in self.battles.values()):
+            self.shutdown_process_pool()
 
-    def is_terminal_node(self, node: BattleStatus) -> bool:
+    def last_turn_actions(self, battle: AbstractBattle) -> List[Move | Pokemon]:
         """
-        Check if a node is a terminal node
-        :param node: a node representing a game state
-        :return: a boolean indicating whether a node is a terminal one
+        Retrieves the actions done by the two players since the last search of a battle. The opponent switched if its
+        Pokémon is not the same, otherwise its move is the one whose pp went down
+        :param battle: current state of the battle
+        :return: the bot's action followed by the opponent's one, which is left out if it is not known
         """
-        return self.player_loose(node) or self.opponent_loose(node)
+        bot_action, opp_pokemon, opp_pp = self.last_searches[battle.battle_tag]
+        actions = [bot_action]
+        if battle.opponent_active_pokemon is not opp_pokemon:
+            actions.append(battle.opponent_active_pokemon)
+        else:
+            used_moves = [move for move_id, move in opp_pokemon.moves.items()
+                          if move.current_pp < opp_pp.get(move_id, move.max_pp)]
+            if len(used_moves) == 1:
+                actions.append(used_moves[0])
+
+        return actions
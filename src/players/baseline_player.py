@@ -3,6 +3,7 @@ from poke_env.player import Player
 from poke_env.teambuilder import Teambuilder
 from poke_env import PlayerConfiguration, ServerConfiguration
 from src.engine.damage import compute_damage
+from src.engine.type_chart import type_effectiveness
 from src.engine.battle_utilities import outspeed_prob, retrieve_battle_status, bot_status_to_string
 from typing import Optional, Union
 
@@ -64,11 +65,11 @@ class BestDamagePlayer(Player):
                 max_type_gain_pokemon = None
                 for pokemon in battle.available_switches:
                     # Consider the bot type match-up
-                    bot_type_gain = max([opp_pokemon.damage_multiplier(switch_type)
+                    bot_type_gain = max([type_effectiveness(switch_type, opp_pokemon)
                                          for switch_type in pokemon.types if switch_type is not None])
 
                     # Consider the opponent type match-up
-                    opponent_type_gain = max([pokemon.damage_multiplier(opponent_type)
+                    opponent_type_gain = max([type_effectiveness(opponent_type, pokemon)
                                               for opponent_type in opp_pokemon.types if opponent_type is not None])
                     type_gain = bot_type_gain - opponent_type_gain
                     if max_type_gain < type_gain:
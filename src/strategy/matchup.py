@@ -1,4 +1,5 @@
 from poke_env.environment import Pokemon, MoveCategory
+from src.engine.type_chart import type_effectiveness
 
 
 def __type_advantage(attacker: Pokemon, defender: Pokemon) -> float:
@@ -8,7 +9,7 @@ def __type_advantage(attacker: Pokemon, defender: Pokemon) -> float:
     :param defender: the defending Pokémon
     :return: The type advantage, which is the max multiplier coming from the type table
     """
-    type_gain = max([defender.damage_multiplier(attacker_type)
+    type_gain = max([type_effectiveness(attacker_type, defender)
                      for attacker_type in attacker.types if attacker_type is not None])
     return type_gain
 
@@ -23,7 +24,7 @@ def __move_type_advantage(bot_pokemon: Pokemon, opponent_pokemon: Pokemon, oppon
     :return: The move-type advatange
     """
     # Consider the bot move-type match-up
-    bot_type_gain = [opponent_pokemon.damage_multiplier(move_bot)
+    bot_type_gain = [type_effectiveness(move_bot.type, opponent_pokemon)
                      for move_bot in bot_pokemon.moves.values() if
                      move_bot.category is not MoveCategory.STATUS]
     bot_type_gain = max(bot_type_gain) if len(bot_type_gain) > 0 else 1
@@ -33,7 +34,7 @@ def __move_type_advantage(bot_pokemon: Pokemon, opponent_pokemon: Pokemon, oppon
     if len(opponent_pokemon.moves) > 0:
         for move_opp in opponent_pokemon.moves.values():
             if move_opp.category is not MoveCategory.STATUS:
-                opponent_type_gain_iter = bot_pokemon.damage_multiplier(move_opp)
+                opponent_type_gain_iter = type_effectiveness(move_opp.type, bot_pokemon)
                 if opponent_type_gain_iter > opponent_type_gain:
                     opponent_type_gain = opponent_type_gain_iter
 
@@ -0,0 +1,63 @@
+from run_benchmark import build_damage_groups, merge_damage_groups, DAMAGE_CHECK_STATES, DAMAGE_CHECK_BOOSTS
+from src.engine.damage import compute_damage, compute_damage_batch
+import numpy as np
+import unittest
+
+# Results of the damage calculators that must be the same
+DAMAGE_KEYS = ["power", "lb", "ub", "move_type"]
+
+
+class TestDamageBatch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.groups = build_damage_groups()
+
+    def assert_same_damage(self, moves, scalar, batch):
+        """
+        Checks that the batch gives the same results of compute_damage on each move. The upper bounds of a batch with
+        moves that always crit are floats, like the ones of those moves in compute_damage
+        :param moves: the moves of the batch
+        :param scalar: the results of compute_damage, one for each move
+        :param batch: the result of compute_damage_batch
+        """
+        for i, (move, damage) in enumerate(zip(moves, scalar)):
+            for key in DAMAGE_KEYS:
+                batch_value = batch[key][i]
+                batch_value = batch_value.item() if isinstance(batch_value, np.generic) else batch_value
+                self.assertEqual(damage[key], batch_value, "{0} of {1}".format(key, move.id))
+                if key != "ub":
+                    self.assertIs(type(damage[key]), type(batch_value), "{0} of {1}".format(key, move.id))
+
+    def test_batch_of_each_pair(self):
+        for name, weather, terrains, conditions in DAMAGE_CHECK_STATES:
+            for moves, attacker, defender, is_bot in self.groups:
+                with self.subTest(state=name, attacker=attacker.species, defender=defender.species):
+                    scalar = [compute_damage(move, attacker, defender, weather, terrains, conditions,
+                                             DAMAGE_CHECK_BOOSTS, None, is_bot) for move in moves]
+                    batch = compute_damage_batch(moves, attacker, defender, weather, terrains, conditions,
+                                                 DAMAGE_CHECK_BOOSTS, None, is_bot)
+                    self.assert_same_damage(moves, scalar, batch)
+
+    def test_batch_of_each_side(self):
+        for name, weather, terrains, conditions in DAMAGE_CHECK_STATES:
+            for is_bot in [True, False]:
+                with self.subTest(state=name, is_bot=is_bot):
+                    moves, attackers, defenders = merge_damage_groups(self.groups, is_bot)
+                    scalar = [compute_damage(move, attacker, defender, weather, terrains, conditions,
+                                             DAMAGE_CHECK_BOOSTS, None, is_bot)
+                              for move, attacker, defender in zip(moves, attackers, defenders)]
+                    batch = compute_damage_batch(moves, attackers, defenders, weather, terrains, conditions,
+                                                 DAMAGE_CHECK_BOOSTS, None, is_bot)
+                    self.assert_same_damage(moves, scalar, batch)
+
+    def test_integer_arrays(self):
+        moves, attacker, defender, is_bot = self.groups[0]
+        moves = [move for move in moves if move.crit_ratio != 6]
+        batch = compute_damage_batch(moves, attacker, defender, None, [], [], DAMAGE_CHECK_BOOSTS, None, is_bot)
+        for key in ["power", "lb", "ub"]:
+            self.assertEqual(batch[key].dtype, np.int64, key)
+
+
+if __name__ == '__main__':
+    unittest.main()